@@ -0,0 +1,47 @@
+"""
+Benchmark the token dump: one print() per token against the buffered
+writer in each output format
+
+The tokens of `Program_Test.txt` repeated `copies` times (default 20000)
+are lexed first, so only the output is timed. Output goes to a temporary
+file and to os.devnull.
+
+Usage:
+    python bench_dump.py [copies]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pl1
+
+
+def print_each(tokens, out):
+    # The old main loop
+    headers = ['Line', 'Token', 'Value']
+    print(f'{headers[0]:4} {headers[1]:15} {headers[2]}', file=out)
+    print("-"*27, file=out)
+    for token in tokens:
+        print(f'{token.lineno:4} {token.type:15} {token.value}', file=out)
+
+
+if __name__ == "__main__":
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with open('Program_Test.txt', 'r') as f:
+        tokens = list(pl1.tokenize(f.read() * copies))
+    print(f'{len(tokens):,} tokens\n')
+
+    runs = [('print per token', print_each)]
+    runs += [(f'buffered {fmt}', lambda tokens, out, fmt=fmt: pl1.dump_tokens(tokens, out, fmt))
+             for fmt in pl1.FORMATS]
+    with tempfile.TemporaryDirectory() as directory:
+        for target in (os.path.join(directory, 'tokens.out'), os.devnull):
+            print(f'to {"a file" if target != os.devnull else os.devnull}:')
+            for name, run in runs:
+                with open(target, 'w', newline='') as out:
+                    start = time.perf_counter()
+                    run(tokens, out)
+                    out.flush()
+                    elapsed = time.perf_counter() - start
+                print(f'    {name:16} {elapsed:6.2f}s {len(tokens) / elapsed:12,.0f} tokens/sec')
@@ -0,0 +1,51 @@
+"""
+Benchmark chunk-parallel lexing against a single `lexer.token()` loop
+
+The input is `Program_Test.txt` repeated `copies` times (default 50000).
+
+Usage:
+    python bench_parallel_lex.py [copies] [max jobs]     (default: 50000, cores)
+"""
+import os
+import sys
+import time
+
+import parallel_lex
+import pl1
+
+
+def single(data):
+    lexer = pl1.lexer.clone()
+    lexer.lineno = 1
+    lexer.input(data)
+    result = []
+    while True:
+        tok = lexer.token()
+        if not tok:
+            break
+        result.append((tok.type, tok.value, tok.lineno, tok.lexpos))
+    return result
+
+
+if __name__ == "__main__":
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    cores = os.cpu_count() or 1
+    max_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else cores
+    with open('Program_Test.txt', 'r') as f:
+        data = f.read() * copies
+    print(f'Input: {len(data):,} characters, {cores} cores\n')
+
+    start = time.perf_counter()
+    expected = single(data)
+    baseline = time.perf_counter() - start
+    print(f'single process  {baseline:7.2f}s {len(expected) / baseline:12,.0f} tokens/sec')
+
+    jobs = 1
+    while jobs <= max_jobs:
+        start = time.perf_counter()
+        result = parallel_lex.tokenize(data, jobs, want_tokens=False)
+        elapsed = time.perf_counter() - start
+        assert result == expected
+        print(f'--jobs {jobs:<8} {elapsed:7.2f}s {len(result) / elapsed:12,.0f} tokens/sec'
+              f' {baseline / elapsed:6.2f}x')
+        jobs *= 2
@@ -0,0 +1,55 @@
+"""
+Benchmark the single-pass scanner against the ply lexer built by `lex.lex()`
+
+Usage:
+    python bench_scanner.py [copies]
+
+The input is `Program_Test.txt` repeated `copies` times (default 20000).
+"""
+import sys
+import time
+
+import pl1
+from scanner import Scanner
+
+
+def ply_tokens(data):
+    lexer = pl1.lexer.clone()
+    lexer.lineno = 1
+    lexer.input(data)
+    result = []
+    while True:
+        token = lexer.token()
+        if not token:
+            break
+        result.append(token)
+    return result
+
+
+def scanner_tokens(data):
+    scanner = Scanner(pl1)
+    scanner.input(data)
+    return list(scanner)
+
+
+def run(name, func, data):
+    start = time.perf_counter()
+    result = func(data)
+    elapsed = time.perf_counter() - start
+    print(f'{name:8} {len(result):10} tokens {elapsed:8.3f}s {len(result) / elapsed:14,.0f} tokens/sec')
+    return result, elapsed
+
+
+if __name__ == "__main__":
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with open("Program_Test.txt", 'r') as testFile:
+        data = (testFile.read() + '\n') * copies
+    print(f'\nInput: {len(data):,} characters\n')
+
+    expected, ply_time = run('ply', ply_tokens, data)
+    actual, scanner_time = run('scanner', scanner_tokens, data)
+
+    fields = [(t.type, t.value, t.lineno, t.lexpos) for t in expected]
+    if fields != [(t.type, t.value, t.lineno, t.lexpos) for t in actual]:
+        sys.exit('Token streams differ')
+    print(f'\nIdentical token streams, speedup {ply_time / scanner_time:.2f}x')
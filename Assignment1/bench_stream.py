@@ -0,0 +1,87 @@
+"""
+Benchmark peak memory and speed of scanning a large file whole against
+streaming it in chunks
+
+The input is `Program_Test.txt` repeated to the requested size. Peak memory
+is measured with tracemalloc in a separate pass, without timing.
+
+Usage:
+    python bench_stream.py [megabytes] [chunk KB]     (default: 20 1024)
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pl1
+from scanner import Scanner
+
+
+def count(tokens):
+    n = 0
+    for _ in tokens:
+        n += 1
+    return n
+
+
+def ply_whole(path, chunk_size):
+    return count(pl1.tokenize_file(path))
+
+
+def scanner_whole(path, chunk_size):
+    scanner = Scanner(pl1)
+    with open(path, 'r') as f:
+        scanner.input(f.read())
+    return count(scanner)
+
+
+def scanner_chunks(path, chunk_size):
+    scanner = Scanner(pl1)
+    scanner.input_file(path, chunk_size)
+    return count(scanner)
+
+
+def scanner_mmap(path, chunk_size):
+    scanner = Scanner(pl1)
+    scanner.input_file(path, chunk_size, use_mmap=True)
+    return count(scanner)
+
+
+MODES = [
+    ('ply, read whole', ply_whole),
+    ('scanner, read whole', scanner_whole),
+    ('scanner, chunks', scanner_chunks),
+    ('scanner, mmap chunks', scanner_mmap),
+]
+
+
+if __name__ == "__main__":
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    chunk_size = int(sys.argv[2]) * 1024 if len(sys.argv) > 2 else 1 << 20
+    with open('Program_Test.txt', 'r') as f:
+        sample = f.read()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'big.txt')
+        with open(path, 'w') as f:
+            for _ in range(int(megabytes * 1024 * 1024 / len(sample)) + 1):
+                f.write(sample)
+        size = os.path.getsize(path)
+        print(f'Input: {size / 1024 / 1024:.1f} MB, chunks of {chunk_size // 1024} KB\n')
+
+        expected = None
+        for name, run in MODES:
+            start = time.perf_counter()
+            tokens = run(path, chunk_size)
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            run(path, chunk_size)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            expected = expected or tokens
+            assert tokens == expected, (name, tokens, expected)
+            print(f'{name:22} {tokens:,} tokens {elapsed:7.2f}s {tokens / elapsed:12,.0f} tokens/sec'
+                  f'   peak {peak / 1024 / 1024:7.1f} MB')
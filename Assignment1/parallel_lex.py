@@ -0,0 +1,121 @@
+import importlib
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import ply.lex as lex
+
+# ==================================================================
+#                        CHUNK-PARALLEL LEXING
+# ==================================================================
+#
+# No token spans a newline (`t_COMMENT` stops at the end of the line and
+# there are no string literals), so a large input can be cut at newlines
+# and each piece lexed on its own, in a process pool, with the module's
+# own ply lexer. Each worker sends its tokens back as columns (type
+# numbers as bytes, line numbers and positions as int arrays, and the
+# values), which pickle much faster than LexToken objects or tuples.
+# Each piece is lexed from its real first line, so line numbers (also in
+# `t_error` messages) are right; positions are shifted by where the piece
+# starts afterwards.
+#
+# Usage:
+#     tokens = parallel_lex.tokenize(data, jobs=4)
+
+# Lexer of the worker process and the number of every token type, set
+# by `load_lexer()`
+lexer = None
+numbers = {}
+
+
+def load_lexer(module_name):
+    """
+    Import the lexer module in a worker (pool initializer)
+    """
+    global lexer, numbers
+    module = importlib.import_module(module_name)
+    lexer = module.lexer.clone()
+    numbers = {name: i for i, name in enumerate(module.tokens)}
+
+
+def lex_piece(text, lineno):
+    """
+    Lex one piece, starting at line `lineno`
+
+    :return: (type numbers, values, line numbers, positions)
+    """
+    lexer.lineno = lineno
+    lexer.input(text)
+    types = bytearray()
+    values = []
+    linenos = array('i')
+    lexposes = array('i')
+    token = lexer.token
+    while True:
+        tok = token()
+        if not tok:
+            break
+        types.append(numbers[tok.type])
+        values.append(tok.value)
+        linenos.append(tok.lineno)
+        lexposes.append(tok.lexpos)
+    return bytes(types), values, linenos, lexposes
+
+
+def split_lines(data, parts):
+    """
+    Cut `data` into at most `parts` pieces of similar size, each ending
+    just after a newline (except the last)
+
+    :return: A list of (start offset, text) pairs
+    """
+    pieces = []
+    size = max(1, len(data) // parts)
+    start = 0
+    while start < len(data):
+        end = data.find('\n', start + size - 1) + 1
+        if end == 0 or len(pieces) == parts - 1:
+            end = len(data)
+        pieces.append((start, data[start:end]))
+        start = end
+    return pieces
+
+
+def tokenize(data, jobs=None, module_name='pl1', pieces=None, want_tokens=True):
+    """
+    Lex `data` in parallel and return its tokens, in order, with the line
+    numbers and positions a single lexer starting at line 1 would give
+
+    :param data: The source text
+    :param jobs: The number of worker processes (default: one per core)
+    :param module_name: The lexer module to use in the workers
+    :param pieces: The number of pieces to cut the input into
+                   (default: 4 per worker)
+    :param want_tokens: Return LexToken objects; with False, return the
+                        (type, value, lineno, lexpos) tuples
+    """
+    jobs = jobs or os.cpu_count() or 1
+    pieces = split_lines(data, pieces or jobs * 4)
+    names = importlib.import_module(module_name).tokens
+    with ProcessPoolExecutor(max_workers=jobs, initializer=load_lexer, initargs=(module_name,)) as pool:
+        first_lines = []
+        lineno = 1
+        for _, text in pieces:
+            first_lines.append(lineno)
+            lineno += text.count('\n')
+        results = pool.map(lex_piece, [text for _, text in pieces], first_lines)
+
+        result = []
+        for (start, text), (types, values, linenos, lexposes) in zip(pieces, results):
+            if want_tokens:
+                for tok_type, value, lineno, lexpos in zip(types, values, linenos, lexposes):
+                    tok = lex.LexToken()
+                    tok.type = names[tok_type]
+                    tok.value = value
+                    tok.lineno = lineno
+                    tok.lexpos = lexpos + start
+                    result.append(tok)
+            else:
+                result.extend((names[tok_type], value, lineno, lexpos + start)
+                              for tok_type, value, lineno, lexpos in zip(types, values, linenos, lexposes))
+    return result
@@ -1,5 +1,11 @@
+import argparse
+import json
+import sys
+
 import ply.lex as lex
 
+from scanner import Scanner
+
 # List of all token names
 tokens = [
     'IDENTIFIER', 'NUMBER',
@@ -95,28 +101,111 @@ def t_error(t):
 lexer = lex.lex()
 
 
-with open("Program_Test.txt", 'r') as testFile:
-    input_data = testFile.read()
-    lexer.input(input_data)
-    headers = ['Line', 'Token', 'Value']  # for format output
-    print(f'{headers[0]:4} {headers[1]:15} {headers[2]}')
-    print("-"*27)
+def tokenize(source):
+    """
+    Generate the tokens of `source` lazily, one at a time
+
+    Each call works on its own clone of the lexer, so line numbers start at
+    1 and callers can stop reading at any point.
+
+    :param source: The source text to tokenize
+    """
+    scanner = lexer.clone()
+    scanner.lineno = 1
+    scanner.input(source)
     while True:
-        token = lexer.token()
+        token = scanner.token()
         if not token:
             break
-        print(f'{token.lineno:4} {token.type:15} {token.value}')
-
-# def lexerScannerTestFunc(fileDir):
-#     """
-#     Function to test a given `.txt` file using a lexical scanner
-
-#     Params:
-#         fileDir (str): The directory of the file to be tested
-#     """
-#     with open(fileDir, 'r') as f:
-#         input_data = f.read()
-#     lexer.input(input_data)
-
-
-# lexerScannerTestFunc('Assignment1/Program_Test.txt')
+        yield token
+
+
+def tokenize_file(path, chunk_size=None):
+    """
+    Generate the tokens of a `.txt` file lazily
+
+    :param path: The path of the file to tokenize
+    :param chunk_size: If given, scan the file in chunks of this many bytes
+                       with `scanner.Scanner` instead of reading it whole,
+                       so memory does not grow with the file size
+    """
+    if chunk_size is not None:
+        scanner = Scanner(sys.modules[__name__])
+        scanner.input_file(path, chunk_size)
+        yield from scanner
+        return
+    with open(path, 'r') as testFile:
+        yield from tokenize(testFile.read())
+
+
+# ==================================================================
+#                        TOKEN DUMP
+# ==================================================================
+
+FORMATS = ('table', 'jsonl', 'csv')
+
+
+def dump_tokens(tokens, out, fmt='table', batch=8192):
+    """
+    Write tokens to a text stream, `batch` lines per write call
+
+    :param tokens: The tokens to write
+    :param out: The stream to write to (a file or `sys.stdout`)
+    :param fmt: 'table' (the aligned Line/Token/Value table), 'jsonl'
+                   (one JSON object per token) or 'csv'
+    :param batch: The number of lines joined into one write
+    """
+    if fmt == 'table':
+        headers = ['Line', 'Token', 'Value']  # for format output
+        out.write(f'{headers[0]:4} {headers[1]:15} {headers[2]}\n' + "-"*27 + '\n')
+        line = lambda token: f'{token.lineno:4} {token.type:15} {token.value}\n'
+    elif fmt == 'jsonl':
+        # Token types are plain names, only the value needs escaping
+        line = lambda token: f'{{"line": {token.lineno}, "type": "{token.type}", "value": {json_value(token.value)}}}\n'
+    elif fmt == 'csv':
+        out.write('line,type,value\r\n')
+        line = lambda token: f'{token.lineno},{token.type},{csv_field(token.value)}\r\n'
+    else:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {', '.join(FORMATS)}")
+
+    lines = []
+    for token in tokens:
+        lines.append(line(token))
+        if len(lines) >= batch:
+            out.write(''.join(lines))
+            lines.clear()
+    out.write(''.join(lines))
+    out.flush()
+
+
+def json_value(value):
+    # json.dumps() is only needed for strings that need escaping
+    if type(value) is int:
+        return str(value)
+    if type(value) is str and value.isascii() and value.isprintable() and '"' not in value and '\\' not in value:
+        return '"' + value + '"'
+    return json.dumps(value)
+
+
+def csv_field(value):
+    # Quote like the csv module does, only when needed
+    value = str(value)
+    if ',' in value or '"' in value or '\n' in value or '\r' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description='Print the tokens of a source file')
+    arguments.add_argument('path', nargs='?', default='Program_Test.txt')
+    arguments.add_argument('--format', choices=FORMATS, default='table')
+    arguments.add_argument('--output', '-o', help='write to this file instead of stdout')
+    arguments.add_argument('--chunk-size', type=int, help='scan the file in chunks of this many bytes')
+    options = arguments.parse_args()
+
+    stream = tokenize_file(options.path, options.chunk_size)
+    if options.output:
+        with open(options.output, 'w', newline='') as out:
+            dump_tokens(stream, out, options.format)
+    else:
+        dump_tokens(stream, sys.stdout, options.format)
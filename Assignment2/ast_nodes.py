@@ -0,0 +1,273 @@
+# ==================================================================
+#                        AST NODES
+# ==================================================================
+#
+# One `__slots__` class per kind of parse tree node. The tag string that
+# used to be stored in every tuple (`('operation', op, l, r)`) becomes a
+# class attribute, so each node only stores its children, and consumers
+# can dispatch on the node type instead of comparing strings.
+#
+# Nodes still index like the old tuples (`node[0]` is the tag, `node[1:]`
+# the children) so existing code that walks the tree keeps working.
+
+
+class Node:
+    """
+    Base class of all parse tree nodes
+
+    Subclasses set `tag` (the old tuple tag) and list their children in
+    `__slots__`, in the same order as the old tuple, with a matching
+    constructor.
+    """
+    __slots__ = ()
+    tag = None
+
+    def children(self):
+        """
+        Return the children of the node, in tuple order
+        """
+        return [getattr(self, name) for name in self.__slots__]
+
+    def __getitem__(self, index):
+        if index == 0:
+            return self.tag
+        return (self.tag, *self.children())[index]
+
+    def __len__(self):
+        return len(self.__slots__) + 1
+
+    def __iter__(self):
+        return iter((self.tag, *self.children()))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.children() == other.children()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(map(repr, self.children()))})"
+
+
+class Program(Node):
+    __slots__ = ('items',)
+    tag = 'program'
+
+    def __init__(self, items):
+        self.items = items
+
+
+class Function(Node):
+    __slots__ = ('name', 'params', 'return_type', 'statements')
+    tag = 'function'
+
+    def __init__(self, name, params, return_type, statements):
+        self.name = name
+        self.params = params
+        self.return_type = return_type
+        self.statements = statements
+
+
+class Struct(Node):
+    __slots__ = ('name', 'statements')
+    tag = 'struct'
+
+    def __init__(self, name, statements):
+        self.name = name
+        self.statements = statements
+
+
+class Assign(Node):
+    __slots__ = ('name', 'expr')
+    tag = 'assign'
+
+    def __init__(self, name, expr):
+        self.name = name
+        self.expr = expr
+
+
+class If(Node):
+    __slots__ = ('cond', 'body', 'else_clause')
+    tag = 'if'
+
+    def __init__(self, cond, body, else_clause):
+        self.cond = cond
+        self.body = body
+        self.else_clause = else_clause
+
+
+class ElseIf(Node):
+    __slots__ = ('cond', 'body', 'else_clause')
+    tag = 'else_if'
+
+    def __init__(self, cond, body, else_clause):
+        self.cond = cond
+        self.body = body
+        self.else_clause = else_clause
+
+
+class Else(Node):
+    __slots__ = ('body',)
+    tag = 'else'
+
+    def __init__(self, body):
+        self.body = body
+
+
+class While(Node):
+    __slots__ = ('cond', 'body')
+    tag = 'while'
+
+    def __init__(self, cond, body):
+        self.cond = cond
+        self.body = body
+
+
+class Return(Node):
+    __slots__ = ('expr',)
+    tag = 'return'
+
+    def __init__(self, expr):
+        self.expr = expr
+
+
+class Write(Node):
+    __slots__ = ('expr',)
+    tag = 'write'
+
+    def __init__(self, expr):
+        self.expr = expr
+
+
+class Where(Node):
+    __slots__ = ('expr',)
+    tag = 'where'
+
+    def __init__(self, expr):
+        self.expr = expr
+
+
+class Loop(Node):
+    __slots__ = ('expr',)
+    tag = 'loop'
+
+    def __init__(self, expr):
+        self.expr = expr
+
+
+class Let(Node):
+    __slots__ = ('name', 'expr')
+    tag = 'let'
+
+    def __init__(self, name, expr):
+        self.name = name
+        self.expr = expr
+
+
+class LetMut(Node):
+    __slots__ = ('name', 'expr')
+    tag = 'let_mut'
+
+    def __init__(self, name, expr):
+        self.name = name
+        self.expr = expr
+
+
+class LetRef(Node):
+    __slots__ = ('name', 'expr')
+    tag = 'let_ref'
+
+    def __init__(self, name, expr):
+        self.name = name
+        self.expr = expr
+
+
+class Identifier(Node):
+    __slots__ = ('name',)
+    tag = 'identifier'
+
+    def __init__(self, name):
+        self.name = name
+
+
+class Number(Node):
+    __slots__ = ('value',)
+    tag = 'number'
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Operation(Node):
+    __slots__ = ('op', 'left', 'right')
+    tag = 'operation'
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+# Node class for every tag, used to rebuild nodes from tuples
+NODE_TYPES = {cls.tag: cls for cls in Node.__subclasses__()}
+
+
+def to_tuple(tree):
+    """
+    Convert a tree of nodes into the equivalent tagged tuples
+
+    :param tree: A node, a list of nodes or a leaf value
+    """
+    if isinstance(tree, Node):
+        return (tree.tag, *map(to_tuple, tree.children()))
+    if isinstance(tree, list):
+        return [to_tuple(item) for item in tree]
+    return tree
+
+
+def from_tuple(tree):
+    """
+    Convert tagged tuples back into nodes (inverse of `to_tuple`)
+
+    :param tree: A tagged tuple, a list or a leaf value
+    """
+    if isinstance(tree, tuple) and tree and tree[0] in NODE_TYPES:
+        cls = NODE_TYPES[tree[0]]
+        # Function parameters are plain (name, type) tuples, not nodes
+        return cls(*(child if name == 'params' else from_tuple(child)
+                     for name, child in zip(cls.__slots__, tree[1:])))
+    if isinstance(tree, list):
+        return [from_tuple(item) for item in tree]
+    return tree
+
+
+class NodeVisitor:
+    """
+    Type-dispatched tree visitor
+
+    `visit(node)` calls `visit_<ClassName>(node)`, falling back to
+    `generic_visit`. The method is looked up once per node class and
+    cached, so dispatch is a single dictionary lookup.
+    """
+
+    def __init__(self):
+        self._dispatch = {}
+
+    def visit(self, node):
+        try:
+            method = self._dispatch[type(node)]
+        except KeyError:
+            method = getattr(self, 'visit_' + type(node).__name__, self.generic_visit)
+            self._dispatch[type(node)] = method
+        return method(node)
+
+    def generic_visit(self, node):
+        """
+        Visit every child node (lists of nodes included)
+        """
+        if isinstance(node, list):
+            for item in node:
+                self.visit(item)
+        elif isinstance(node, Node):
+            for child in node.children():
+                if isinstance(child, (Node, list)):
+                    self.visit(child)
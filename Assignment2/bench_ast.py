@@ -0,0 +1,104 @@
+"""
+Benchmark the `__slots__` AST nodes against the old tagged tuples
+
+Reports the memory per node (measured with tracemalloc) and the time of a
+full tree walk with the type-dispatched `NodeVisitor` against a walker
+that dispatches on the tuple tag string.
+
+Usage:
+    python bench_ast.py [statements]     (default: 200000)
+"""
+import sys
+import time
+import tracemalloc
+
+import ast_nodes as ast
+import pl2
+from bench_scaling import generate
+from scanner import Scanner
+
+
+class NameCounter(ast.NodeVisitor):
+    """
+    Count identifier references, visiting every node of the tree
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def visit_Identifier(self, node):
+        self.count += 1
+
+    def visit_Number(self, node):
+        pass
+
+    def visit_Operation(self, node):
+        self.visit(node.left)
+        self.visit(node.right)
+
+    def visit_Assign(self, node):
+        self.visit(node.expr)
+
+
+def count_names(tree):
+    """
+    The same walk over tagged tuples, dispatching on `tree[0]`
+    """
+    if isinstance(tree, list):
+        return sum(count_names(item) for item in tree)
+    tag = tree[0]
+    if tag == 'program':
+        return count_names(tree[1])
+    elif tag == 'function':
+        return count_names(tree[4])
+    elif tag == 'assign':
+        return count_names(tree[2])
+    elif tag == 'operation':
+        return count_names(tree[2]) + count_names(tree[3])
+    elif tag == 'identifier':
+        return 1
+    return 0
+
+
+def count_nodes(tree):
+    if isinstance(tree, ast.Node):
+        return 1 + sum(count_nodes(child) for child in tree.children())
+    if isinstance(tree, list):
+        return sum(count_nodes(item) for item in tree)
+    return 0
+
+
+def measure(build):
+    tracemalloc.start()
+    tree = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tree, size
+
+
+if __name__ == "__main__":
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    data = generate(statements)
+    tree = pl2.get_parser().parse(data, lexer=Scanner(pl2))
+    nodes = count_nodes(tree)
+
+    tree, node_bytes = measure(lambda: ast.from_tuple(ast.to_tuple(tree)))
+    tuples, tuple_bytes = measure(lambda: ast.to_tuple(tree))
+    print(f'{nodes:,} nodes')
+    print(f'tuples  {tuple_bytes / nodes:6.1f} bytes/node')
+    print(f'slots   {node_bytes / nodes:6.1f} bytes/node '
+          f'({(1 - node_bytes / tuple_bytes) * 100:.0f}% less)\n')
+
+    start = time.perf_counter()
+    expected = count_names(tuples)
+    tuple_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    counter = NameCounter()
+    counter.visit(tree)
+    visitor_time = time.perf_counter() - start
+
+    assert counter.count == expected
+    print(f'tag dispatch   {tuple_time:6.3f}s')
+    print(f'type dispatch  {visitor_time:6.3f}s ({tuple_time / visitor_time:.2f}x)')
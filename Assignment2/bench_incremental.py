@@ -0,0 +1,62 @@
+"""
+Benchmark edit-to-AST latency of the incremental parser as files grow
+
+For each file size, edits one function in the middle of the file, first
+without moving anything after it, then adding a line (so the items after
+it move), and compares the time of the incremental re-parse with a full
+parse.
+
+Usage:
+    python bench_incremental.py [items ...]     (default: 100 1000 10000)
+"""
+import sys
+import time
+
+import pl2
+from incremental import IncrementalParser
+
+
+def generate(items, edited=None, body=''):
+    parts = []
+    for i in range(items):
+        extra = body if i == edited else ''
+        parts.append(f'fn f{i}(a int, b int) int {{\n    let x = a + {i};\n{extra}'
+                     f'    if x > b {{\n        x = x - 1;\n    }}\n    return x;\n}}\n\n')
+    return ''.join(parts)
+
+
+def full_parse(source):
+    lexer = pl2.lexer.clone()
+    lexer.lineno = 1
+    return pl2.get_parser().parse(source, lexer=lexer)
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [100, 1000, 10000]
+    edits = 20
+    print(f'{"Items":>6} {"Full parse":>11} {"In-place edit":>14} {"Line added":>11}')
+    for size in sizes:
+        middle = size // 2
+        source = generate(size)
+        start = time.perf_counter()
+        expected = full_parse(source)
+        full = time.perf_counter() - start
+
+        incremental = IncrementalParser()
+        incremental.parse(source)
+        times = {'edit': 0.0, 'line': 0.0}
+        for kind in ('edit', 'line'):
+            for n in range(edits):
+                if kind == 'edit':
+                    # Same length and lines, only the number changes
+                    body = f'    x = x * {n % 10};\n'
+                else:
+                    body = '    x = x + 1;\n' * (n + 1)
+                edited = generate(size, middle, body)
+                start = time.perf_counter()
+                tree = incremental.parse(edited)
+                times[kind] += time.perf_counter() - start
+                assert incremental.reparsed == 1
+            assert tree == full_parse(edited)
+        print(f'{size:6} {full * 1000:9.1f}ms {times["edit"] / edits * 1000:12.2f}ms'
+              f' {times["line"] / edits * 1000:9.2f}ms')
@@ -0,0 +1,32 @@
+"""
+Scaling benchmark for the list-building grammar actions
+
+Parses one function with N statements for each N and reports the time per
+statement, which should stay roughly constant (linear growth overall).
+
+Usage:
+    python bench_scaling.py [N ...]     (default: 10000 100000 1000000)
+"""
+import sys
+import time
+
+import pl2
+from scanner import Scanner
+
+
+def generate(statements):
+    body = ''.join(f'    x{i % 10} = x{i % 7} + {i};\n' for i in range(statements))
+    return 'fn main() {\n' + body + '}\n'
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [10000, 100000, 1000000]
+    parser = pl2.get_parser()
+    print(f'{"Statements":>10} {"Seconds":>9} {"us/statement":>13}')
+    for size in sizes:
+        data = generate(size)
+        start = time.perf_counter()
+        tree = parser.parse(data, lexer=Scanner(pl2))
+        elapsed = time.perf_counter() - start
+        assert len(tree.items[0].statements) == size
+        print(f'{size:10} {elapsed:9.2f} {elapsed / size * 1e6:13.2f}')
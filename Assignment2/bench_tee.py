@@ -0,0 +1,85 @@
+"""
+Benchmark the pl2 driver lexing once (tee'd tokens) against lexing twice
+
+Each driver writes the token table and parses the source:
+  - two passes: the table with one print() per token, then `parse()`,
+    which lexes again (what `pl2.py` used to do)
+  - two passes, batched: the same with `TokenTable`
+  - one pass: `parse(data, on_token=table.add)`, the table is written as
+    the parser reads the tokens
+
+Output goes to /dev/null.
+
+Usage:
+    python bench_tee.py [items ...]     (default: 1000 10000 30000)
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+import pl2
+from bench_incremental import generate
+
+
+def two_passes(data, out):
+    pl2.lexer.input(data)
+    headers = ['Line', 'Token', 'Value']
+    print(f'{headers[0]:4} {headers[1]:15} {headers[2]}', file=out)
+    print("-"*27, file=out)
+    while True:
+        token = pl2.lexer.token()
+        if not token:
+            break
+        print(f'{token.lineno:4} {token.type:15} {token.value}', file=out)
+    print("\n", file=out)
+    pl2.lexer.lineno = 1
+    return pl2.parse(data)
+
+
+def two_passes_batched(data, out):
+    pl2.lexer.input(data)
+    table = pl2.TokenTable(out)
+    for token in iter(pl2.lexer.token, None):
+        table.add(token)
+    table.close()
+    pl2.lexer.lineno = 1
+    return pl2.parse(data)
+
+
+def one_pass(data, out):
+    table = pl2.TokenTable(out)
+    result = pl2.parse(data, on_token=table.add)
+    table.close()
+    return result
+
+
+DRIVERS = (
+    ('Two passes', two_passes),
+    ('Batched', two_passes_batched),
+    ('One pass', one_pass),
+)
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1000, 10000, 30000]
+    print(f'{"Items":>6} {"Tokens":>8}' + ''.join(f' {name:>11}' for name, _ in DRIVERS))
+    with open(os.devnull, 'w') as out:
+        for size in sizes:
+            data = generate(size)
+            lexer = pl2.lexer.clone()
+            lexer.input(data)
+            tokens = sum(1 for _ in iter(lexer.token, None))
+            row = ''
+            expected = None
+            for name, driver in DRIVERS:
+                pl2.lexer.lineno = 1
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    result = driver(data, out)
+                    elapsed = time.perf_counter() - start
+                assert result is not None and (expected is None or result == expected)
+                expected = result
+                row += f' {elapsed:10.3f}s'
+            print(f'{size:6} {tokens:8}{row}')
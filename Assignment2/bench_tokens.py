@@ -0,0 +1,80 @@
+"""
+Benchmark the memory and speed of slotted `Token`s against LexTokens
+
+Three ways of lexing the same large pl2 source:
+  - the ply lexer (LexToken)
+  - `Scanner(pl2)` (LexToken)
+  - `Scanner(pl2, slots=True)` (Token)
+
+For each, all the tokens are kept in a list while tracemalloc counts the
+memory and the number of blocks still allocated, then (in separate passes,
+without tracemalloc) lexing and lex+parse with pl2 are timed.
+
+Usage:
+    python bench_tokens.py [items]      (default: 20000, about 680k tokens)
+"""
+import sys
+import time
+import tracemalloc
+
+import pl2
+from bench_incremental import full_parse, generate
+from scanner import Scanner
+
+
+def ply_lexer():
+    lexer = pl2.lexer.clone()
+    lexer.lineno = 1
+    return lexer
+
+
+LEXERS = (
+    ('ply', ply_lexer),
+    ('scanner', lambda: Scanner(pl2)),
+    ('slots', lambda: Scanner(pl2, slots=True)),
+)
+
+
+def tokens(lexer, source):
+    lexer.input(source)
+    return list(iter(lexer.token, None))
+
+
+def measure(make, source):
+    lexer = make()
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    result = tokens(lexer, source)
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = end.compare_to(start, 'filename')
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    return result, size, blocks
+
+
+def best(function, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+if __name__ == "__main__":
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source = generate(items)
+    expected = full_parse(source)
+
+    print(f'{"Lexer":8} {"Tokens":>8} {"Memory":>9} {"Bytes/token":>12} {"Blocks":>10}'
+          f' {"Lex":>8} {"Lex+parse":>10}')
+    for name, make in LEXERS:
+        result, size, blocks = measure(make, source)
+        count = len(result)
+        del result
+        lexed, _ = best(lambda: tokens(make(), source))
+        parsed, tree = best(lambda: pl2.get_parser().parse(source, lexer=make()))
+        assert tree == expected
+        print(f'{name:8} {count:8} {size / 2 ** 20:7.1f}MB {size / count:12.1f} {blocks:10}'
+              f' {lexed:7.3f}s {parsed:9.3f}s')
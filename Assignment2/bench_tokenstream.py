@@ -0,0 +1,69 @@
+"""
+Benchmark reusing a saved token stream instead of lexing the source again
+
+For each file size, compares:
+  - lex + parse (`get_parser().parse(source)`) with parsing a token stream
+    loaded from disk (`pl2.parse_tokens(path)`)
+  - counting the tokens of each type with the lexer and with the arrays
+    of the token stream (no LexToken built)
+
+Usage:
+    python bench_tokenstream.py [items ...]     (default: 100 1000 10000)
+"""
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import pl2
+import tokenstream
+from bench_incremental import full_parse, generate
+
+
+def lex_counts(source):
+    lexer = pl2.lexer.clone()
+    lexer.lineno = 1
+    lexer.input(source)
+    return Counter(token.type for token in iter(lexer.token, None))
+
+
+def stream_counts(stream):
+    return Counter({stream.names[kind]: n for kind, n in Counter(stream.types).items()})
+
+
+def open_counts(path):
+    with tokenstream.TokenStream.open(path) as stream:
+        return stream_counts(stream)
+
+
+def best(function, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [100, 1000, 10000]
+    print(f'{"Items":>6} {"Tokens":>8} {"File":>9} {"Lex+parse":>10} {"Stream parse":>13}'
+          f' {"Lex count":>10} {"Array count":>12}')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.tks')
+        for size in sizes:
+            source = generate(size)
+            tokenstream.export(pl2, source, path)
+
+            parsed, expected = best(lambda: full_parse(source))
+            streamed, tree = best(lambda: pl2.parse_tokens(path))
+            assert tree == expected
+
+            lexed, counts = best(lambda: lex_counts(source))
+            counted, stream_result = best(lambda: open_counts(path))
+            assert counts == stream_result
+
+            print(f'{size:6} {sum(counts.values()):8} {os.path.getsize(path) / 1024:7.0f}kB'
+                  f' {parsed * 1000:8.1f}ms {streamed * 1000:11.1f}ms'
+                  f' {lexed * 1000:8.1f}ms {counted * 1000:10.2f}ms')
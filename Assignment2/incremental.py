@@ -0,0 +1,229 @@
+import re
+from bisect import bisect_right
+
+import ast_nodes as ast
+import pl2
+
+# ==================================================================
+#                        INCREMENTAL PARSING
+# ==================================================================
+#
+# Keeps the parse tree of a source that is edited over time (editor, watch
+# mode) and re-parses only the top-level items an edit touched.
+#
+# The source is split into chunks, one per top-level `fn` or `struct`: a
+# chunk ends after the `}` that brings the brace depth back to 0, and
+# starts with whatever whitespace and comments precede the item. After an
+# edit, the common prefix and suffix of the old and new source locate the
+# edit, the chunks it overlaps are split and parsed again (with the lexer
+# line number set to where they start, so syntax errors report the right
+# lines), and every other chunk keeps its tree.
+#
+# Usage:
+#     incremental = IncrementalParser()
+#     tree = incremental.parse(source)
+#     tree = incremental.parse(edited_source)     # re-parses edited items only
+
+# Only braces matter for item boundaries, but not those in comments
+BRACES = re.compile(r'//[^\n]*|[{}]')
+COMMENT = re.compile(r'//[^\n]*')
+
+# Characters compared at once when looking for the edited region
+BLOCK = 65536
+
+
+class Chunk:
+    """
+    The source text of one top-level item and its tree
+
+    :param text: The item, preceded by whitespace and comments
+    :param line: The line the text starts on
+    """
+    __slots__ = ('text', 'line', 'node', 'errors')
+
+    def __init__(self, text, line):
+        self.text = text
+        self.line = line
+        self.node = None        # the Function or Struct, None if it has errors
+        self.errors = []
+
+
+def split(text):
+    """
+    Split source text into item chunks
+
+    :return: (chunk texts, True if the last chunk ends at brace depth 0)
+    """
+    chunks = []
+    start = 0
+    depth = 0
+    for match in BRACES.finditer(text):
+        brace = match.group()
+        if brace == '{':
+            depth += 1
+        elif brace == '}':
+            depth -= 1
+            if depth == 0:
+                chunks.append(text[start:match.end()])
+                start = match.end()
+    tail = text[start:]
+    closed = not tail or (depth == 0 and bool(chunks) and not COMMENT.sub('', tail).strip())
+    if tail:
+        if closed:
+            # Trailing whitespace belongs to the last item
+            chunks[-1] += tail
+        else:
+            chunks.append(tail)
+    return chunks, closed
+
+
+def common_prefix(a, b):
+    """
+    Return the length of the common prefix of two strings. Whole blocks
+    are compared first and the differing block is bisected, so the work is
+    a few slice comparisons rather than one step per character.
+    """
+    size = min(len(a), len(b))
+    low = 0
+    while low + BLOCK <= size and a[low:low + BLOCK] == b[low:low + BLOCK]:
+        low += BLOCK
+    high = min(low + BLOCK, size)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def common_suffix(a, b, limit):
+    """
+    Return the length of the common suffix of two strings, at most `limit`
+    """
+    size = min(len(a), len(b), limit)
+    end_a, end_b = len(a), len(b)
+    low = 0
+    while low + BLOCK <= size and a[end_a - low - BLOCK:end_a - low] == b[end_b - low - BLOCK:end_b - low]:
+        low += BLOCK
+    high = min(low + BLOCK, size)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[end_a - middle:end_a - low] == b[end_b - middle:end_b - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class IncrementalParser:
+    """
+    Parse successive versions of a pl2 source, reusing the trees of the
+    top-level items that did not change
+    """
+
+    def __init__(self):
+        self.source = ''
+        self.chunks = []
+        self.starts = []        # offset of every chunk in `source`
+        self.nodes = []         # tree of every chunk
+        self.failed = set()     # chunks with syntax errors
+        self.lexer = pl2.lexer.clone()
+        self.reparsed = 0       # chunks parsed by the last call
+        self.errors = []        # syntax errors of the last call
+
+    def parse(self, source):
+        """
+        Return the tree of `source`, or None if it has syntax errors (they
+        are in `errors`)
+        """
+        self.reparsed = 0
+        if not self.chunks:
+            texts, _ = split(source)
+            self.replace(0, 0, texts, 1, 0)
+        else:
+            self.update(source)
+        self.source = source
+
+        self.errors = [error for chunk in sorted(self.failed, key=lambda chunk: chunk.line)
+                       for error in chunk.errors]
+        if self.errors or not self.chunks:
+            return None
+        return ast.Program(list(self.nodes))
+
+    def update(self, source):
+        old = self.source
+        prefix = common_prefix(old, source)
+        suffix = common_suffix(old, source, min(len(old), len(source)) - prefix)
+        if prefix == len(old) == len(source):
+            return
+        delta = len(source) - len(old)
+
+        # The chunks that overlap the edit, in the old source
+        first = max(bisect_right(self.starts, prefix) - 1, 0)
+        last = max(bisect_right(self.starts, max(len(old) - suffix - 1, prefix)) - 1, first)
+
+        # Extend the region until it splits into complete items (an edit can
+        # open or close braces, or leave only whitespace and comments)
+        while True:
+            start = self.starts[first]
+            end = self.starts[last + 1] if last + 1 < len(self.chunks) else len(old)
+            texts, closed = split(source[start:end + delta])
+            if closed and texts:
+                break
+            if last + 1 < len(self.chunks):
+                last += 1
+            elif first > 0:
+                first -= 1
+            else:
+                break
+
+        removed = self.chunks[first:last + 1]
+        shift = sum(text.count('\n') for text in texts) - sum(chunk.text.count('\n') for chunk in removed)
+        if delta:
+            self.starts[last + 1:] = [offset + delta for offset in self.starts[last + 1:]]
+        if shift:
+            for chunk in self.chunks[last + 1:]:
+                chunk.line += shift
+            for chunk in list(self.failed):
+                if chunk.line > removed[0].line:
+                    # Parse again so that its errors report the new lines
+                    self.parse_chunk(chunk)
+        self.replace(first, last + 1, texts, removed[0].line, start)
+
+    def replace(self, first, end, texts, line, offset):
+        """
+        Replace chunks `first` to `end` (excluded) with new chunks for
+        `texts`, starting at `line` and `offset`
+        """
+        for chunk in self.chunks[first:end]:
+            self.failed.discard(chunk)
+        chunks = []
+        starts = []
+        for text in texts:
+            chunk = Chunk(text, line)
+            self.parse_chunk(chunk)
+            chunks.append(chunk)
+            starts.append(offset)
+            line += text.count('\n')
+            offset += len(text)
+        self.chunks[first:end] = chunks
+        self.starts[first:end] = starts
+        self.nodes[first:end] = [chunk.node for chunk in chunks]
+
+    def parse_chunk(self, chunk):
+        """
+        Parse one chunk on its own, starting at its line
+        """
+        self.reparsed += 1
+        pl2.errors.clear()
+        self.lexer.lineno = chunk.line
+        result = pl2.get_parser().parse(chunk.text, lexer=self.lexer)
+        if pl2.errors or result is None or len(result.items) != 1:
+            chunk.node = None
+            chunk.errors = list(pl2.errors) or [f"Expected one item at line {chunk.line}"]
+            self.failed.add(chunk)
+        else:
+            chunk.node = result.items[0]
+            chunk.errors = []
+            self.failed.discard(chunk)
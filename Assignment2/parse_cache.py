@@ -0,0 +1,184 @@
+import hashlib
+import marshal
+import os
+import tempfile
+import time
+
+# ==================================================================
+#                        PARSE CACHE
+# ==================================================================
+#
+# A content-addressed cache of parse trees on disk. Each entry is one file
+# named after the SHA-256 of the grammar hash and the source text, holding
+# the tree serialized with `marshal`. A hit skips lexing and parsing
+# entirely.
+#
+# The directory is kept under `max_bytes` by evicting the least recently
+# used entries, down to 90% of it so that eviction (which lists the
+# directory) does not run on every store. A hit touches the file, so the
+# modification time is the last use. Temporary files left by interrupted
+# stores are removed once they are older than `STALE_AFTER` seconds; younger
+# ones may still be written by another process.
+#
+# Usage:
+#     cache = pl3.open_cache('.parse_cache')
+#     tree = pl3.parse(data, cache=cache)
+#     print(cache.stats())
+#
+# Assignment2 and Assignment3 have identical copies of this file, so that
+# each assignment runs on its own. Change both of them together;
+# tests/test_copies.py checks that they match.
+
+SUFFIX = '.ast'
+TEMP_SUFFIX = '.tmp'
+# Age (in seconds) after which a temporary file is assumed abandoned
+STALE_AFTER = 600
+
+
+def file_hash(*paths):
+    """
+    Return the SHA-256 of the contents of the given files, used as the
+    grammar hash: it changes whenever the grammar or its actions do
+
+    :param paths: The files that define the grammar and the tree format
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    Parse trees stored on disk, keyed by source text and grammar
+
+    :param directory: Where the entries are stored (created if missing)
+    :param grammar: The grammar hash, see `file_hash()`
+    :param max_bytes: The maximum total size of the entries
+    """
+
+    def __init__(self, directory, grammar, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.grammar = grammar.encode()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._remove_stale()
+        self.size = sum(stat.st_size for _, stat in self._entries())
+        if self.size > max_bytes:
+            self.evict()
+
+    def key(self, source):
+        digest = hashlib.sha256(self.grammar)
+        digest.update(b'\0')
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def get(self, source):
+        """
+        Return the cached tree of `source`, or None
+        """
+        path = os.path.join(self.directory, self.key(source) + SUFFIX)
+        try:
+            with open(path, 'rb') as f:
+                tree = marshal.loads(f.read())
+            os.utime(path)
+        except (OSError, EOFError, ValueError, TypeError):
+            # Missing, evicted by another process, or truncated
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tree
+
+    def put(self, source, tree):
+        """
+        Store the tree of `source`; it must only hold values `marshal`
+        supports (tuples, lists, strings, numbers, booleans and None)
+        """
+        data = marshal.dumps(tree)
+        path = os.path.join(self.directory, self.key(source) + SUFFIX)
+        try:
+            self.size -= os.path.getsize(path)
+        except FileNotFoundError:
+            pass
+        # Write then rename, so a concurrent reader never sees half a file.
+        # The temporary name is unique, so threads storing the same source
+        # do not write into one file.
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=TEMP_SUFFIX, delete=False) as f:
+            f.write(data)
+        os.replace(f.name, path)
+        self.size += len(data)
+        self.stores += 1
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache uses at most
+        90% of `max_bytes`
+        """
+        self._remove_stale()
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        self.size = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if self.size <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Evicted by another process meanwhile
+                pass
+            except OSError:
+                continue
+            self.size -= stat.st_size
+            self.evictions += 1
+
+    def clear(self):
+        self._remove_stale()
+        for path, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.size = 0
+
+    def stats(self):
+        """
+        Return the counters and the current size as a dict
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'stores': self.stores,
+                'evictions': self.evictions, 'entries': sum(1 for _ in self._entries()),
+                'bytes': self.size, 'max_bytes': self.max_bytes}
+
+    def _entries(self):
+        """
+        Return (path, stat) pairs for the entries, skipping those another
+        process removes while the directory is listed
+        """
+        found = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(SUFFIX):
+                    try:
+                        found.append((entry.path, entry.stat()))
+                    except FileNotFoundError:
+                        continue
+        return found
+
+    def _remove_stale(self):
+        """
+        Remove the temporary files of stores that were interrupted
+        """
+        cutoff = time.time() - STALE_AFTER
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(TEMP_SUFFIX):
+                    try:
+                        if entry.stat().st_mtime < cutoff:
+                            os.remove(entry.path)
+                    except FileNotFoundError:
+                        continue
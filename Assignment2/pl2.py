@@ -1,6 +1,16 @@
+import contextlib
+import io
+import os
+import sys
+
 import ply.yacc as yacc
 import ply.lex as lex
 
+import ast_nodes as ast
+import parse_cache
+from scanner import CHUNK_SIZE, Scanner
+from tokenstream import TokenStream
+
 # List of all token names + new `type` tokens
 tokens = [
     'IDENTIFIER', 'NUMBER',
@@ -122,14 +132,16 @@ def p_program(p):
                | function
                | struct'''
     if len(p) == 2:
-        p[0] = ('program', [p[1]])
+        p[0] = ast.Program([p[1]])
     else:
-        p[0] = ('program', p[1][1] + [p[2]])
+        # Append in place, `p[1].items + [p[2]]` would copy the list every time
+        p[1].items.append(p[2])
+        p[0] = p[1]
 
 
 def p_function(p):
     '''function : FN IDENTIFIER LPAREN list_parameters RPAREN return_type LCURLY statements RCURLY'''
-    p[0] = ('function', p[2], p[4], p[6], p[8])
+    p[0] = ast.Function(p[2], p[4], p[6], p[8])
 
 
 def p_return_type(p):
@@ -145,7 +157,8 @@ def p_statements_single(p):
 
 def p_statements_multiple(p):
     '''statements : statements statement'''
-    p[0] = p[1] + [p[2]]
+    p[1].append(p[2])
+    p[0] = p[1]
 
 
 def p_statement_assignment(p):
@@ -175,12 +188,12 @@ def p_statement_let(p):
 
 def p_assignment_statement(p):
     '''assignment_statement : IDENTIFIER EQUALS expression SEMICOLON'''
-    p[0] = ('assign', p[1], p[3])
+    p[0] = ast.Assign(p[1], p[3])
 
 
 def p_if_statement(p):
     '''if_statement : IF expression LCURLY statements RCURLY else_clause'''
-    p[0] = ('if', p[2], p[4], p[6])
+    p[0] = ast.If(p[2], p[4], p[6])
 
 
 def p_else_clause(p):
@@ -188,36 +201,36 @@ def p_else_clause(p):
                    | ELSE IF expression LCURLY statements RCURLY else_clause
                    | empty'''
     if len(p) == 5:
-        p[0] = ('else', p[3])
+        p[0] = ast.Else(p[3])
     elif len(p) == 8:
-        p[0] = ('else_if', p[3], p[5], p[7])
+        p[0] = ast.ElseIf(p[3], p[5], p[7])
     else:
         p[0] = None
 
 
 def p_while_statement(p):
     '''while_statement : WHILE LPAREN expression RPAREN LCURLY statements RCURLY'''
-    p[0] = ('while', p[3], p[6])
+    p[0] = ast.While(p[3], p[6])
 
 
 def p_action_statement_return(p):
     '''action_statement : RETURN expression SEMICOLON'''
-    p[0] = ('return', p[2])
+    p[0] = ast.Return(p[2])
 
 
 def p_action_statement_write(p):
     '''action_statement : WRITE expression SEMICOLON'''
-    p[0] = ('write', p[2])
+    p[0] = ast.Write(p[2])
 
 
 def p_action_statement_where(p):
     '''action_statement : WHERE expression SEMICOLON'''
-    p[0] = ('where', p[2])
+    p[0] = ast.Where(p[2])
 
 
 def p_action_statement_loop(p):
     '''action_statement : LOOP expression SEMICOLON'''
-    p[0] = ('loop', p[2])
+    p[0] = ast.Loop(p[2])
 
 
 def p_let_expression(p):
@@ -225,16 +238,16 @@ def p_let_expression(p):
                       | LET MUT IDENTIFIER EQUALS expression SEMICOLON
                       | LET REF IDENTIFIER EQUALS expression SEMICOLON'''
     if len(p) == 6:
-        p[0] = ('let', p[2], p[4])
+        p[0] = ast.Let(p[2], p[4])
     elif p[1] == 'let' and p[2] == 'mut':
-        p[0] = ('let_mut', p[3], p[5])
+        p[0] = ast.LetMut(p[3], p[5])
     else:
-        p[0] = ('let_ref', p[3], p[5])
+        p[0] = ast.LetRef(p[3], p[5])
 
 
 def p_expression_identifier(p):
     '''expression : IDENTIFIER'''
-    p[0] = ('identifier', p[1])
+    p[0] = ast.Identifier(p[1])
 
 
 def p_expression_operation(p):
@@ -248,7 +261,7 @@ def p_expression_operation(p):
                   | expression GEQ expression
                   | expression LT expression
                   | expression GT expression'''
-    p[0] = ('operation', p[2], p[1], p[3])
+    p[0] = ast.Operation(p[2], p[1], p[3])
 
 
 def p_expression_paren(p):
@@ -258,12 +271,12 @@ def p_expression_paren(p):
 
 def p_expression_number(p):
     '''expression : NUMBER'''
-    p[0] = ('number', p[1])
+    p[0] = ast.Number(p[1])
 
 
 def p_struct(p):
     '''struct : STRUCT IDENTIFIER LCURLY struct_statements RCURLY'''
-    p[0] = ('struct', p[2], p[4])
+    p[0] = ast.Struct(p[2], p[4])
 
 
 def p_struct_statements(p):
@@ -272,7 +285,8 @@ def p_struct_statements(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
 
 
 def p_list_parameters_empty(p):
@@ -280,14 +294,23 @@ def p_list_parameters_empty(p):
     p[0] = []
 
 
-def p_list_parameters_single(p):
-    '''list_parameters : IDENTIFIER type'''
+def p_list_parameters_nonempty(p):
+    '''list_parameters : parameters
+                       | parameters COMMA'''
+    # A trailing comma is allowed, as it was with the right-recursive rule
+    p[0] = p[1]
+
+
+def p_parameters_single(p):
+    '''parameters : IDENTIFIER type'''
     p[0] = [(p[1], p[2])]
 
 
-def p_list_parameters_multiple(p):
-    '''list_parameters : IDENTIFIER type COMMA list_parameters'''
-    p[0] = [(p[1], p[2])] + p[4]
+def p_parameters_multiple(p):
+    '''parameters : parameters COMMA IDENTIFIER type'''
+    # Left-recursive so the parser stack stays flat for long lists
+    p[1].append((p[3], p[4]))
+    p[0] = p[1]
 
 
 def p_type(p):
@@ -304,20 +327,200 @@ def p_empty(p):
     pass
 
 
+# Syntax errors of the last parse()
+errors = []
+
+
 def p_error(p):
     if p:
-        print(f"Syntax error at '{p.value}', line {p.lineno}")
+        message = f"Syntax error at '{p.value}', line {p.lineno}"
     else:
-        print("Syntax error at EOF")
+        message = "Syntax error at EOF"
+    errors.append(message)
+    print(message)
+
+
+# Build the parser lazily from the prebuilt LALR tables in `pl2_parsetab.py`
+parser = None
+
+
+def normalize_rules():
+    """
+    Strip the indentation of the grammar rules in the `p_` docstrings.
+    ply hashes the docstrings into the signature it checks the prebuilt
+    tables against, and Python 3.13 dedents docstrings where older versions
+    keep them as written, so the tables would only match on one of them.
+    """
+    for name, function in globals().items():
+        if name.startswith('p_') and function.__doc__:
+            function.__doc__ = '\n'.join(line.strip() for line in function.__doc__.splitlines())
 
 
-# Build the parser
-parser = yacc.yacc()
+def get_parser():
+    """
+    Return the parser, building it on first use from the prebuilt tables.
+    ply checks the tables against the grammar signature; if the grammar has
+    changed it rebuilds them in memory without writing any files.
+    """
+    global parser
+    if parser is None:
+        try:
+            import pl2_parsetab as tabmodule
+        except ImportError:
+            tabmodule = 'pl2_parsetab'
+        normalize_rules()
+        parser = yacc.yacc(tabmodule=tabmodule, write_tables=False, debug=False)
+    return parser
+
+
+def build_tables():
+    """
+    Regenerate `pl2_parsetab.py` next to this file. Run `python
+    build_tables.py` from the repository root after changing the grammar.
+    """
+    global parser
+    outputdir = os.path.dirname(os.path.abspath(__file__))
+    tabfile = os.path.join(outputdir, 'pl2_parsetab.py')
+    if os.path.exists(tabfile):
+        os.remove(tabfile)
+    normalize_rules()
+    parser = yacc.yacc(tabmodule='pl2_parsetab', outputdir=outputdir, debug=False)
 
 
-def parse(data):
+def tee_tokens(data, consumer):
+    """
+    Return a tokenfunc for `parser.parse()` that lexes `data` once and also
+    hands every token to `consumer`, so nothing has to lex it a second time
+
+    :param data: The source text
+    :param consumer: Called with each token before the parser gets it
+    """
+    lexer.input(data)
+    return tee_tokenfunc(lexer.token, consumer)
+
+
+class TokenTable:
+    """
+    Writes the Line/Token/Value table of the tokens given to `add()`. Rows
+    are written a batch at a time.
+
+    :param out: A text file
+    :param batch: The number of rows kept before writing
+    """
+
+    def __init__(self, out, batch=4096):
+        self.out = out
+        self.batch = batch
+        self.rows = []
+        headers = ['Line', 'Token', 'Value']  # for format output
+        out.write(f'{headers[0]:4} {headers[1]:15} {headers[2]}\n')
+        out.write("-"*27 + '\n')
+
+    def add(self, token):
+        self.rows.append(f'{token.lineno:4} {token.type:15} {token.value}\n')
+        if len(self.rows) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        self.out.write(''.join(self.rows))
+        self.rows.clear()
+
+    def close(self):
+        self.flush()
+        self.out.write("\n\n")
+
+
+def parse(data, cache=None, on_token=None):
+    """
+    Parse the provided data and return the tree
+
+    :param data: The source text
+    :param cache: A `ParseCache` (see `open_cache()`); a tree found there is
+                  returned without lexing or parsing, and trees parsed
+                  without syntax errors are stored
+    :param on_token: Called with every token as it is lexed (see
+                     `tee_tokens()`). The input is still lexed on a cache hit.
+    """
     print("Parsing:")
-    return parser.parse(data)
+    errors.clear()
+    if cache is not None:
+        tree = cache.get(data)
+        if tree is not None:
+            if on_token is not None:
+                for token in iter(tee_tokens(data, on_token), None):
+                    pass
+            return ast.from_tuple(tree)
+
+    if on_token is None:
+        result = get_parser().parse(data)
+    else:
+        tokenfunc = tee_tokens(data, on_token)
+        result = get_parser().parse(lexer=lexer, tokenfunc=tokenfunc)
+        # The parser stops at the end of the input, so this is only needed
+        # if it gave up early
+        while tokenfunc() is not None:
+            pass
+    if cache is not None and result is not None and not errors:
+        cache.put(data, ast.to_tuple(result))
+    return result
+
+
+def parse_file(path, chunk_size=CHUNK_SIZE, on_token=None):
+    """
+    Parse a file without reading it whole: it is scanned in chunks (see
+    `Scanner.input_file()`), so memory grows with the tree, not the text
+
+    :param path: The source file (UTF-8)
+    :param chunk_size: The number of bytes read at a time
+    :param on_token: Called with every token as the parser reads it
+    """
+    print("Parsing:")
+    errors.clear()
+    scanner = Scanner(sys.modules[__name__], ply_words=True)
+    scanner.input_file(path, chunk_size)
+    tokenfunc = scanner.token
+    if on_token is not None:
+        tokenfunc = tee_tokenfunc(scanner.token, on_token)
+    return get_parser().parse(lexer=scanner, tokenfunc=tokenfunc)
+
+
+def tee_tokenfunc(next_token, consumer):
+    """
+    Wrap a tokenfunc so that every token is also handed to `consumer`
+    """
+    def tokenfunc():
+        token = next_token()
+        if token is not None:
+            consumer(token)
+        return token
+    return tokenfunc
+
+
+def parse_tokens(stream):
+    """
+    Parse tokens saved by `tokenstream.export()` without lexing the source
+
+    :param stream: A `tokenstream.TokenStream`, or the path of a token
+                   stream file, which is opened and closed again
+    """
+    if isinstance(stream, (str, os.PathLike)):
+        with TokenStream.open(stream) as opened:
+            return parse_tokens(opened)
+    errors.clear()
+    return get_parser().parse(lexer=lexer, tokenfunc=stream.tokenfunc())
+
+
+def open_cache(directory, max_bytes=64 * 1024 * 1024):
+    """
+    Open (or create) an on-disk parse cache for `parse()`. Entries are keyed
+    by a hash of this file and `ast_nodes.py` too, so changing the grammar
+    or the node classes invalidates them.
+
+    :param directory: Where the cached trees are stored
+    :param max_bytes: The size above which least recently used trees are evicted
+    """
+    grammar = parse_cache.file_hash(__file__, ast.__file__)
+    return parse_cache.ParseCache(directory, grammar, max_bytes)
 
 
 def print_parse_tree(tree, indent=0):
@@ -327,8 +530,14 @@ def print_parse_tree(tree, indent=0):
     :param tree: The parse tree to print
     :param indent: The indentation level
     """
-    if isinstance(tree, tuple):
+    if isinstance(tree, ast.Node):
         # Print the root of the parsing tree
+        print('    ' * indent + tree.tag + ':')
+        for child in tree.children():
+            # Recursively print each child
+            print_parse_tree(child, indent + 1)
+    elif isinstance(tree, tuple):
+        # Function parameters are (name, type) tuples
         print('    ' * indent + str(tree[0]) + ':')
         for child in tree[1:]:
             # Recursively print each child
@@ -343,20 +552,14 @@ def print_parse_tree(tree, indent=0):
 
 
 if __name__ == "__main__":
-    with open("Program_Test.txt", 'r') as tester:
-        input_data = tester.read()
-        lexer.input(input_data)
-
-        headers = ['Line', 'Token', 'Value']  # for format output
-        print(f'{headers[0]:4} {headers[1]:15} {headers[2]}')
-        print("-"*27)
-        while True:
-            token = lexer.token()
-            if not token:
-                break
-            print(f'{token.lineno:4} {token.type:15} {token.value}')
-        print("\n")
-
-        result = parse(input_data)
-        print("\nParse Tree:\n")
-        print_parse_tree(result)
+    # Scan the file in chunks, once: the table is written as the parser
+    # reads the tokens. What the parser prints is held back so it comes
+    # after the table.
+    table = TokenTable(sys.stdout)
+    with contextlib.redirect_stdout(io.StringIO()) as parse_output:
+        result = parse_file("Program_Test.txt", on_token=table.add)
+    table.close()
+    sys.stdout.write(parse_output.getvalue())
+
+    print("\nParse Tree:\n")
+    print_parse_tree(result)
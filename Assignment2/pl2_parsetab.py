@@ -0,0 +1,84 @@
+
+# pl2_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftPLUSMINUSleftSTARSLASHMODnonassocLEQGEQLTGTnonassocEQUALSNEQBOOLEAN CHAR COMMA ELSE EQUALS FALSE FLOAT FN GEQ GT IDENTIFIER IF IN INT LCURLY LEQ LET LOOP LPAREN LSQR LT MINUS MOD MUT NEQ NUMBER PLUS PUB RCURLY REF RETURN RPAREN RSQR SEMICOLON SLASH STAR STRUCT TRUE TYPE WHERE WHILE WRITEprogram : program function\n| program struct\n| function\n| structfunction : FN IDENTIFIER LPAREN list_parameters RPAREN return_type LCURLY statements RCURLYreturn_type : type\n| emptystatements : statementstatements : statements statementstatement : assignment_statementstatement : if_statementstatement : while_statementstatement : action_statementstatement : let_expressionassignment_statement : IDENTIFIER EQUALS expression SEMICOLONif_statement : IF expression LCURLY statements RCURLY else_clauseelse_clause : ELSE LCURLY statements RCURLY\n| ELSE IF expression LCURLY statements RCURLY else_clause\n| emptywhile_statement : WHILE LPAREN expression RPAREN LCURLY statements RCURLYaction_statement : RETURN expression SEMICOLONaction_statement : WRITE expression SEMICOLONaction_statement : WHERE expression SEMICOLONaction_statement : LOOP expression SEMICOLONlet_expression : LET IDENTIFIER EQUALS expression SEMICOLON\n| LET MUT IDENTIFIER EQUALS expression SEMICOLON\n| LET REF IDENTIFIER EQUALS expression SEMICOLONexpression : IDENTIFIERexpression : expression PLUS expression\n| expression MINUS expression\n| expression STAR expression\n| expression SLASH expression\n| expression MOD expression\n| expression NEQ expression\n| expression LEQ expression\n| expression GEQ expression\n| expression LT expression\n| expression GT expressionexpression : LPAREN expression RPARENexpression : NUMBERstruct : STRUCT IDENTIFIER LCURLY struct_statements RCURLYstruct_statements : let_expression\n| struct_statements let_expressionlist_parameters :list_parameters : parameters\n| parameters COMMAparameters : IDENTIFIER typeparameters : parameters COMMA IDENTIFIER typetype : INT\n| FLOAT\n| CHAR\n| BOOLEAN\n| IDENTIFIERempty :'
+    
+_lr_action_items = {'FN':([0,1,2,3,6,7,26,75,],[4,4,-3,-4,-1,-2,-41,-5,]),'STRUCT':([0,1,2,3,6,7,26,75,],[5,5,-3,-4,-1,-2,-41,-5,]),'$end':([1,2,3,6,7,26,75,],[0,-3,-4,-1,-2,-41,-5,]),'IDENTIFIER':([4,5,10,12,17,24,25,29,30,34,35,38,42,44,45,47,48,49,50,51,52,53,54,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,74,76,78,94,95,97,99,100,101,102,103,104,106,107,108,110,111,112,113,114,115,117,118,119,120,121,],[8,9,12,18,28,18,34,36,37,18,40,46,40,40,40,46,-8,-10,-11,-12,-13,-14,40,40,40,40,40,-25,40,40,40,40,40,40,40,40,40,40,40,-9,40,-26,-27,46,-21,-22,-23,-24,-15,46,-54,46,-16,-19,46,46,40,-20,46,-17,46,46,-54,-18,]),'LPAREN':([8,35,42,44,45,54,55,56,57,58,59,61,62,63,64,65,66,67,68,69,70,74,78,113,],[10,42,42,42,42,42,78,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,]),'LCURLY':([9,18,20,21,22,23,24,31,32,33,40,43,77,83,84,85,86,87,88,89,90,91,92,93,105,109,116,],[11,-53,-49,-50,-51,-52,-54,38,-6,-7,-28,-40,97,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,107,112,118,]),'RPAREN':([10,13,14,18,19,20,21,22,23,25,39,40,43,71,83,84,85,86,87,88,89,90,91,92,93,98,],[-44,24,-45,-53,-47,-49,-50,-51,-52,-46,-48,-28,-40,93,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,105,]),'LET':([11,15,16,27,38,47,48,49,50,51,52,53,60,76,94,95,97,99,100,101,102,103,104,106,107,108,110,111,112,114,115,117,118,119,120,121,],[17,17,-42,-43,17,17,-8,-10,-11,-12,-13,-14,-25,-9,-26,-27,17,-21,-22,-23,-24,-15,17,-54,17,-16,-19,17,17,-20,17,-17,17,17,-54,-18,]),'INT':([12,24,34,],[20,20,20,]),'FLOAT':([12,24,34,],[21,21,21,]),'CHAR':([12,24,34,],[22,22,22,]),'BOOLEAN':([12,24,34,],[23,23,23,]),'COMMA':([14,18,19,20,21,22,23,39,],[25,-53,-47,-49,-50,-51,-52,-48,]),'RCURLY':([15,16,27,47,48,49,50,51,52,53,60,76,94,95,99,100,101,102,103,104,106,108,110,111,114,115,117,119,120,121,],[26,-42,-43,75,-8,-10,-11,-12,-13,-14,-25,-9,-26,-27,-21,-22,-23,-24,-15,106,-54,-16,-19,114,-20,117,-17,120,-54,-18,]),'MUT':([17,],[29,]),'REF':([17,],[30,]),'EQUALS':([28,36,37,46,],[35,44,45,74,]),'NUMBER':([35,42,44,45,54,56,57,58,59,61,62,63,64,65,66,67,68,69,70,74,78,113,],[43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,]),'IF':([38,47,48,49,50,51,52,53,60,76,94,95,97,99,100,101,102,103,104,106,107,108,109,110,111,112,114,115,117,118,119,120,121,],[54,54,-8,-10,-11,-12,-13,-14,-25,-9,-26,-27,54,-21,-22,-23,-24,-15,54,-54,54,-16,113,-19,54,54,-20,54,-17,54,54,-54,-18,]),'WHILE':([38,47,48,49,50,51,52,53,60,76,94,95,97,99,100,101,102,103,104,106,107,108,110,111,112,114,115,117,118,119,120,121,],[55,55,-8,-10,-11,-12,-13,-14,-25,-9,-26,-27,55,-21,-22,-23,-24,-15,55,-54,55,-16,-19,55,55,-20,55,-17,55,55,-54,-18,]),'RETURN':([38,47,48,49,50,51,52,53,60,76,94,95,97,99,100,101,102,103,104,106,107,108,110,111,112,114,115,117,118,119,120,121,],[56,56,-8,-10,-11,-12,-13,-14,-25,-9,-26,-27,56,-21,-22,-23,-24,-15,56,-54,56,-16,-19,56,56,-20,56,-17,56,56,-54,-18,]),'WRITE':([38,47,48,49,50,51,52,53,60,76,94,95,97,99,100,101,102,103,104,106,107,108,110,111,112,114,115,117,118,119,120,121,],[57,57,-8,-10,-11,-12,-13,-14,-25,-9,-26,-27,57,-21,-22,-23,-24,-15,57,-54,57,-16,-19,57,57,-20,57,-17,57,57,-54,-18,]),'WHERE':([38,47,48,49,50,51,52,53,60,76,94,95,97,99,100,101,102,103,104,106,107,108,110,111,112,114,115,117,118,119,120,121,],[58,58,-8,-10,-11,-12,-13,-14,-25,-9,-26,-27,58,-21,-22,-23,-24,-15,58,-54,58,-16,-19,58,58,-20,58,-17,58,58,-54,-18,]),'LOOP':([38,47,48,49,50,51,52,53,60,76,94,95,97,99,100,101,102,103,104,106,107,108,110,111,112,114,115,117,118,119,120,121,],[59,59,-8,-10,-11,-12,-13,-14,-25,-9,-26,-27,59,-21,-22,-23,-24,-15,59,-54,59,-16,-19,59,59,-20,59,-17,59,59,-54,-18,]),'SEMICOLON':([40,41,43,72,73,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,96,],[-28,60,-40,94,95,99,100,101,102,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,103,]),'PLUS':([40,41,43,71,72,73,77,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,96,98,116,],[-28,61,-40,61,61,61,61,61,61,61,61,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,61,61,61,]),'MINUS':([40,41,43,71,72,73,77,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,96,98,116,],[-28,62,-40,62,62,62,62,62,62,62,62,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,62,62,62,]),'STAR':([40,41,43,71,72,73,77,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,96,98,116,],[-28,63,-40,63,63,63,63,63,63,63,63,63,63,-31,-32,-33,-34,-35,-36,-37,-38,-39,63,63,63,]),'SLASH':([40,41,43,71,72,73,77,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,96,98,116,],[-28,64,-40,64,64,64,64,64,64,64,64,64,64,-31,-32,-33,-34,-35,-36,-37,-38,-39,64,64,64,]),'MOD':([40,41,43,71,72,73,77,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,96,98,116,],[-28,65,-40,65,65,65,65,65,65,65,65,65,65,-31,-32,-33,-34,-35,-36,-37,-38,-39,65,65,65,]),'NEQ':([40,41,43,71,72,73,77,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,96,98,116,],[-28,66,-40,66,66,66,66,66,66,66,66,66,66,66,66,66,None,66,66,66,66,-39,66,66,66,]),'LEQ':([40,41,43,71,72,73,77,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,96,98,116,],[-28,67,-40,67,67,67,67,67,67,67,67,67,67,67,67,67,-34,None,None,None,None,-39,67,67,67,]),'GEQ':([40,41,43,71,72,73,77,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,96,98,116,],[-28,68,-40,68,68,68,68,68,68,68,68,68,68,68,68,68,-34,None,None,None,None,-39,68,68,68,]),'LT':([40,41,43,71,72,73,77,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,96,98,116,],[-28,69,-40,69,69,69,69,69,69,69,69,69,69,69,69,69,-34,None,None,None,None,-39,69,69,69,]),'GT':([40,41,43,71,72,73,77,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,96,98,116,],[-28,70,-40,70,70,70,70,70,70,70,70,70,70,70,70,70,-34,None,None,None,None,-39,70,70,70,]),'ELSE':([106,120,],[109,109,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'function':([0,1,],[2,6,]),'struct':([0,1,],[3,7,]),'list_parameters':([10,],[13,]),'parameters':([10,],[14,]),'struct_statements':([11,],[15,]),'let_expression':([11,15,38,47,97,104,107,111,112,115,118,119,],[16,27,53,53,53,53,53,53,53,53,53,53,]),'type':([12,24,34,],[19,32,39,]),'return_type':([24,],[31,]),'empty':([24,106,120,],[33,110,110,]),'expression':([35,42,44,45,54,56,57,58,59,61,62,63,64,65,66,67,68,69,70,74,78,113,],[41,71,72,73,77,79,80,81,82,83,84,85,86,87,88,89,90,91,92,96,98,116,]),'statements':([38,97,107,112,118,],[47,104,111,115,119,]),'statement':([38,47,97,104,107,111,112,115,118,119,],[48,76,48,76,48,76,48,76,48,76,]),'assignment_statement':([38,47,97,104,107,111,112,115,118,119,],[49,49,49,49,49,49,49,49,49,49,]),'if_statement':([38,47,97,104,107,111,112,115,118,119,],[50,50,50,50,50,50,50,50,50,50,]),'while_statement':([38,47,97,104,107,111,112,115,118,119,],[51,51,51,51,51,51,51,51,51,51,]),'action_statement':([38,47,97,104,107,111,112,115,118,119,],[52,52,52,52,52,52,52,52,52,52,]),'else_clause':([106,120,],[108,121,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> program function','program',2,'p_program','pl2.py',130),
+  ('program -> program struct','program',2,'p_program','pl2.py',131),
+  ('program -> function','program',1,'p_program','pl2.py',132),
+  ('program -> struct','program',1,'p_program','pl2.py',133),
+  ('function -> FN IDENTIFIER LPAREN list_parameters RPAREN return_type LCURLY statements RCURLY','function',9,'p_function','pl2.py',143),
+  ('return_type -> type','return_type',1,'p_return_type','pl2.py',148),
+  ('return_type -> empty','return_type',1,'p_return_type','pl2.py',149),
+  ('statements -> statement','statements',1,'p_statements_single','pl2.py',154),
+  ('statements -> statements statement','statements',2,'p_statements_multiple','pl2.py',159),
+  ('statement -> assignment_statement','statement',1,'p_statement_assignment','pl2.py',165),
+  ('statement -> if_statement','statement',1,'p_statement_if','pl2.py',170),
+  ('statement -> while_statement','statement',1,'p_statement_while','pl2.py',175),
+  ('statement -> action_statement','statement',1,'p_statement_action','pl2.py',180),
+  ('statement -> let_expression','statement',1,'p_statement_let','pl2.py',185),
+  ('assignment_statement -> IDENTIFIER EQUALS expression SEMICOLON','assignment_statement',4,'p_assignment_statement','pl2.py',190),
+  ('if_statement -> IF expression LCURLY statements RCURLY else_clause','if_statement',6,'p_if_statement','pl2.py',195),
+  ('else_clause -> ELSE LCURLY statements RCURLY','else_clause',4,'p_else_clause','pl2.py',200),
+  ('else_clause -> ELSE IF expression LCURLY statements RCURLY else_clause','else_clause',7,'p_else_clause','pl2.py',201),
+  ('else_clause -> empty','else_clause',1,'p_else_clause','pl2.py',202),
+  ('while_statement -> WHILE LPAREN expression RPAREN LCURLY statements RCURLY','while_statement',7,'p_while_statement','pl2.py',212),
+  ('action_statement -> RETURN expression SEMICOLON','action_statement',3,'p_action_statement_return','pl2.py',217),
+  ('action_statement -> WRITE expression SEMICOLON','action_statement',3,'p_action_statement_write','pl2.py',222),
+  ('action_statement -> WHERE expression SEMICOLON','action_statement',3,'p_action_statement_where','pl2.py',227),
+  ('action_statement -> LOOP expression SEMICOLON','action_statement',3,'p_action_statement_loop','pl2.py',232),
+  ('let_expression -> LET IDENTIFIER EQUALS expression SEMICOLON','let_expression',5,'p_let_expression','pl2.py',237),
+  ('let_expression -> LET MUT IDENTIFIER EQUALS expression SEMICOLON','let_expression',6,'p_let_expression','pl2.py',238),
+  ('let_expression -> LET REF IDENTIFIER EQUALS expression SEMICOLON','let_expression',6,'p_let_expression','pl2.py',239),
+  ('expression -> IDENTIFIER','expression',1,'p_expression_identifier','pl2.py',249),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_operation','pl2.py',254),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_operation','pl2.py',255),
+  ('expression -> expression STAR expression','expression',3,'p_expression_operation','pl2.py',256),
+  ('expression -> expression SLASH expression','expression',3,'p_expression_operation','pl2.py',257),
+  ('expression -> expression MOD expression','expression',3,'p_expression_operation','pl2.py',258),
+  ('expression -> expression NEQ expression','expression',3,'p_expression_operation','pl2.py',259),
+  ('expression -> expression LEQ expression','expression',3,'p_expression_operation','pl2.py',260),
+  ('expression -> expression GEQ expression','expression',3,'p_expression_operation','pl2.py',261),
+  ('expression -> expression LT expression','expression',3,'p_expression_operation','pl2.py',262),
+  ('expression -> expression GT expression','expression',3,'p_expression_operation','pl2.py',263),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_paren','pl2.py',268),
+  ('expression -> NUMBER','expression',1,'p_expression_number','pl2.py',273),
+  ('struct -> STRUCT IDENTIFIER LCURLY struct_statements RCURLY','struct',5,'p_struct','pl2.py',278),
+  ('struct_statements -> let_expression','struct_statements',1,'p_struct_statements','pl2.py',283),
+  ('struct_statements -> struct_statements let_expression','struct_statements',2,'p_struct_statements','pl2.py',284),
+  ('list_parameters -> <empty>','list_parameters',0,'p_list_parameters_empty','pl2.py',293),
+  ('list_parameters -> parameters','list_parameters',1,'p_list_parameters_nonempty','pl2.py',298),
+  ('list_parameters -> parameters COMMA','list_parameters',2,'p_list_parameters_nonempty','pl2.py',299),
+  ('parameters -> IDENTIFIER type','parameters',2,'p_parameters_single','pl2.py',305),
+  ('parameters -> parameters COMMA IDENTIFIER type','parameters',4,'p_parameters_multiple','pl2.py',310),
+  ('type -> INT','type',1,'p_type','pl2.py',317),
+  ('type -> FLOAT','type',1,'p_type','pl2.py',318),
+  ('type -> CHAR','type',1,'p_type','pl2.py',319),
+  ('type -> BOOLEAN','type',1,'p_type','pl2.py',320),
+  ('type -> IDENTIFIER','type',1,'p_type','pl2.py',321),
+  ('empty -> <empty>','empty',0,'p_empty','pl2.py',326),
+]
@@ -0,0 +1,82 @@
+"""
+Benchmark the execution engines on loop- and call-heavy programs
+
+The work of each program is measured in bytecode instructions executed by
+the VM; every engine is reported in those instructions/sec so the numbers
+are comparable.
+
+Usage:
+    python bench_engines.py [repeat]     (default: 3)
+"""
+import sys
+import time
+
+import closures
+import pl3
+import vm
+
+PROGRAMS = {
+    'while loop': ('''
+fn main() {
+    let mut i = 0;
+    let mut total = 0;
+    while (i < n) {
+        total = total + i * 3 % 7 - 1;
+        i = i + 1;
+    }
+    return total;
+}
+''', {'n': 200000}),
+    'recursive calls': ('''
+fn fib(n int) int {
+    if n < 2 {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+
+fn main() {
+    return fib(n);
+}
+''', {'n': 22}),
+}
+
+
+def best_time(run, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def engines(ast):
+    """
+    Return (name, run) pairs; each run executes the program once with `env`
+    """
+    program = vm.compile_program(ast)
+    compiled = closures.compile_program(ast)
+    return [
+        ('tree', lambda env: pl3.execute(ast, env)),
+        ('vm', lambda env: program.run(env, pl3)),
+        ('closure', lambda env: compiled.run(env, pl3)),
+    ]
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for title, (source, env) in PROGRAMS.items():
+        ast = pl3.parse(source)
+        program = vm.compile_program(ast)
+        expected = program.run(env, pl3)
+        instructions = program.executed
+        print(f'\n{title}: {instructions:,} instructions')
+
+        baseline = None
+        for name, run in engines(ast):
+            elapsed, result = best_time(lambda: run(env), repeat)
+            assert result == expected, (name, result, expected)
+            baseline = baseline or elapsed
+            print(f'    {name:8} {elapsed:7.3f}s {instructions / elapsed:14,.0f} instructions/sec'
+                  f' {baseline / elapsed:6.2f}x')
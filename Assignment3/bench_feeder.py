@@ -0,0 +1,100 @@
+"""
+Benchmark parsing a pl3 program that arrives slowly, with `Feeder` and
+with `pl3.parse()` once the whole source is in
+
+The source is sent through an `asyncio.StreamReader` in chunks, with a
+delay after each one. Reported for both: when the first function is
+available, when the whole tree is, and how long after the last byte.
+Then both parse the same source from memory, for throughput.
+
+Usage:
+    python bench_feeder.py [functions] [chunk size] [delay ms]     (default: 2000 4096 2)
+"""
+import asyncio
+import sys
+import time
+
+import pl3
+from feeder import Feeder, feed_stream
+
+
+def generate(functions):
+    lines = []
+    for index in range(functions):
+        lines.append(f'fn f{index}(a int, b int) int {{')
+        lines.append('    let mut x = a;')
+        for i in range(8):
+            lines.append(f'    x = x + a * {i} - b % {i % 7 + 1};')
+        lines.append('    return x;')
+        lines.append('}')
+    lines.append('fn main() {\n    return f0(1, 2);\n}')
+    return '\n'.join(lines) + '\n'
+
+
+async def send(reader, data, chunk_size, delay):
+    for start in range(0, len(data), chunk_size):
+        reader.feed_data(data[start:start + chunk_size])
+        await asyncio.sleep(delay)
+    reader.feed_eof()
+    return time.perf_counter()
+
+
+async def with_feeder(data, chunk_size, delay):
+    reader = asyncio.StreamReader()
+    sender = asyncio.create_task(send(reader, data, chunk_size, delay))
+    start = time.perf_counter()
+    first = None
+    feeder = Feeder()
+    async for _ in feed_stream(reader, feeder):
+        if first is None:
+            first = time.perf_counter() - start
+    last_byte = await sender
+    ready = time.perf_counter()
+    return first, ready - start, ready - last_byte, feeder.tree
+
+
+async def whole_source(data, chunk_size, delay):
+    reader = asyncio.StreamReader()
+    sender = asyncio.create_task(send(reader, data, chunk_size, delay))
+    start = time.perf_counter()
+    source = (await reader.read()).decode('utf-8')
+    last_byte = await sender
+    tree = pl3.parse(source)
+    ready = time.perf_counter()
+    return ready - start, ready - start, ready - last_byte, tree
+
+
+def in_memory(data, chunk_size):
+    start = time.perf_counter()
+    pl3.parse(data.decode('utf-8'))
+    ply = time.perf_counter() - start
+
+    start = time.perf_counter()
+    feeder = Feeder()
+    for offset in range(0, len(data), chunk_size):
+        feeder.feed(data[offset:offset + chunk_size])
+    feeder.close()
+    return ply, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+    delay = (float(sys.argv[3]) if len(sys.argv) > 3 else 2) / 1000
+    data = generate(functions).encode('utf-8')
+    chunks = -(-len(data) // chunk_size)
+    pl3.get_parser()
+
+    first, total, tail, tree = asyncio.run(with_feeder(data, chunk_size, delay))
+    whole_first, whole_total, whole_tail, expected = asyncio.run(whole_source(data, chunk_size, delay))
+    assert tree == expected
+
+    print(f'{functions + 1} functions, {len(data):,} bytes in {chunks} chunks of {chunk_size} '
+          f'every {delay * 1000:g}ms')
+    print(f'    {"":12} {"first item":>12} {"whole tree":>12} {"after last byte":>17}')
+    print(f'    {"pl3.parse":12} {whole_first * 1000:10.1f}ms {whole_total * 1000:10.1f}ms '
+          f'{whole_tail * 1000:15.1f}ms')
+    print(f'    {"Feeder":12} {first * 1000:10.1f}ms {total * 1000:10.1f}ms {tail * 1000:15.1f}ms')
+
+    ply, fed = in_memory(data, chunk_size)
+    print(f'From memory: pl3.parse {ply * 1000:.1f}ms, Feeder {fed * 1000:.1f}ms')
@@ -0,0 +1,75 @@
+"""
+Benchmark peak memory of parsing growing pl3 files whole with `pl3.parse()`
+against `iter_items()` one function at a time
+
+Each file has the given number of small functions. Both ways count the
+functions (the consumer keeps none of them). Peak memory is measured with
+tracemalloc in a separate pass, without timing. `pl3.parse()` is skipped
+above --whole-limit functions, where the tree alone takes gigabytes.
+
+Usage:
+    python bench_iter_items.py [functions ...] [--whole-limit N]
+        (default: 10000 100000 1000000, --whole-limit 100000)
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pl3
+from feeder import iter_items
+
+
+def write_source(path, functions):
+    with open(path, 'w') as f:
+        for index in range(functions):
+            f.write(f'fn f{index}(a int) int {{\n    let x = a * {index % 97};\n    return x + 1;\n}}\n')
+
+
+def whole(path):
+    with open(path, 'r') as f:
+        tree = pl3.parse(f.read())
+    return len(tree[1])
+
+
+def one_at_a_time(path):
+    n = 0
+    with open(path, 'rb') as f:
+        for _ in iter_items(f):
+            n += 1
+    return n
+
+
+def measure(run, path):
+    start = time.perf_counter()
+    items = run(path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    run(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return items, elapsed, peak
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description='Peak memory of pl3.parse() against iter_items()')
+    arguments.add_argument('functions', nargs='*', type=int, default=[10000, 100000, 1000000])
+    arguments.add_argument('--whole-limit', type=int, default=100000,
+                           help='largest file given to pl3.parse()')
+    options = arguments.parse_args()
+    pl3.get_parser()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'big.txt')
+        for functions in options.functions:
+            write_source(path, functions)
+            print(f'{functions:,} functions, {os.path.getsize(path) / 1024 / 1024:.1f} MB')
+            runs = [('iter_items', one_at_a_time)]
+            if functions <= options.whole_limit:
+                runs.insert(0, ('pl3.parse', whole))
+            for name, run in runs:
+                items, elapsed, peak = measure(run, path)
+                assert items == functions, (name, items, functions)
+                print(f'    {name:12} {elapsed:7.2f}s   peak {peak / 1024 / 1024:8.1f} MB')
@@ -0,0 +1,61 @@
+"""
+Benchmark variable access with dict frames against slot-indexed frames
+
+Runs a loop whose body is almost only variable reads and writes, with the
+closure engine keeping each call's variables in a dict keyed by name
+(before) and in a list indexed by the slots from resolver.py (after). The
+tree walker is shown for reference.
+
+Usage:
+    python bench_lookup.py [iterations] [repeat]     (default: 200000 3)
+"""
+import sys
+
+import closures
+import pl3
+import vm
+from bench_engines import best_time
+
+SOURCE = '''
+fn main() {
+    let mut i = 0;
+    let a = 1;
+    let b = 2;
+    let c = 3;
+    let d = 4;
+    let mut total = 0;
+    while (i < n) {
+        total = total + a + b + c + d + a * b + c * d;
+        i = i + 1;
+    }
+    return total;
+}
+'''
+# Per iteration: 12 reads (i, n, total, a, b, c, d, a, b, c, d, i) and 2 writes
+ACCESSES = 14
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    env = {'n': iterations}
+    ast = pl3.parse(SOURCE)
+    accesses = iterations * ACCESSES
+
+    runs = [
+        ('tree (dict frames)', lambda: pl3.execute(ast, env)),
+        ('closure, dict frames', lambda: closures.compile_program(ast, resolve_slots=False).run(env, pl3)),
+        ('closure, slot frames', lambda: closures.compile_program(ast).run(env, pl3)),
+        ('vm, slot frames', lambda: vm.compile_program(ast).run(env, pl3)),
+    ]
+    print(f'{accesses:,} variable accesses')
+    before = None
+    expected = None
+    for name, run in runs:
+        elapsed, result = best_time(run, repeat)
+        expected = result if expected is None else expected
+        assert result == expected, (name, result, expected)
+        if name == 'closure, dict frames':
+            before = elapsed
+        speedup = f'{before / elapsed:6.2f}x' if before else ''
+        print(f'    {name:22} {elapsed:7.3f}s {accesses / elapsed:14,.0f} accesses/sec {speedup}')
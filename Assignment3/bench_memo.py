@@ -0,0 +1,61 @@
+"""
+Benchmark memoized calls to pure functions in the tree walker
+
+Usage:
+    python bench_memo.py [cache_size]     (default: 1024)
+"""
+import sys
+import time
+
+import memo
+import pl3
+
+PROGRAMS = {
+    'fib(24)': ('''
+fn fib(n int) int {
+    if n < 2 {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+
+fn main() {
+    return fib(n);
+}
+''', {'n': 24}),
+    'grid paths(9, 9)': ('''
+fn paths(r int, c int) int {
+    if r < 1 {
+        return 1;
+    }
+    if c < 1 {
+        return 1;
+    }
+    return paths(r - 1, c) + paths(r, c - 1);
+}
+
+fn main() {
+    return paths(n, n);
+}
+''', {'n': 9}),
+}
+
+
+def timed(run):
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    cache_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    for title, (source, env) in PROGRAMS.items():
+        ast = pl3.parse(source)
+        print(f'\n{title}: pure functions {sorted(memo.pure_functions(ast))}')
+        before, expected = timed(lambda: pl3.execute(ast, env))
+        after, result = timed(lambda: pl3.execute(ast, env, cache_size=cache_size))
+        assert result == expected, (result, expected)
+        stats = pl3.cache.stats()
+        print(f'    plain     {before:8.4f}s')
+        print(f'    memoized  {after:8.4f}s {before / after:8.1f}x   '
+              f"hits {stats['hits']:,}  misses {stats['misses']:,}  evictions {stats['evictions']:,}")
@@ -0,0 +1,45 @@
+"""
+Benchmark running a program with and without the constant folding pass
+
+Usage:
+    python bench_optimizer.py [iterations] [repeat]     (default: 100000 3)
+"""
+import sys
+
+import optimizer
+import pl3
+from bench_engines import best_time
+
+SOURCE = '''
+fn scale(x int) int {
+    return x * (60 * 60) + 0;
+}
+
+fn main() {
+    let mut i = 0;
+    let mut total = 0;
+    while (i < n) {
+        total = total + i * (2 * 4) - 0 + (10 / 2) * 1 - scale(1 * i) % (3 + 4);
+        if 2 * 3 > 5 {
+            total = total - (i * 0);
+        }
+        i = i + 1 * 1;
+    }
+    return total;
+}
+'''
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    env = {'n': iterations}
+    ast = pl3.parse(SOURCE)
+    folded, removed = optimizer.optimize(ast)
+    print(f'{optimizer.count_nodes(ast)} nodes, {removed} removed by folding')
+
+    for engine in ('tree', 'vm', 'closure'):
+        before, expected = best_time(lambda: pl3.execute(ast, env, engine), repeat)
+        after, result = best_time(lambda: pl3.execute(folded, env, engine), repeat)
+        assert result == expected, (engine, result, expected)
+        print(f'    {engine:8} {before:7.3f}s -> {after:7.3f}s {before / after:6.2f}x')
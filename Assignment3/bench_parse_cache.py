@@ -0,0 +1,53 @@
+"""
+Benchmark parsing a set of sources with an empty and a warm parse cache
+
+Usage:
+    python bench_parse_cache.py [files] [statements]     (default: 200 500)
+"""
+import sys
+import tempfile
+import time
+
+import pl3
+
+
+def generate(index, statements):
+    lines = [f'fn f{index}(a int, b int) int {{', '    let mut x = a;']
+    for i in range(statements):
+        lines.append(f'    x = x + a * {i} - b % {i % 7 + 1};')
+    lines.append('    return x;')
+    lines.append('}')
+    lines.append(f'fn main() {{\n    return f{index}(1, 2);\n}}')
+    return '\n'.join(lines) + '\n'
+
+
+def parse_all(sources, cache=None):
+    start = time.perf_counter()
+    trees = [pl3.parse(source, cache=cache) for source in sources]
+    return time.perf_counter() - start, trees
+
+
+if __name__ == "__main__":
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    sources = [generate(i, statements) for i in range(files)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        uncached, expected = parse_all(sources)
+        cache = pl3.open_cache(directory)
+        cold, _ = parse_all(sources, cache)
+        warm, trees = parse_all(sources, cache)
+        assert trees == expected
+
+        # A cache that holds half of the files, with a quarter of them in use
+        small = pl3.open_cache(directory, max_bytes=cache.size // 2)
+        hot = sources[:files // 4]
+        bounded, _ = parse_all(hot * 4, small)
+
+        print(f'{files} files, {statements} statements each')
+        print(f'    no cache         {uncached:7.3f}s')
+        print(f'    empty cache      {cold:7.3f}s')
+        print(f'    warm cache       {warm:7.3f}s {uncached / warm:7.1f}x')
+        print(f'    half-size cache  {bounded:7.3f}s  (a quarter of the files, 4 times each)')
+        print(f'    stats            {cache.stats()}')
+        print(f'    half-size stats  {small.stats()}')
@@ -0,0 +1,55 @@
+"""
+Run a 1M-deep tail recursion on every execution engine
+
+`return f(...)` reuses the caller's Python frame, so the depth of the
+recursion is not limited by `sys.getrecursionlimit()`.
+
+Usage:
+    python bench_tailcall.py [depth]     (default: 1000000)
+"""
+import sys
+import time
+
+import pl3
+
+SOURCE = '''
+fn count(n int, total int) int {
+    if n < 1 {
+        return total;
+    }
+    return count(n - 1, total + 2);
+}
+
+fn is_even(n int) bool {
+    if n < 1 {
+        return true;
+    }
+    return is_odd(n - 1);
+}
+
+fn is_odd(n int) bool {
+    if n < 1 {
+        return false;
+    }
+    return is_even(n - 1);
+}
+
+fn main() {
+    if is_even(n) {
+        return count(n, 0);
+    }
+    return 0 - 1;
+}
+'''
+
+
+if __name__ == "__main__":
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    ast = pl3.parse(SOURCE)
+    print(f'depth {depth:,} (recursion limit {sys.getrecursionlimit():,})')
+    for engine in ('tree', 'vm', 'closure'):
+        start = time.perf_counter()
+        result = pl3.execute(ast, {'n': depth}, engine)
+        elapsed = time.perf_counter() - start
+        assert result == 2 * depth, (engine, result)
+        print(f'    {engine:8} {elapsed:7.3f}s {2 * depth / elapsed:12,.0f} calls/sec')
@@ -0,0 +1,113 @@
+"""
+Client for the pl3 server (see server.py)
+
+Usage:
+    python client.py [--host 127.0.0.1] [--port 8765] [--unix PATH] OP [FILE] [--env '{"n": 10}']
+
+OP is tokenize, parse, execute or stats. FILE is the source (default:
+standard input). The answer is printed as JSON.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+
+
+class Client:
+    """
+    One connection to the server. Several requests can be in flight at
+    once; answers are matched to requests by their "id".
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count(1)
+        self.waiting = {}
+        self.receiver = asyncio.create_task(self.receive())
+
+    @classmethod
+    async def open(cls, host='127.0.0.1', port=8765, unix=None):
+        """
+        Connect to a server on TCP `host`:`port`, or on the Unix socket `unix`
+        """
+        limit = 64 * 1024 * 1024
+        if unix:
+            reader, writer = await asyncio.open_unix_connection(unix, limit=limit)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=limit)
+        return cls(reader, writer)
+
+    async def request(self, op, **fields):
+        """
+        Send a request and return the server's answer (a dict)
+        """
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        self.writer.write(json.dumps({'id': request_id, 'op': op, **fields}).encode() + b'\n')
+        await self.writer.drain()
+        return await future
+
+    async def receive(self):
+        try:
+            while line := await self.reader.readline():
+                answer = json.loads(line)
+                future = self.waiting.pop(answer.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(answer)
+        finally:
+            error = ConnectionError('Connection closed by the server')
+            for future in self.waiting.values():
+                if not future.done():
+                    future.set_exception(error)
+            self.waiting.clear()
+
+    async def close(self):
+        self.receiver.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def run(options):
+    client = await Client.open(options.host, options.port, options.unix)
+    try:
+        fields = {}
+        if options.op != 'stats':
+            if options.file:
+                with open(options.file, 'r') as f:
+                    fields['source'] = f.read()
+            else:
+                fields['source'] = sys.stdin.read()
+            if options.env:
+                fields['env'] = json.loads(options.env)
+            if options.engine:
+                fields['engine'] = options.engine
+        return await client.request(options.op, **fields)
+    finally:
+        await client.close()
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description='Send one request to the pl3 server')
+    arguments.add_argument('op', choices=['tokenize', 'parse', 'execute', 'stats'])
+    arguments.add_argument('file', nargs='?', help='the source file (default: standard input)')
+    arguments.add_argument('--env', help='starting variable bindings, as a JSON object')
+    arguments.add_argument('--engine', choices=['tree', 'vm', 'closure'])
+    arguments.add_argument('--host', default='127.0.0.1')
+    arguments.add_argument('--port', type=int, default=8765)
+    arguments.add_argument('--unix', help='connect to this Unix socket instead of TCP')
+    options = arguments.parse_args(argv)
+
+    answer = asyncio.run(run(options))
+    json.dump(answer, sys.stdout, indent=2)
+    print()
+    return 0 if answer.get('ok') else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
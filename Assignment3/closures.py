@@ -0,0 +1,336 @@
+import operator
+
+from resolver import resolve
+
+# ==================================================================
+#                        CLOSURE COMPILER
+# ==================================================================
+#
+# Turns every node of the program tree returned by `pl3.parse()` into a
+# Python closure, once. Running the program is then just nested closure
+# calls: the node tags and the operator of every `operation` are resolved
+# at compile time, not on every evaluation.
+#
+# Every closure takes `(frame, ctx)`: the variables of the current call and
+# the `Context` of the run. Statements return None, a 1-tuple holding the
+# value of an executed `return`, or a `TailCall` for `return f(...)`.
+#
+# With `resolve_slots=True` (the default) a frame is a list indexed by the slots
+# computed by resolver.py, and names not bound in the function go straight
+# to the starting bindings. With `resolve_slots=False` a frame is a dict keyed by
+# name, like in `pl3.execute()`.
+#
+# Usage:
+#     program = closures.compile_program(pl3.parse(source))
+#     result = program.run(env, pl3)
+
+OPERATORS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul,
+    '/': operator.truediv, '%': operator.mod, '==': operator.eq,
+    '!=': operator.ne, '<=': operator.le, '>=': operator.ge,
+    '<': operator.lt, '>': operator.gt,
+}
+NUMBERS = frozenset((int, float))
+
+# Marker for a variable that is not set in the frame
+MISSING = object()
+
+
+class TailCall:
+    """
+    A call in tail position; `Context.call()` runs it in its own loop so
+    tail recursion runs in constant stack depth
+    """
+    __slots__ = ('name', 'args', 'line')
+
+    def __init__(self, name, args, line):
+        self.name = name
+        self.args = args
+        self.line = line
+
+
+class Context:
+    """
+    The state of one run: starting bindings and where errors go
+
+    :param program: The compiled program
+    :param env: Starting variable bindings, visible from every function
+    :param runtime: Provides `errors`, `operate()`, `out` and `deadline` (a
+                    pl3 Session)
+    """
+    __slots__ = ('functions', 'env', 'errors', 'operate', 'out', 'deadline', 'check_deadline')
+
+    def __init__(self, program, env, runtime):
+        self.functions = program.functions
+        self.env = env
+        self.errors = runtime.errors
+        self.operate = runtime.operate
+        self.out = runtime.out
+        self.deadline = runtime.deadline
+        self.check_deadline = runtime.check_deadline if self.deadline is not None else None
+
+    def lookup(self, name, line):
+        # A variable that is not set in the frame: try the starting bindings
+        if name in self.env:
+            return self.env[name]
+        self.errors.append(f"Error at line {line}: Undefined variable '{name}'")
+        return None
+
+    def call(self, name, args, line):
+        while True:
+            if self.deadline is not None:
+                self.check_deadline()
+            function = self.functions.get(name)
+            if function is None:
+                self.errors.append(f"Error at line {line}: Function '{name}' is not defined.")
+                return None
+            params, body, size = function
+            if len(params) != len(args):
+                self.errors.append(f"Error at line {line}: Function '{name}' expects {len(params)} arguments, but {len(args)} were provided.")
+                return None
+            frame = dict(zip(params, args)) if size is None else args + [MISSING] * (size - len(args))
+            result = body(frame, self)
+            if type(result) is not TailCall:
+                return None if result is None else result[0]
+            name, args, line = result.name, result.args, result.line
+
+
+# ==================================================================
+#                        EXPRESSIONS
+# ==================================================================
+
+def compile_expression(node, scope):
+    kind = node[0]
+    if kind == 'number' or kind == 'boolean':
+        return compile_constant(node[1])
+    elif kind == 'identifier':
+        return compile_identifier(node[1], node[2], scope)
+    elif kind == 'operation':
+        return compile_operation(node, scope)
+    elif kind == 'call':
+        return compile_call(node, scope)
+    raise ValueError(f"Cannot compile expression '{kind}'")
+
+
+def compile_constant(value):
+    def constant(frame, ctx):
+        return value
+    return constant
+
+
+def compile_identifier(name, line, scope):
+    if scope is not None:
+        slot = scope.slot(name)
+        if slot is None:
+            def global_name(frame, ctx):
+                return ctx.lookup(name, line)
+            return global_name
+
+        def local(frame, ctx):
+            value = frame[slot]
+            if value is MISSING:
+                return ctx.lookup(name, line)
+            return value
+        return local
+
+    def identifier(frame, ctx):
+        value = frame.get(name, MISSING)
+        if value is MISSING:
+            return ctx.lookup(name, line)
+        return value
+    return identifier
+
+
+def compile_operation(node, scope):
+    _, symbol, left, right, line = node
+    left = compile_expression(left, scope)
+    right = compile_expression(right, scope)
+    function = OPERATORS.get(symbol)
+
+    if function is None:
+        # Unknown operator: operate() reports it
+        def invalid(frame, ctx):
+            return ctx.operate(symbol, left(frame, ctx), right(frame, ctx), line)
+        return invalid
+
+    if symbol == '/' or symbol == '%':
+        def checked(frame, ctx):
+            a = left(frame, ctx)
+            b = right(frame, ctx)
+            if b and type(a) in NUMBERS and type(b) in NUMBERS:
+                return function(a, b)
+            return ctx.operate(symbol, a, b, line)
+        return checked
+
+    def binary(frame, ctx):
+        a = left(frame, ctx)
+        b = right(frame, ctx)
+        if type(a) in NUMBERS and type(b) in NUMBERS:
+            return function(a, b)
+        return ctx.operate(symbol, a, b, line)
+    return binary
+
+
+def compile_call(node, scope):
+    _, name, args, line = node
+    args = [compile_expression(arg, scope) for arg in args]
+
+    if len(args) == 1:
+        arg = args[0]
+
+        def call_one(frame, ctx):
+            function = ctx.functions.get(name)
+            value = arg(frame, ctx)
+            if function is None or len(function[0]) != 1:
+                return ctx.call(name, [value], line)
+            if ctx.deadline is not None:
+                ctx.check_deadline()
+            params, body, size = function
+            frame = {params[0]: value} if size is None else [value] + [MISSING] * (size - 1)
+            result = body(frame, ctx)
+            if type(result) is TailCall:
+                return ctx.call(result.name, result.args, result.line)
+            return None if result is None else result[0]
+        return call_one
+
+    def call(frame, ctx):
+        return ctx.call(name, [arg(frame, ctx) for arg in args], line)
+    return call
+
+
+# ==================================================================
+#                        STATEMENTS
+# ==================================================================
+
+def compile_block(statements, scope):
+    statements = [compile_statement(statement, scope) for statement in statements]
+    if len(statements) == 1:
+        return statements[0]
+
+    def block(frame, ctx):
+        for statement in statements:
+            result = statement(frame, ctx)
+            if result is not None:
+                return result
+    return block
+
+
+def compile_statement(node, scope):
+    kind = node[0]
+    if kind in ('let', 'let_mut', 'let_ref', 'assign'):
+        name = scope.slot(node[1]) if scope is not None else node[1]
+        expr = compile_expression(node[2], scope)
+
+        def store(frame, ctx):
+            frame[name] = expr(frame, ctx)
+        return store
+
+    elif kind == 'if':
+        branches = []
+        clause = node
+        while clause is not None and clause[0] != 'else':
+            branches.append((compile_expression(clause[1], scope), compile_block(clause[2], scope)))
+            clause = clause[3]
+        otherwise = compile_block(clause[1], scope) if clause is not None else None
+
+        if len(branches) == 1 and otherwise is None:
+            cond, body = branches[0]
+
+            def if_only(frame, ctx):
+                if cond(frame, ctx):
+                    return body(frame, ctx)
+            return if_only
+
+        def if_statement(frame, ctx):
+            for cond, body in branches:
+                if cond(frame, ctx):
+                    return body(frame, ctx)
+            if otherwise is not None:
+                return otherwise(frame, ctx)
+        return if_statement
+
+    elif kind == 'while':
+        cond = compile_expression(node[1], scope)
+        body = compile_block(node[2], scope)
+
+        def while_statement(frame, ctx):
+            while cond(frame, ctx):
+                if ctx.deadline is not None:
+                    ctx.check_deadline()
+                result = body(frame, ctx)
+                if result is not None:
+                    return result
+        return while_statement
+
+    elif kind == 'return' and node[1][0] == 'call':
+        _, name, args, line = node[1]
+        args = [compile_expression(arg, scope) for arg in args]
+
+        def tail_call(frame, ctx):
+            return TailCall(name, [arg(frame, ctx) for arg in args], line)
+        return tail_call
+
+    elif kind == 'return':
+        expr = compile_expression(node[1], scope)
+
+        def return_statement(frame, ctx):
+            return (expr(frame, ctx),)
+        return return_statement
+
+    elif kind == 'write':
+        expr = compile_expression(node[1], scope)
+
+        def write_statement(frame, ctx):
+            print(expr(frame, ctx), file=ctx.out)
+        return write_statement
+
+    elif kind == 'where' or kind == 'call':
+        expr = compile_expression(node[1] if kind == 'where' else node, scope)
+
+        def expression_statement(frame, ctx):
+            expr(frame, ctx)
+        return expression_statement
+
+    raise ValueError(f"Cannot compile statement '{kind}'")
+
+
+# ==================================================================
+#                        PROGRAMS
+# ==================================================================
+
+def compile_program(ast, resolve_slots=True):
+    """
+    Compile every function of a program tree
+
+    :param ast: The tree returned by `pl3.parse()`
+    :param resolve_slots: Keep variables in list frames indexed by slot
+        instead of dicts keyed by name
+    """
+    functions = {}
+    for item in ast[1]:
+        if item[0] == 'function':
+            scope = resolve(item) if resolve_slots else None
+            size = scope.size if scope is not None else None
+            functions[item[1]] = ([param[0] for param in item[2]], compile_block(item[4], scope), size)
+    return Program(functions)
+
+
+class Program:
+    """
+    A compiled program: (parameter names, body closure, frame size) per
+    function; the frame size is None for dict frames
+    """
+
+    def __init__(self, functions):
+        self.functions = functions
+
+    def run(self, env, runtime, entry='main'):
+        """
+        Run the program from `entry` and return its result
+
+        :param env: Starting variable bindings, visible from every function
+        :param runtime: Provides `errors`, `operate()` and `out` (a pl3 Session)
+        """
+        if entry not in self.functions:
+            raise NameError(f"Function '{entry}' is not defined.")
+        return Context(self, env, runtime).call(entry, [], None)
@@ -0,0 +1,345 @@
+import codecs
+import os
+import string
+
+from ply.yacc import YaccProduction, YaccSymbol
+
+import pl3
+
+# ==================================================================
+#                        PUSH PARSING
+# ==================================================================
+#
+# `parser.parse(data)` needs the whole source. A `Feeder` is given the
+# source a piece at a time, as it arrives, and runs the pl3 token rules and
+# LALR tables on what it has so far. Every top-level `function` or `struct`
+# is handed out as soon as the `}` that closes it is read.
+#
+# The LR loop is ply's (`parseopt_notrack`), driven by tokens pushed in
+# instead of pulled from a lexer. The only addition: a state where every
+# lookahead leads to the same reduction is reduced without waiting for the
+# next token (ply only does that for states with a single action). That is
+# what lets an item be reduced right after its closing brace.
+#
+# Text is lexed as soon as it arrives, except for what the next piece could
+# still change: a trailing identifier or number, a trailing '!', '<', '>'
+# or '/' (the start of '!=', '<=', '>=' or '//'), or a `//` comment that has
+# not reached its line end. So a closing `}` is parsed as soon as it is
+# received. A syntax error is recorded in `errors`, and parsing starts
+# again at the next `fn` or `struct` outside any braces.
+#
+# Usage:
+#     feeder = Feeder()
+#     for chunk in chunks:                  # bytes (UTF-8) or str
+#         for item in feeder.feed(chunk):
+#             ...                           # ('function', name, ...) or ('struct', ...)
+#     items = feeder.close()                # the items completed at the end
+#     feeder.tree, feeder.errors            # ('program', all items), syntax errors
+#
+# From an asyncio stream:
+#     async for item in feed_stream(reader):
+#         ...
+#
+# One item at a time, without keeping the items or the program:
+#     for item in iter_items(source):       # str, bytes, file or chunks
+#         ...
+
+# Top-level items, emitted when reduced
+ITEMS = ('function', 'struct')
+
+# Tokens an item starts with, where parsing resumes after a syntax error
+ITEM_STARTS = ('FN', 'STRUCT')
+
+# Characters that can continue an identifier or a number
+WORD = frozenset(string.ascii_letters + string.digits + '_')
+
+# Characters that can start a two-character token: '!=', '<=', '>=', '//'
+PREFIXES = frozenset('!<>/')
+
+
+def safe_end(text):
+    """
+    Return the length of the start of `text` that lexes the same whatever
+    follows it
+    """
+    comment = text.find('//', text.rfind('\n') + 1)
+    if comment >= 0:
+        # Up to the line end, the rest is the comment
+        return comment
+    end = len(text)
+    while end and text[end - 1] in WORD:
+        end -= 1
+    if end == len(text) and end and text[end - 1] in PREFIXES:
+        end -= 1
+    return end
+
+
+def eager_reductions(parser):
+    """
+    Return {state: reduction} for the states where every lookahead leads
+    to the same reduction (including ply's defaulted states)
+    """
+    eager = {}
+    for state, actions in parser.action.items():
+        moves = set(actions.values())
+        if len(moves) == 1:
+            move = moves.pop()
+            if move < 0:
+                eager[state] = move
+    return eager
+
+
+class Feeder:
+    """
+    Incremental pl3 parser fed with pieces of source text
+
+    :param on_item: Called with every top-level item as it is completed
+                    (besides being returned by `feed()`/`close()`)
+    :param keep: Keep the items for `tree`. With False, an item is dropped
+                 once it is handed out, `program` is not built and `tree`
+                 stays None, so memory does not grow with the source
+    """
+
+    def __init__(self, on_item=None, keep=True):
+        parser = pl3.get_parser()
+        self.productions = parser.productions
+        self.action = parser.action
+        self.goto = parser.goto
+        self.eager = eager_reductions(parser)
+        self.on_item = on_item
+        self.keep = keep
+
+        self.lexer = pl3.lexer.clone()
+        self.lexer.lineno = 1
+        self.lexer.lexerrorf = self.illegal_character
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.pending = ''       # text not lexed yet, see `safe_end()`
+        self.offset = 0         # position of `pending` in the whole source
+        self.depth = 0          # brace depth after the tokens lexed so far
+        self.tokens = []        # (token, brace depth before it) waiting for the parser
+        self.closed = False
+
+        self.statestack = [0]
+        self.symstack = [self.end_symbol()]
+        self.production = YaccProduction(None)
+        self.production.lexer = self.lexer
+        self.resync = False     # skipping tokens after a syntax error
+
+        self.items = []         # every item completed (if `keep`)
+        self.completed = []     # items completed by the current feed()/close()
+        self.errors = []
+        self.tree = None        # ('program', items) once closed (if `keep`)
+
+    @staticmethod
+    def end_symbol():
+        sym = YaccSymbol()
+        sym.type = '$end'
+        return sym
+
+    def feed(self, chunk):
+        """
+        Add the next piece of the source and parse as far as it allows
+
+        :param chunk: bytes (UTF-8, may end inside a character) or str
+        :return: The items completed by this piece
+        """
+        if self.closed:
+            raise ValueError('feed() after close()')
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = self.decoder.decode(chunk)
+        self.pending += chunk
+        cut = safe_end(self.pending)
+        if cut:
+            self.lex(self.pending[:cut])
+            self.pending = self.pending[cut:]
+        return self.run()
+
+    def close(self):
+        """
+        Mark the end of the source and finish parsing
+
+        :return: The items completed by the end of the source
+        """
+        if self.closed:
+            return []
+        self.pending += self.decoder.decode(b'', final=True)
+        self.lex(self.pending)
+        self.pending = ''
+        self.closed = True
+        self.tokens.append((self.end_symbol(), 0))
+        items = self.run()
+        if self.keep:
+            self.tree = ('program', self.items)
+        return items
+
+    def lex(self, text):
+        lexer = self.lexer
+        lexer.input(text)
+        depth = self.depth
+        append = self.tokens.append
+        offset = self.offset
+        for token in iter(lexer.token, None):
+            token.lexpos += offset
+            append((token, depth))
+            if token.type == 'LCURLY':
+                depth += 1
+            elif token.type == 'RCURLY' and depth:
+                depth -= 1
+        self.depth = depth
+        self.offset += len(text)
+
+    def illegal_character(self, t):
+        self.errors.append(f"Illegal character '{t.value[0]}' at line {t.lineno}")
+        t.lexer.skip(1)
+
+    def run(self):
+        """
+        Shift and reduce the waiting tokens, as far as possible
+        """
+        self.completed = []
+        tokens = self.tokens
+        next_token = 0
+        statestack = self.statestack
+        symstack = self.symstack
+        actions = self.action
+        eager = self.eager
+        state = statestack[-1]
+
+        while True:
+            if state in eager:
+                t = eager[state]
+            else:
+                if next_token == len(tokens):
+                    break
+                lookahead, depth = tokens[next_token]
+                if self.resync:
+                    if lookahead.type not in ITEM_STARTS or depth:
+                        if lookahead.type == '$end':
+                            break
+                        next_token += 1
+                        continue
+                    self.resync = False
+                t = actions[state].get(lookahead.type)
+
+            if t is None:
+                self.syntax_error(lookahead)
+                if lookahead.type == '$end':
+                    break
+                # Start again from an empty stack at the next item
+                del statestack[1:]
+                del symstack[1:]
+                state = 0
+                self.resync = True
+                if lookahead.type not in ITEM_STARTS or depth:
+                    next_token += 1
+                continue
+
+            if t > 0:
+                # Shift
+                statestack.append(t)
+                state = t
+                symstack.append(lookahead)
+                next_token += 1
+                continue
+
+            if t < 0:
+                # Reduce
+                state = self.reduce(-t)
+                continue
+
+            # Accept
+            break
+
+        del tokens[:next_token]
+        return self.completed
+
+    def reduce(self, number):
+        production = self.productions[number]
+        name = production.name
+        length = production.len
+        statestack = self.statestack
+        symstack = self.symstack
+
+        sym = YaccSymbol()
+        sym.type = name
+        sym.value = None
+        if name == 'program' and not self.keep:
+            # Do not run p_program: it would collect every item
+            del symstack[-length:]
+            del statestack[-length:]
+        elif length:
+            targ = symstack[-length - 1:]
+            targ[0] = sym
+            self.production.slice = targ
+            production.callable(self.production)
+            del symstack[-length:]
+            del statestack[-length:]
+        else:
+            self.production.slice = [sym]
+            production.callable(self.production)
+        symstack.append(sym)
+        state = self.goto[statestack[-1]][name]
+        statestack.append(state)
+
+        if name in ITEMS:
+            if self.keep:
+                self.items.append(sym.value)
+            self.completed.append(sym.value)
+            if self.on_item is not None:
+                self.on_item(sym.value)
+        return state
+
+    def syntax_error(self, token):
+        if token.type == '$end':
+            self.errors.append("Syntax error at EOF")
+        else:
+            self.errors.append(f"Syntax error at '{token.value}', line {token.lineno}")
+
+
+async def feed_stream(reader, feeder=None, chunk_size=65536):
+    """
+    Parse what an asyncio stream sends, yielding each top-level item as
+    soon as it is complete
+
+    :param reader: An `asyncio.StreamReader`
+    :param feeder: The `Feeder` to use (its `errors` and `tree` can be read
+                   after the stream ends); a new one by default
+    :param chunk_size: The most bytes read at a time
+    """
+    if feeder is None:
+        feeder = Feeder()
+    while chunk := await reader.read(chunk_size):
+        for item in feeder.feed(chunk):
+            yield item
+    for item in feeder.close():
+        yield item
+
+
+def iter_items(source, feeder=None, chunk_size=65536):
+    """
+    Yield the top-level items of a source one at a time, each as soon as it
+    is reduced. Nothing keeps an item once it is yielded, so with a file or
+    chunks as the source, memory stays the same whatever its size.
+
+    :param source: The source text (str or bytes), a file opened for
+                   reading, a file path (`os.PathLike`) or an iterable of
+                   chunks
+    :param feeder: The `Feeder` to use (its `errors` can be read at the
+                   end); a new `Feeder(keep=False)` by default
+    :param chunk_size: The size of the pieces the source is fed in
+    """
+    if feeder is None:
+        feeder = Feeder(keep=False)
+    if isinstance(source, os.PathLike):
+        with open(source, 'rb') as f:
+            yield from iter_items(f, feeder, chunk_size)
+        return
+    if isinstance(source, (str, bytes, bytearray)):
+        chunks = (source[start:start + chunk_size] for start in range(0, len(source), chunk_size))
+    elif hasattr(source, 'read'):
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        chunks = source
+    for chunk in chunks:
+        yield from feeder.feed(chunk)
+    yield from feeder.close()
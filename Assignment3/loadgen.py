@@ -0,0 +1,160 @@
+"""
+Load generator for the pl3 server (see server.py)
+
+Opens --connections connections, keeps --concurrency requests in flight on
+each, and sends --requests requests in total. Reports the client-side
+latency percentiles and throughput, then the server's own counters.
+With --spawn, a server is started on a temporary Unix socket for the run.
+With --cold N, the same work is also timed N times in a fresh
+`python -c` process each (what callers without the server pay).
+
+Usage:
+    python loadgen.py --spawn [--op execute] [--requests 5000]
+                      [--connections 8] [--concurrency 4] [--cold 20]
+                      [--sessions 4] [--batch 32]
+    python loadgen.py --port 8765 ...
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from client import Client
+
+SOURCE = '''
+fn fib(n int) int {
+    if n < 2 {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+
+fn main() {
+    let x = fib(n);
+    write x;
+    return x;
+}
+'''
+ENV = {'n': 10}
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def connection(client, op, count, concurrency, latencies):
+    async def worker(n):
+        for _ in range(n):
+            start = time.perf_counter()
+            answer = await client.request(op, source=SOURCE, env=ENV)
+            latencies.append(time.perf_counter() - start)
+            if not answer.get('ok'):
+                raise RuntimeError(f"Request failed: {answer}")
+
+    shares = [count // concurrency + (i < count % concurrency) for i in range(concurrency)]
+    await asyncio.gather(*(worker(n) for n in shares))
+
+
+async def load(options):
+    clients = [await Client.open(options.host, options.port, options.unix)
+               for _ in range(options.connections)]
+    try:
+        # Warm up every connection
+        await asyncio.gather(*(client.request(options.op, source=SOURCE, env=ENV) for client in clients))
+        latencies = []
+        shares = [options.requests // len(clients) + (i < options.requests % len(clients))
+                  for i in range(len(clients))]
+        start = time.perf_counter()
+        await asyncio.gather(*(connection(client, options.op, n, options.concurrency, latencies)
+                               for client, n in zip(clients, shares)))
+        elapsed = time.perf_counter() - start
+        stats = await clients[0].request('stats')
+    finally:
+        for client in clients:
+            await client.close()
+    return latencies, elapsed, stats['result']
+
+
+def cold_runs(op, runs):
+    """
+    Time `runs` fresh processes that import pl3 and do `op` once
+    """
+    code = (f'import pl3\n'
+            f'tree = pl3.parse({SOURCE!r})\n'
+            + (f'pl3.execute(tree, {ENV!r})\n' if op == 'execute' else ''))
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.DEVNULL,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        times.append(time.perf_counter() - start)
+    return sorted(times)
+
+
+def wait_for_socket(path, process, timeout=30):
+    deadline = time.time() + timeout
+    while not os.path.exists(path):
+        if process.poll() is not None or time.time() > deadline:
+            raise RuntimeError('The server did not start')
+        time.sleep(0.05)
+
+
+@contextlib.contextmanager
+def spawned_server(options):
+    """
+    Run a server on a Unix socket in a temporary directory (set as
+    `options.unix`) until the block ends, then remove the directory
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        options.unix = os.path.join(directory, 'pl3.sock')
+        here = os.path.dirname(os.path.abspath(__file__))
+        server = subprocess.Popen([sys.executable, os.path.join(here, 'server.py'), '--unix', options.unix,
+                                   '--sessions', str(options.sessions), '--batch', str(options.batch)],
+                                  stdout=subprocess.DEVNULL)
+        try:
+            wait_for_socket(options.unix, server)
+            yield
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description='Benchmark the pl3 server')
+    arguments.add_argument('--op', choices=['tokenize', 'parse', 'execute'], default='execute')
+    arguments.add_argument('--requests', type=int, default=5000)
+    arguments.add_argument('--connections', type=int, default=8)
+    arguments.add_argument('--concurrency', type=int, default=4, help='requests in flight per connection')
+    arguments.add_argument('--cold', type=int, default=0, help='also time this many one-shot processes')
+    arguments.add_argument('--spawn', action='store_true', help='start a server for the run')
+    arguments.add_argument('--sessions', type=int, default=4, help='sessions of the spawned server')
+    arguments.add_argument('--batch', type=int, default=32, help='batch size of the spawned server')
+    arguments.add_argument('--host', default='127.0.0.1')
+    arguments.add_argument('--port', type=int, default=8765)
+    arguments.add_argument('--unix', help='connect to this Unix socket instead of TCP')
+    options = arguments.parse_args(argv)
+
+    with spawned_server(options) if options.spawn else contextlib.nullcontext():
+        latencies, elapsed, stats = asyncio.run(load(options))
+
+    latencies.sort()
+    print(f'{options.op}: {len(latencies)} requests, {options.connections} connections x '
+          f'{options.concurrency} in flight')
+    print(f'    client   {len(latencies) / elapsed:9,.0f} requests/sec   '
+          f'p50 {percentile(latencies, 0.5) * 1000:7.2f}ms   p99 {percentile(latencies, 0.99) * 1000:7.2f}ms')
+    server_stats = stats[options.op]
+    print(f'    server   p50 {server_stats["p50_ms"]:7.2f}ms   p99 {server_stats["p99_ms"]:7.2f}ms   '
+          f'{stats["batches"]["count"]} batches, {stats["batches"]["mean_size"]} requests/batch')
+    if options.cold:
+        times = cold_runs(options.op, options.cold)
+        print(f'    one process per request: p50 {percentile(times, 0.5) * 1000:7.1f}ms   '
+              f'p99 {percentile(times, 0.99) * 1000:7.1f}ms')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
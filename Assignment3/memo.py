@@ -0,0 +1,118 @@
+from collections import OrderedDict
+
+# ==================================================================
+#                        MEMOIZATION
+# ==================================================================
+#
+# Support for caching the results of pure function calls in
+# `pl3.execute(tree, env, cache_size=N)`.
+#
+# A function is pure when running it cannot be observed other than
+# through its result: it has no `write` and only calls functions that are
+# defined and pure themselves. Assignments always bind in the callee's own
+# frame, so a function cannot change its caller's variables. Reads of the
+# starting bindings are allowed, because nothing changes them during a run
+# and the cache only lives for one run.
+
+
+class LRUCache:
+    """
+    A bounded mapping that evicts the least recently used entry
+
+    :param maxsize: The maximum number of entries
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        if key in self.data:
+            self.data.move_to_end(key)
+            self.hits += 1
+            return self.data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self.data)
+
+    def stats(self):
+        """
+        Return the counters as a dict
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self.data), 'maxsize': self.maxsize}
+
+
+def pure_functions(ast):
+    """
+    Return the names of the pure functions of a program
+
+    :param ast: The tree returned by `pl3.parse()`
+    """
+    effects = {}        # name -> (writes, names of the called functions)
+    for item in ast[1]:
+        if item[0] == 'function':
+            calls = set()
+            effects[item[1]] = (_statements(item[4], calls), calls)
+
+    impure = {name for name, (writes, calls) in effects.items()
+              if writes or not calls <= effects.keys()}
+    changed = True
+    while changed:
+        changed = False
+        for name, (_, calls) in effects.items():
+            if name not in impure and calls & impure:
+                impure.add(name)
+                changed = True
+    return effects.keys() - impure
+
+
+def _statements(statements, calls):
+    # Collect the called functions; return True if there is a `write`
+    writes = False
+    for statement in statements:
+        kind = statement[0]
+        if kind == 'write':
+            writes = True
+            _expression(statement[1], calls)
+        elif kind in ('let', 'let_mut', 'let_ref', 'assign'):
+            _expression(statement[2], calls)
+        elif kind == 'if':
+            clause = statement
+            while clause is not None and clause[0] != 'else':
+                _expression(clause[1], calls)
+                writes = _statements(clause[2], calls) or writes
+                clause = clause[3]
+            if clause is not None:
+                writes = _statements(clause[1], calls) or writes
+        elif kind == 'while':
+            _expression(statement[1], calls)
+            writes = _statements(statement[2], calls) or writes
+        elif kind in ('return', 'where'):
+            _expression(statement[1], calls)
+        elif kind == 'call':
+            _expression(statement, calls)
+    return writes
+
+
+def _expression(expr, calls):
+    kind = expr[0]
+    if kind == 'operation':
+        _expression(expr[2], calls)
+        _expression(expr[3], calls)
+    elif kind == 'call':
+        calls.add(expr[1])
+        for arg in expr[2]:
+            _expression(arg, calls)
@@ -0,0 +1,106 @@
+# ==================================================================
+#                        CONSTANT FOLDING
+# ==================================================================
+#
+# An optional pass over the program tree returned by `pl3.parse()`:
+# operations on two constants are computed once, here.
+#
+# Operations that fail at run time (division or modulo by zero, invalid
+# operands or operators) are left in place, so `execute()` still reports
+# them with their line. Identities such as `x + 0` or `x * 0` are not
+# simplified: the type of `x` is only known at run time (`b + 0` is 1 for
+# a boolean `b`), and removing `x` would also remove its errors.
+#
+# Usage:
+#     tree, removed = optimizer.optimize(pl3.parse(source))
+
+OPERATORS = {
+    '+': lambda a, b: a + b, '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b, '/': lambda a, b: a / b,
+    '%': lambda a, b: a % b, '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b, '<=': lambda a, b: a <= b,
+    '>=': lambda a, b: a >= b, '<': lambda a, b: a < b,
+    '>': lambda a, b: a > b,
+}
+CONSTANTS = ('number', 'boolean')
+
+
+def optimize(ast):
+    """
+    Fold constants in every function of a program
+
+    :param ast: The tree returned by `pl3.parse()`
+    :return: (optimized tree, number of nodes removed)
+    """
+    items = []
+    for item in ast[1]:
+        if item[0] == 'function':
+            item = item[:4] + (_statements(item[4]),)
+        items.append(item)
+    tree = ('program', items)
+    return tree, count_nodes(ast) - count_nodes(tree)
+
+
+def count_nodes(node):
+    """
+    Count the nodes of a tree (every tagged tuple)
+    """
+    if isinstance(node, list):
+        return sum(count_nodes(item) for item in node)
+    if isinstance(node, tuple) and node and isinstance(node[0], str):
+        return 1 + sum(count_nodes(child) for child in node[1:])
+    return 0
+
+
+def _statements(statements):
+    return [_statement(statement) for statement in statements]
+
+
+def _statement(node):
+    kind = node[0]
+    if kind in ('let', 'let_mut', 'let_ref', 'assign'):
+        return (kind, node[1], fold(node[2]))
+    elif kind == 'if' or kind == 'else_if':
+        return (kind, fold(node[1]), _statements(node[2]), None if node[3] is None else _statement(node[3]))
+    elif kind == 'else':
+        return (kind, _statements(node[1]))
+    elif kind == 'while':
+        return (kind, fold(node[1]), _statements(node[2]))
+    elif kind in ('return', 'write', 'where'):
+        return (kind, fold(node[1]))
+    elif kind == 'call':
+        return fold(node)
+    return node
+
+
+def fold(expr):
+    """
+    Return a simplified copy of an expression
+    """
+    kind = expr[0]
+    if kind == 'call':
+        return (kind, expr[1], [fold(arg) for arg in expr[2]], expr[3])
+    if kind != 'operation':
+        return expr
+
+    _, op, left, right, line = expr
+    left = fold(left)
+    right = fold(right)
+
+    if left[0] in CONSTANTS and right[0] in CONSTANTS:
+        value = _compute(op, left[1], right[1])
+        if value is not None:
+            return ('boolean', value) if isinstance(value, bool) else ('number', value)
+    return ('operation', op, left, right, line)
+
+
+def _compute(op, left, right):
+    # The value of a constant operation, or None if it must be left to
+    # operate() at run time
+    function = OPERATORS.get(op)
+    if function is None or not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+        return None
+    if op in ('/', '%') and right == 0:
+        return None
+    return function(left, right)
+
@@ -1,6 +1,18 @@
+import copy
+import os
+import sys
+import time
+
 import ply.yacc as yacc
 import ply.lex as lex
 
+import closures
+import memo
+import parse_cache
+import vm
+from scanner import CHUNK_SIZE, Scanner
+from tokenstream import TokenStream
+
 # List of all token names
 tokens = [
     'IDENTIFIER', 'NUMBER',
@@ -103,12 +115,6 @@ def t_error(t):
 # Constructing the lexer
 lexer = lex.lex()
 
-# Dictionary to store variables
-variables = {}
-
-# Dictionary for storing function definitions
-functions = {}
-
 # ==================================================================
 #                        PARSING RULES
 # ==================================================================
@@ -142,7 +148,9 @@ def p_program(p):
     if len(p) == 2:
         p[0] = ('program', [p[1]])
     else:
-        p[0] = ('program', p[1][1] + [p[2]])
+        # Append in place, `p[1][1] + [p[2]]` would copy the list every time
+        p[1][1].append(p[2])
+        p[0] = p[1]
 
 
 def p_function(p):
@@ -167,9 +175,8 @@ def p_statements_multiple(p):
     '''statements : statements statement'''
     if p[2] is not None:
         # Only include valid statements
-        p[0] = p[1] + [p[2]]
-    else:
-        p[0] = p[1]
+        p[1].append(p[2])
+    p[0] = p[1]
 
 
 def p_statement_assignment(p):
@@ -199,7 +206,6 @@ def p_statement_let(p):
 
 def p_assignment_statement(p):
     '''assignment_statement : IDENTIFIER EQUALS expression SEMICOLON'''
-    variables[p[1]] = p[3]
     p[0] = ('assign', p[1], p[3])
 
 
@@ -249,9 +255,6 @@ def p_action_statement_function_call(p):
     p[0] = p[1]
 
 
-# List to collect errors during parsing
-errors = []
-
 # ==================================================================
 #                        EXPRESSION HANDLING
 # ==================================================================
@@ -262,26 +265,19 @@ def p_let_expression(p):
                       | LET MUT IDENTIFIER EQUALS expression SEMICOLON
                       | LET REF IDENTIFIER EQUALS expression SEMICOLON'''
     if len(p) == 6:
-        variables[p[2]] = p[4]
+        p[0] = ('let', p[2], p[4])
     elif p[2] == 'mut':
-        variables[p[3]] = p[5]
+        p[0] = ('let_mut', p[3], p[5])
     else:
-        variables[p[3]] = p[5]
-    p[0] = ('let', p[2], p[4] if len(p) == 6 else p[5])
+        p[0] = ('let_ref', p[3], p[5])
+
 
+# Expressions are only built here; they are evaluated by `execute()`. The
+# nodes that can fail at run time keep their line number as last element.
 
 def p_expression_identifier(p):
     '''expression : IDENTIFIER'''
-    try:
-        if p[1] not in variables:
-            raise ExpressionError(f"Undefined variable '{p[1]}'", p.lineno(1))
-        p[0] = variables[p[1]]
-    except ExpressionError as e:
-        errors.append(f"Error at line {e.line}: {e.message}")
-        p[0] = None
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(1)}: {str(e)}")
-        p[0] = None
+    p[0] = ('identifier', p[1], p.lineno(1))
 
 
 def p_expression_operation(p):
@@ -296,106 +292,28 @@ def p_expression_operation(p):
                   | expression GEQ expression
                   | expression LT expression
                   | expression GT expression'''
-    try:
-        # Type checking
-        if not isinstance(p[1], (int, float)) or not isinstance(p[3], (int, float)):
-            raise ExpressionError(
-                f"Invalid operands for {p[2]}: {type(p[1]).__name__} and {
-                    type(p[3]).__name__}",
-                p.lineno(2)
-            )
-
-        # Operation-specific checks
-        if p[2] == '/':
-            if p[3] == 0:
-                raise ExpressionError("Division by zero", p.lineno(2))
-            p[0] = p[1] / p[3]
-        elif p[2] == '%':
-            if p[3] == 0:
-                raise ExpressionError("Modulo by zero", p.lineno(2))
-            p[0] = p[1] % p[3]
-        elif p[2] == '+':
-            p[0] = p[1] + p[3]
-        elif p[2] == '-':
-            p[0] = p[1] - p[3]
-        elif p[2] == '*':
-            p[0] = p[1] * p[3]
-        elif p[2] == '==':
-            p[0] = p[1] == p[3]
-        elif p[2] == '!=':
-            p[0] = p[1] != p[3]
-        elif p[2] == '<=':
-            p[0] = p[1] <= p[3]
-        elif p[2] == '>=':
-            p[0] = p[1] >= p[3]
-        elif p[2] == '<':
-            p[0] = p[1] < p[3]
-        elif p[2] == '>':
-            p[0] = p[1] > p[3]
-        else:
-            raise ExpressionError(f"Invalid operator: {p[2]}", p.lineno(2))
-
-    except ExpressionError as e:
-        errors.append(f"Error at line {e.line}: {e.message}")
-        p[0] = None
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(2)}: {str(e)}")
-        p[0] = None
+    p[0] = ('operation', p[2], p[1], p[3], p.lineno(2))
 
 
 def p_expression_paren(p):
     '''expression : LPAREN expression RPAREN'''
-    try:
-        if p[2] is None:
-            raise ExpressionError(
-                "Invalid expression inside parentheses", p.lineno(1))
-        p[0] = p[2]
-    except ExpressionError as e:
-        errors.append(f"Error at line {e.line}: {e.message}")
-        p[0] = None
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(1)}: {str(e)}")
-        p[0] = None
+    p[0] = p[2]
 
 
 def p_expression_number(p):
     '''expression : NUMBER'''
-    try:
-        if not isinstance(p[1], (int, float)):
-            raise ExpressionError(f"Invalid number format: {
-                                  p[1]}", p.lineno(1))
-        # or p[0] = ('number', p[1])
-        p[0] = p[1]
-    except ExpressionError as e:
-        errors.append(f"Error at line {e.line}: {e.message}")
-        p[0] = None
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(1)}: {str(e)}")
-        p[0] = None
+    p[0] = ('number', p[1])
 
 
 def p_expression_boolean(p):
     '''expression : TRUE
                   | FALSE'''
-    try:
-        p[0] = True if p[1] == 'true' else False
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(1)}: {str(e)}")
-        p[0] = None
+    p[0] = ('boolean', p[1] == 'true')
 
 
 def p_expression_function_call(p):
     '''expression : function_call'''
-    try:
-        if p[1] is None:
-            raise ExpressionError("Invalid function call", p.lineno(1))
-        p[0] = p[1]
-    except ExpressionError as e:
-        errors.append(f"Error at line {e.line}: {e.message}")
-        p[0] = None
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(1)}: {str(e)}")
-        p[0] = None
+    p[0] = p[1]
 
 
 def p_struct(p):
@@ -409,7 +327,8 @@ def p_struct_statements(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
 
 
 def p_list_parameters_empty(p):
@@ -417,14 +336,23 @@ def p_list_parameters_empty(p):
     p[0] = []
 
 
-def p_list_parameters_single(p):
-    '''list_parameters : IDENTIFIER type'''
+def p_list_parameters_nonempty(p):
+    '''list_parameters : parameters
+                       | parameters COMMA'''
+    # A trailing comma is allowed, as it was with the right-recursive rule
+    p[0] = p[1]
+
+
+def p_parameters_single(p):
+    '''parameters : IDENTIFIER type'''
     p[0] = [(p[1], p[2])]
 
 
-def p_list_parameters_multiple(p):
-    '''list_parameters : IDENTIFIER type COMMA list_parameters'''
-    p[0] = [(p[1], p[2])] + p[4]
+def p_parameters_multiple(p):
+    '''parameters : parameters COMMA IDENTIFIER type'''
+    # Left-recursive so the parser stack stays flat for long lists
+    p[1].append((p[3], p[4]))
+    p[0] = p[1]
 
 
 def p_list_arguments_empty(p):
@@ -439,7 +367,8 @@ def p_list_arguments_single(p):
 
 def p_list_arguments_multiple(p):
     '''list_arguments : list_arguments COMMA expression'''
-    p[0] = p[1] + [p[3]]
+    p[1].append(p[3])
+    p[0] = p[1]
 
 
 # ==================================================================
@@ -448,16 +377,9 @@ def p_list_arguments_multiple(p):
 
 def p_function_call(p):
     '''function_call : IDENTIFIER LPAREN list_arguments RPAREN'''
-    if p[1] in functions:
-        func = functions[p[1]]
-        if len(func['params']) != len(p[3]):
-            raise ValueError(f"Function '{p[1]}' expects {len(
-                func['params'])} arguments, but {len(p[3])} were provided.")
-        # Execute function here or return the call for later processing
-        # Represents a call to function `p[1]` with arguments `p[3]`
-        p[0] = ('call', p[1], p[3])
-    else:
-        raise NameError(f"Function '{p[1]}' is not defined.")
+    # Represents a call to function `p[1]` with arguments `p[3]`. The
+    # function is looked up (and the arguments counted) by `execute()`.
+    p[0] = ('call', p[1], p[3], p.lineno(1))
 
 
 def p_type(p):
@@ -477,6 +399,13 @@ def p_empty(p):
 # ==================================================================
 
 
+class TimeLimitExceeded(Exception):
+    """
+    Raised at a loop or call of a program that runs past the `time_limit`
+    given to `Session.execute()`
+    """
+
+
 class ExpressionError(Exception):
     def __init__(self, message: str, line):
         self.message = message
@@ -485,56 +414,636 @@ class ExpressionError(Exception):
 
 
 def p_error(p):
+    report_syntax_error(p)
+
+
+def report_syntax_error(p, out=None):
+    """
+    Print a syntax error at token `p` (None at the end of the input) with a
+    hint, and return the message
+
+    :param out: The file to print to (None: `sys.stdout`)
+    """
     if p:
-        print(f"Syntax error at '{p.value}', line {p.lineno}")
+        message = f"Syntax error at '{p.value}', line {p.lineno}"
+        print(message, file=out)
 
         # General hints based on the token and context
         if p.type in {'RPAREN', 'RCURLY', 'RSQUARE'}:
-            print("Hint: Check for a missing operand or mismatched parentheses/braces.")
+            print("Hint: Check for a missing operand or mismatched parentheses/braces.", file=out)
         elif p.type in {'PLUS', 'MINUS', 'MULT', 'DIV'}:
-            print("Hint: Check for missing operands around the operator.")
+            print("Hint: Check for missing operands around the operator.", file=out)
         elif p.type == 'IDENTIFIER':
-            print("Hint: Verify variable or function declarations.")
+            print("Hint: Verify variable or function declarations.", file=out)
         else:
-            print("Hint: Check syntax around this token.")
+            print("Hint: Check syntax around this token.", file=out)
     else:
-        print("Syntax error at EOF")
-        print("Hint: Check for incomplete code or unclosed blocks.")
+        message = "Syntax error at EOF"
+        print(message, file=out)
+        print("Hint: Check for incomplete code or unclosed blocks.", file=out)
+    return message
+
+
+def tee_tokens(data, consumer, lexer=lexer):
+    """
+    Return a tokenfunc for `parser.parse()` that lexes `data` once and also
+    hands every token to `consumer`, so nothing has to lex it a second time
 
+    :param data: The source text
+    :param consumer: Called with each token before the parser gets it
+    :param lexer: The lexer to use (default: the module's)
+    """
+    lexer.input(data)
+    next_token = lexer.token
+
+    def tokenfunc():
+        token = next_token()
+        if token is not None:
+            consumer(token)
+        return token
+    return tokenfunc
 
-def parse(data):
+
+def parse(data, cache=None, on_token=None):
     """
     Parse the provided data and return the result.
     If there are errors during parsing, they are printed and None is returned.
+    Uses `default_session`; see `Session.parse()`.
+
+    :param data: The source text
+    :param cache: A `ParseCache` (see `open_cache()`); a tree found there is
+                  returned without lexing or parsing, and new trees are stored
+    :param on_token: Called with every token as it is lexed (see
+                     `tee_tokens()`). The input is still lexed on a cache hit.
+    """
+    return default_session.parse(data, cache, on_token)
+
+
+def parse_file(path, chunk_size=CHUNK_SIZE):
+    """
+    Parse a file in chunks with `default_session`; see `Session.parse_file()`
     """
-    global errors
-    errors.clear()
+    return default_session.parse_file(path, chunk_size)
+
+
+def parse_tokens(stream):
+    """
+    Parse tokens saved by `tokenstream.export()` without lexing the source.
+    Errors are handled as in `parse()`.
+
+    :param stream: A `tokenstream.TokenStream`, or the path of a token
+                   stream file
+    """
+    return default_session.parse_tokens(stream)
+
+
+# Build the parser lazily from the prebuilt LALR tables in `pl3_parsetab.py`
+parser = None
 
-    try:
-        result = parser.parse(data, lexer=lexer)
 
-        if errors:
-            print("\nErrors encountered during parsing:")
-            for error in errors:
-                print(error)
+def normalize_rules():
+    """
+    Strip the indentation of the grammar rules in the `p_` docstrings.
+    ply hashes the docstrings into the signature it checks the prebuilt
+    tables against, and Python 3.13 dedents docstrings where older versions
+    keep them as written, so the tables would only match on one of them.
+    """
+    for name, function in globals().items():
+        if name.startswith('p_') and function.__doc__:
+            function.__doc__ = '\n'.join(line.strip() for line in function.__doc__.splitlines())
+
+
+def get_parser():
+    """
+    Return the parser, building it on first use from the prebuilt tables.
+    ply checks the tables against the grammar signature; if the grammar has
+    changed it rebuilds them in memory without writing any files.
+    """
+    global parser
+    if parser is None:
+        try:
+            import pl3_parsetab as tabmodule
+        except ImportError:
+            tabmodule = 'pl3_parsetab'
+        normalize_rules()
+        parser = yacc.yacc(tabmodule=tabmodule, write_tables=False, debug=False)
+    return parser
+
+
+def open_cache(directory, max_bytes=64 * 1024 * 1024):
+    """
+    Open (or create) an on-disk parse cache for `parse()`. Entries are keyed
+    by a hash of this file too, so changing the grammar invalidates them.
+
+    :param directory: Where the cached trees are stored
+    :param max_bytes: The size above which least recently used trees are evicted
+    """
+    return parse_cache.ParseCache(directory, parse_cache.file_hash(__file__), max_bytes)
+
+
+def build_tables():
+    """
+    Regenerate `pl3_parsetab.py` next to this file. Run `python
+    build_tables.py` from the repository root after changing the grammar.
+    """
+    global parser
+    outputdir = os.path.dirname(os.path.abspath(__file__))
+    tabfile = os.path.join(outputdir, 'pl3_parsetab.py')
+    if os.path.exists(tabfile):
+        os.remove(tabfile)
+    normalize_rules()
+    parser = yacc.yacc(tabmodule='pl3_parsetab', outputdir=outputdir, debug=False)
+
+
+# ==================================================================
+#                        EXECUTION
+# ==================================================================
+
+# Marker returned by `run_statements()` when no `return` was executed
+NO_RETURN = object()
+
+
+class TailCall:
+    """
+    Returned by `run_statements()` for `return f(...)`: `call_function()`
+    runs the call in its own loop instead of nesting another Python frame,
+    so tail recursion runs in constant stack depth.
+    """
+    __slots__ = ('name', 'args', 'line')
+
+    def __init__(self, name, args, line):
+        self.name = name
+        self.args = args
+        self.line = line
+
+
+class Session:
+    """
+    An independent pl3 interpreter. It has its own lexer, parser state,
+    function table, variables, errors and output, and shares only the
+    grammar tables with other sessions, so sessions can parse and execute
+    at the same time in different threads. The module-level `parse()` and
+    `execute()` use `default_session`.
+
+    Also the runtime given to the vm and closure engines: they report
+    through `errors`, `operate()` and `out`, and call `check_deadline()`
+    at loops and calls while `deadline` is set.
+
+    :param out: Where `write` statements and diagnostics are printed
+                (None: `sys.stdout`)
+    """
+
+    def __init__(self, out=None):
+        self.out = out
+        self.lexer = lexer.clone()
+        self.lexer.lexerrorf = self.illegal_character
+        self.parser = None
+        # Starting variable bindings of `execute()`
+        self.variables = {}
+        # Function definitions, filled by `execute()`
+        self.functions = {}
+        # Errors of the last parse() or execute()
+        self.errors = []
+        # Results of pure function calls, set up by execute() when
+        # `cache_size` is given. Its counters can be read after the run.
+        self.cache = None
+        self.pure = set()
+        # `time.monotonic()` value at which the running program is stopped,
+        # set by execute() when `time_limit` is given
+        self.deadline = None
+        self.time_limit = None
+        # Whether the last execute() was stopped by its time limit
+        self.timed_out = False
+
+    def get_parser(self):
+        """
+        Return this session's parser: it shares the tables of `get_parser()`
+        but keeps its own parsing stacks and reports syntax errors to `out`
+        """
+        if self.parser is None:
+            self.parser = copy.copy(get_parser())
+            self.parser.errorfunc = self.syntax_error
+        return self.parser
+
+    def syntax_error(self, p):
+        # Printed now, and recorded so that parse() neither returns nor
+        # caches the partial tree
+        self.errors.append(report_syntax_error(p, self.out))
+
+    def illegal_character(self, t):
+        message = f"Illegal character '{t.value[0]}' at line {t.lineno}"
+        print(message, file=self.out)
+        self.errors.append(message)
+        t.lexer.skip(1)
+
+    def parse(self, data, cache=None, on_token=None):
+        """
+        Parse the provided data and return the result.
+        If there are errors during parsing, they are printed and None is returned.
+
+        :param data: The source text
+        :param cache: A `ParseCache` (see `open_cache()`); a tree found there is
+                      returned without lexing or parsing, and new trees are stored
+        :param on_token: Called with every token as it is lexed (see
+                         `tee_tokens()`). The input is still lexed on a cache hit.
+        """
+        self.errors.clear()
+        self.lexer.lineno = 1
+
+        if cache is not None:
+            result = cache.get(data)
+            if result is not None:
+                if on_token is not None:
+                    for token in iter(tee_tokens(data, on_token, self.lexer), None):
+                        pass
+                return result
+
+        try:
+            if on_token is None:
+                result = self.get_parser().parse(data, lexer=self.lexer)
+            else:
+                tokenfunc = tee_tokens(data, on_token, self.lexer)
+                result = self.get_parser().parse(lexer=self.lexer, tokenfunc=tokenfunc)
+                # The parser stops at the end of the input, so this is only
+                # needed if it gave up early
+                while tokenfunc() is not None:
+                    pass
+
+            # Syntax and lexer errors were printed as they were found
+            if self.errors:
+                return None
+
+            if cache is not None:
+                cache.put(data, result)
+            return result
+
+        except Exception as e:
+            message = f"Fatal parsing error: {e}"
+            print(message, file=self.out)
+            self.errors.append(message)
             return None
 
+    def parse_file(self, path, chunk_size=CHUNK_SIZE):
+        """
+        Parse a file without reading it whole: it is scanned in chunks (see
+        `Scanner.input_file()`), so memory grows with the tree, not the
+        text. Errors are handled as in `parse()`.
+
+        :param path: The source file (UTF-8)
+        :param chunk_size: The number of bytes read at a time
+        """
+        self.errors.clear()
+        scanner = Scanner(sys.modules[__name__], ply_words=True)
+        scanner.errorf = self.illegal_character
+        scanner.input_file(path, chunk_size)
+        try:
+            result = self.get_parser().parse(lexer=scanner, tokenfunc=scanner.token)
+        except Exception as e:
+            message = f"Fatal parsing error: {e}"
+            print(message, file=self.out)
+            self.errors.append(message)
+            return None
+        if self.errors:
+            return None
         return result
 
-    except Exception as e:
-        print(f"Fatal parsing error: {str(e)}")
-        return None
+    def parse_tokens(self, stream):
+        """
+        Parse tokens saved by `tokenstream.export()` without lexing the source.
+        Errors are handled as in `parse()`.
+
+        :param stream: A `tokenstream.TokenStream`, or the path of a token
+                       stream file, which is opened and closed again
+        """
+        if isinstance(stream, (str, os.PathLike)):
+            with TokenStream.open(stream) as opened:
+                return self.parse_tokens(opened)
+        self.errors.clear()
+        try:
+            result = self.get_parser().parse(lexer=self.lexer, tokenfunc=stream.tokenfunc())
+        except Exception as e:
+            message = f"Fatal parsing error: {e}"
+            print(message, file=self.out)
+            self.errors.append(message)
+            return None
+        if self.errors:
+            return None
+        return result
 
+    def report_errors(self, stage):
+        """
+        Print the collected errors, if any, and return True if there were some
+        """
+        if not self.errors:
+            return False
+        print(f"\nErrors encountered during {stage}:", file=self.out)
+        for error in self.errors:
+            print(error, file=self.out)
+        return True
+
+    def execute(self, ast, env=None, engine='tree', cache_size=None, time_limit=None):
+        """
+        Run a program returned by `parse()`, starting at its `main` function.
+        The same tree can be executed any number of times without parsing again.
+        If there are errors during execution, they are printed and None is
+        returned.
+
+        :param ast: The parse tree of the program
+        :param env: Starting variable bindings, visible from every function
+                    (defaults to the session's `variables`)
+        :param engine: 'tree' walks the tree, 'vm' compiles it to bytecode
+                       first (see vm.py), 'closure' compiles it to nested
+                       closures (see closures.py)
+        :param cache_size: Memoize calls to pure functions (see memo.py) in an
+                           LRU cache of this many entries; tree engine only
+        :param time_limit: Stop the program after this many seconds, with an
+                           error (`timed_out` is then True)
+        :return: The value returned by `main`
+        """
+        self.errors.clear()
+        self.timed_out = False
+        if env is None:
+            env = self.variables
+
+        self.cache = None
+        if cache_size is not None and engine != 'tree':
+            raise ValueError("Memoization is only supported by the 'tree' engine")
+
+        self.time_limit = time_limit
+        if time_limit is not None:
+            self.deadline = time.monotonic() + time_limit
+        try:
+            if ast is None:
+                raise ValueError("There is no program to run.")
+            if cache_size is not None:
+                self.cache = memo.LRUCache(cache_size)
+                self.pure = memo.pure_functions(ast)
+
+            functions = self.functions
+            functions.clear()
+            for item in ast[1]:
+                if item[0] == 'function':
+                    functions[item[1]] = item
+
+            if engine == 'vm':
+                result = vm.compile_program(ast).run(env, self)
+            elif engine == 'closure':
+                result = closures.compile_program(ast).run(env, self)
+            elif engine == 'tree':
+                if 'main' not in functions:
+                    raise NameError("Function 'main' is not defined.")
+                result = self.call_function('main', [], env)
+            else:
+                raise ValueError(f"Unknown engine '{engine}'")
+
+            if self.report_errors("execution"):
+                return None
+
+            return result
+
+        except TimeLimitExceeded as e:
+            self.timed_out = True
+            self.errors.append(f"Error: {e}")
+            self.report_errors("execution")
+            return None
 
-# Build the parser
-parser = yacc.yacc()
+        except Exception as e:
+            message = f"Fatal execution error: {e}"
+            print(message, file=self.out)
+            self.errors.append(message)
+            return None
 
-if __name__ == "__main__":
-    with open('./Program_Test.txt', 'r') as tester:
-        input_data = tester.read()
-        lexer.input(input_data)
+        finally:
+            self.deadline = None
+
+    def check_deadline(self):
+        """
+        Raise `TimeLimitExceeded` if `deadline` has passed
+        """
+        if time.monotonic() > self.deadline:
+            raise TimeLimitExceeded(f"Time limit of {self.time_limit}s exceeded")
+
+    def call_function(self, name, args, env, line=None):
+        """
+        Call the user function `name` with already evaluated arguments. Every
+        call gets its own frame for parameters and `let` bindings. Tail calls
+        (`TailCall`) replace the current call and loop here.
+        """
+        if self.cache is not None:
+            return self.call_memoized(name, args, env, line)
+
+        functions = self.functions
         while True:
-            token = lexer.token()
-            if not token:
+            if self.deadline is not None:
+                self.check_deadline()
+            func = functions.get(name)
+            if func is None or len(func[2]) != len(args):
+                # Let find_function() report the error
+                return self.find_function(name, args, line)
+            frame = {param[0]: arg for param, arg in zip(func[2], args)}
+            result = self.run_statements(func[4], frame, env)
+            if type(result) is not TailCall:
+                return None if result is NO_RETURN else result
+            name, args, line = result.name, result.args, result.line
+
+    def call_memoized(self, name, args, env, line):
+        """
+        `call_function()` with the results of pure functions kept in `cache`
+        """
+        cache = self.cache
+        reported = len(self.errors)
+        keys = []           # cache keys of the pure calls this call went through
+        while True:
+            if self.deadline is not None:
+                self.check_deadline()
+            func = self.find_function(name, args, line)
+            if func is None:
+                return None
+
+            if name in self.pure:
+                # Types are part of the key, so that f(true) and f(1) differ
+                key = (name,) + tuple((type(arg), arg) for arg in args)
+                result = cache.get(key, NO_RETURN)
+                if result is not NO_RETURN:
+                    break
+                keys.append(key)
+
+            frame = {param[0]: arg for param, arg in zip(func[2], args)}
+            result = self.run_statements(func[4], frame, env)
+            if type(result) is not TailCall:
+                result = None if result is NO_RETURN else result
                 break
-        result = parse(input_data)
+            name, args, line = result.name, result.args, result.line
+
+        # A call that reported errors is not cached, so every call reports them
+        if len(self.errors) == reported:
+            for key in keys:
+                cache.put(key, result)
+        return result
+
+    def find_function(self, name, args, line):
+        """
+        Return the function called by `name(args)`, or None after reporting
+        why it cannot be called
+        """
+        try:
+            if name not in self.functions:
+                raise ExpressionError(f"Function '{name}' is not defined.", line)
+            func = self.functions[name]
+            params = func[2]
+            if len(params) != len(args):
+                raise ExpressionError(f"Function '{name}' expects {len(params)} arguments, but {len(args)} were provided.", line)
+            return func
+        except ExpressionError as e:
+            self.errors.append(f"Error at line {e.line}: {e.message}")
+            return None
+
+    def run_statements(self, statements, frame, env):
+        """
+        Run a list of statements. Returns the value of the first `return`
+        executed, a `TailCall` if that `return` holds a function call, or
+        NO_RETURN.
+        """
+        for statement in statements:
+            kind = statement[0]
+            if kind in ('let', 'let_mut', 'let_ref', 'assign'):
+                frame[statement[1]] = self.evaluate(statement[2], frame, env)
+            elif kind == 'if' or kind == 'else_if':
+                clause = statement
+                while clause is not None:
+                    if clause[0] == 'else':
+                        result = self.run_statements(clause[1], frame, env)
+                        break
+                    if self.evaluate(clause[1], frame, env):
+                        result = self.run_statements(clause[2], frame, env)
+                        break
+                    clause = clause[3]
+                else:
+                    result = NO_RETURN
+                if result is not NO_RETURN:
+                    return result
+            elif kind == 'while':
+                while self.evaluate(statement[1], frame, env):
+                    if self.deadline is not None:
+                        self.check_deadline()
+                    result = self.run_statements(statement[2], frame, env)
+                    if result is not NO_RETURN:
+                        return result
+            elif kind == 'return':
+                expr = statement[1]
+                if expr[0] == 'call':
+                    return TailCall(expr[1], [self.evaluate(arg, frame, env) for arg in expr[2]], expr[3])
+                return self.evaluate(expr, frame, env)
+            elif kind == 'write':
+                print(self.evaluate(statement[1], frame, env), file=self.out)
+            elif kind == 'where':
+                self.evaluate(statement[1], frame, env)
+            elif kind == 'call':
+                self.evaluate(statement, frame, env)
+        return NO_RETURN
+
+    def evaluate(self, expr, frame, env):
+        """
+        Evaluate an expression node. Errors are collected in `errors` and
+        evaluate to None.
+        """
+        kind = expr[0]
+        if kind == 'number' or kind == 'boolean':
+            return expr[1]
+        elif kind == 'identifier':
+            name = expr[1]
+            if name in frame:
+                return frame[name]
+            if name in env:
+                return env[name]
+            self.errors.append(f"Error at line {expr[2]}: Undefined variable '{name}'")
+            return None
+        elif kind == 'operation':
+            return self.operate(expr[1], self.evaluate(expr[2], frame, env), self.evaluate(expr[3], frame, env), expr[4])
+        elif kind == 'call':
+            args = [self.evaluate(arg, frame, env) for arg in expr[2]]
+            return self.call_function(expr[1], args, env, expr[3])
+        self.errors.append(f"Unexpected error: unknown expression '{kind}'")
+        return None
+
+    def operate(self, op, left, right, line):
+        """
+        Apply a binary operator to two evaluated operands
+        """
+        try:
+            # Type checking
+            if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+                raise ExpressionError(f"Invalid operands for {op}: {type(left).__name__} and {type(right).__name__}", line)
+
+            # Operation-specific checks
+            if op == '/':
+                if right == 0:
+                    raise ExpressionError("Division by zero", line)
+                return left / right
+            elif op == '%':
+                if right == 0:
+                    raise ExpressionError("Modulo by zero", line)
+                return left % right
+            elif op == '+':
+                return left + right
+            elif op == '-':
+                return left - right
+            elif op == '*':
+                return left * right
+            elif op == '==':
+                return left == right
+            elif op == '!=':
+                return left != right
+            elif op == '<=':
+                return left <= right
+            elif op == '>=':
+                return left >= right
+            elif op == '<':
+                return left < right
+            elif op == '>':
+                return left > right
+            else:
+                raise ExpressionError(f"Invalid operator: {op}", line)
+
+        except ExpressionError as e:
+            self.errors.append(f"Error at line {e.line}: {e.message}")
+            return None
+        except Exception as e:
+            self.errors.append(f"Unexpected error at line {line}: {str(e)}")
+            return None
+
+
+# The session behind the module-level `parse()` and `execute()`. Its
+# tables are also available under the old module-level names, and the
+# module itself can still be passed as the runtime of vm.py/closures.py.
+default_session = Session()
+variables = default_session.variables
+functions = default_session.functions
+errors = default_session.errors
+operate = default_session.operate
+out = None
+deadline = None
+
+# Results of pure function calls of the last `execute()` with `cache_size`
+cache = None
+pure = set()
+
+
+def execute(ast, env=None, engine='tree', cache_size=None, time_limit=None):
+    """
+    Run a program returned by `parse()` in `default_session`; see
+    `Session.execute()`. The memoization cache of the run is left in `cache`.
+    """
+    global cache, pure
+    result = default_session.execute(ast, env, engine, cache_size, time_limit)
+    cache = default_session.cache
+    pure = default_session.pure
+    return result
+
+
+if __name__ == "__main__":
+    # The file is scanned in chunks, not read whole; pass on_token= to
+    # parse() to see the tokens
+    result = parse_file('Program_Test.txt')
+    if result is not None:
+        execute(result)
@@ -0,0 +1,91 @@
+# ==================================================================
+#                        SCOPE RESOLUTION
+# ==================================================================
+#
+# Assigns every variable of a function a slot index in its frame, so the
+# compiled engines (vm.py, closures.py) can keep a call's variables in a
+# list and access them by index instead of hashing the name.
+#
+# Parameters take the first slots (in order), then every name bound by
+# `let`/`let mut`/`let ref` or an assignment, in order of appearance.
+# Names that are only read are not bound in the function: they refer to
+# the starting bindings passed to `execute()`. They get no slot here and
+# are listed in `free`, in order of first use.
+
+
+class Scope:
+    """
+    The frame layout of one function
+
+    :param params: The parameter names
+    """
+
+    def __init__(self, params):
+        self.slots = {}         # name -> slot index
+        self.names = []         # slot index -> name
+        self.free = {}          # names read but never bound (used as an ordered set)
+        for name in params:
+            self.bind(name)
+
+    def bind(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+
+    @property
+    def size(self):
+        return len(self.names)
+
+    def slot(self, name):
+        """
+        Return the slot of `name`, or None if it is not bound locally
+        """
+        return self.slots.get(name)
+
+
+def resolve(function):
+    """
+    Compute the frame layout of a `('function', ...)` node
+
+    :param function: The function node from the tree returned by `pl3.parse()`
+    :return: A `Scope`
+    """
+    scope = Scope([param[0] for param in function[2]])
+    _statements(function[4], scope)
+    scope.free = {name: None for name in scope.free if name not in scope.slots}
+    return scope
+
+
+def _statements(statements, scope):
+    for statement in statements:
+        kind = statement[0]
+        if kind in ('let', 'let_mut', 'let_ref', 'assign'):
+            _expression(statement[2], scope)
+            scope.bind(statement[1])
+        elif kind == 'if':
+            clause = statement
+            while clause is not None and clause[0] != 'else':
+                _expression(clause[1], scope)
+                _statements(clause[2], scope)
+                clause = clause[3]
+            if clause is not None:
+                _statements(clause[1], scope)
+        elif kind == 'while':
+            _expression(statement[1], scope)
+            _statements(statement[2], scope)
+        elif kind in ('return', 'write', 'where'):
+            _expression(statement[1], scope)
+        elif kind == 'call':
+            _expression(statement, scope)
+
+
+def _expression(expr, scope):
+    kind = expr[0]
+    if kind == 'identifier':
+        scope.free[expr[1]] = None
+    elif kind == 'operation':
+        _expression(expr[2], scope)
+        _expression(expr[3], scope)
+    elif kind == 'call':
+        for arg in expr[2]:
+            _expression(arg, scope)
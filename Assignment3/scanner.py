@@ -0,0 +1,269 @@
+import codecs
+import mmap
+import os
+import re
+
+import ply.lex as lex
+
+# ==================================================================
+#                        SINGLE-PASS SCANNER
+# ==================================================================
+#
+# A hand-written alternative to `lex.lex()` for the assignment token
+# tables. Instead of trying every function rule and then every string
+# rule, all rules are folded into one precompiled master regex and the
+# matched group decides the token type. Keywords are resolved with a
+# single dictionary lookup on the identifier text.
+#
+# Usage (drop-in for the ply lexer):
+#
+#     import pl2
+#     from scanner import Scanner
+#     result = pl2.get_parser().parse(data, lexer=Scanner(pl2))
+#
+# Large files can be scanned in chunks instead of being read whole:
+#
+#     scanner = Scanner(pl1)
+#     scanner.input_file('big.txt', chunk_size=1 << 20)
+#     for token in scanner:
+#         ...
+#
+# `Scanner(module, slots=True)` produces `Token`s instead of LexTokens:
+# same attributes, but no per-token `__dict__`.
+#
+# Every assignment directory has an identical copy of this file, so that
+# each assignment runs on its own. Change all of them together;
+# tests/test_copies.py checks that they match.
+
+
+# Token rules implemented as functions in the lexer modules. Their regexes
+# are read from the docstrings so the scanner stays in sync with the module.
+FUNCTION_RULES = ('IDENTIFIER', 'NUMBER', 'NEWLINE', 'COMMENT')
+
+# Group numbers inside the master regex
+_IDENTIFIER, _NUMBER, _NEWLINE, _COMMENT, _OPERATOR, _ILLEGAL = 1, 2, 3, 4, 5, 6
+
+# Bytes read at a time by `Scanner.input_file()`
+CHUNK_SIZE = 1 << 20
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE, use_mmap=False):
+    """
+    Generate the text of a UTF-8 file in pieces that end at a newline
+    (except the last one). No token or `//` comment spans a newline, so
+    each piece can be scanned on its own. A piece holds at most
+    `chunk_size` bytes plus the rest of the line they end in.
+
+    :param path: The file to read
+    :param chunk_size: The number of bytes read at a time
+    :param use_mmap: Read through a memory map instead of file reads
+    """
+    with open(path, 'rb') as f:
+        source = f
+        if use_mmap and os.fstat(f.fileno()).st_size:
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Decodes characters split between two reads
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        pending = ''
+        while True:
+            chunk = source.read(chunk_size)
+            pending += decoder.decode(chunk, final=not chunk)
+            if not chunk:
+                break
+            cut = pending.rfind('\n') + 1
+            if cut:
+                yield pending[:cut]
+                pending = pending[cut:]
+        if pending:
+            yield pending
+        if source is not f:
+            source.close()
+
+
+class Token:
+    """
+    A token without a per-instance `__dict__`, accepted by the ply parser
+    wherever a LexToken is. `lexer` is only set by ply on syntax errors.
+    """
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+class Scanner:
+    """
+    Table-driven scanner built from a lexer module (pl1, pl2, pl3 or pl4)
+
+    It produces the same token types, values, `lineno` and `lexpos` as the
+    ply lexer built from the same module, except that words listed as
+    string rules (`t_INT = r'int'`, ...) are treated as keywords, so
+    `int`/`float`/`char`/`boolean` lex as INT/FLOAT/CHAR/BOOLEAN instead of
+    being swallowed by `t_IDENTIFIER` (unless `ply_words` is set).
+
+    :param module: The lexer module providing `tokens`, `reserved`,
+                   `t_ignore`, `t_error` and the `t_*` rules
+    :param slots: Produce `Token`s instead of LexTokens
+    :param ply_words: Ignore the word rules like ply does, so `int` lexes
+                      as IDENTIFIER and every token matches the ply lexer
+    """
+
+    def __init__(self, module, slots=False, ply_words=False):
+        self.keywords = dict(module.reserved)
+        operators = []
+        for name in module.tokens:
+            rule = getattr(module, 't_' + name, None)
+            if not isinstance(rule, str):
+                continue
+            if re.fullmatch(r'[a-zA-Z_]+', rule):
+                # A plain word is a keyword, not an operator
+                if not ply_words:
+                    self.keywords[rule] = name
+            else:
+                operators.append((name, rule))
+
+        # All operator rules are literal strings, so they share one group and
+        # the matched text picks the type. Longest first, as ply sorts them.
+        self.operators = {}
+        for name, rule in operators:
+            literal = re.sub(r'\\(.)', r'\1', rule)
+            if re.fullmatch(rule, literal) is None:
+                raise ValueError(f"Rule 't_{name}' is not a literal string")
+            self.operators[literal] = name
+        operators.sort(key=lambda item: len(item[1]), reverse=True)
+
+        # Function rules keep their definition order and go before the
+        # operators (so `//` is a comment, not a SLASH). The last group
+        # catches any illegal character.
+        groups = [getattr(module, 't_' + name).__doc__ for name in FUNCTION_RULES]
+        groups.append('|'.join(rule for _, rule in operators))
+        groups.append('.')
+        ignore = '[%s]*+' % re.escape(module.t_ignore) if module.t_ignore else ''
+        self.master = re.compile(
+            ignore + '(?:' + '|'.join('(%s)' % g for g in groups) + ')')
+        self.errorf = getattr(module, 't_error', None)
+        self.token_class = Token if slots else lex.LexToken
+
+        self.lexdata = ''
+        self.lexpos = 0
+        self.lineno = 1
+        self._tokens = iter(())
+
+    def input(self, data):
+        """
+        Store a new string in the scanner. Like the ply lexer, `lineno` is
+        not reset.
+
+        :param data: The source text to scan
+        """
+        self.lexdata = data
+        self.lexpos = 0
+        self._tokens = self._scan((data,))
+
+    def input_file(self, path, chunk_size=CHUNK_SIZE, use_mmap=False):
+        """
+        Scan a file without reading it whole: memory stays bounded by the
+        chunk size (and the longest line) instead of the file size. Token
+        `lexpos` values are offsets in the file's text; `lexdata` only
+        holds the current piece.
+
+        :param path: The file to scan (UTF-8)
+        :param chunk_size: The number of bytes read at a time
+        :param use_mmap: Read through a memory map instead of file reads
+        """
+        self.lexdata = ''
+        self.lexpos = 0
+        self._tokens = self._scan(read_chunks(path, chunk_size, use_mmap))
+
+    def token(self):
+        """
+        Return the next token, or None at the end of the input
+        """
+        return next(self._tokens, None)
+
+    def skip(self, n):
+        """
+        Skip `n` characters (used by `t_error`)
+        """
+        self.lexpos += n
+
+    def clone(self):
+        """
+        Return a new scanner sharing the compiled tables
+        """
+        other = object.__new__(Scanner)
+        other.__dict__.update(self.__dict__)
+        other._tokens = iter(())
+        return other
+
+    def __iter__(self):
+        return self._tokens
+
+    def _scan(self, pieces):
+        keywords = self.keywords
+        operators = self.operators
+        new_token = self.token_class
+        offset = 0      # position of the current piece in the whole input
+
+        for data in pieces:
+            self.lexdata = data
+            lineno = self.lineno
+            matches = self.master.finditer(data, self.lexpos)
+
+            while matches is not None:
+                restart, matches = matches, None
+                for m in restart:
+                    group = m.lastindex
+                    if group == _NEWLINE:
+                        lineno += m.end() - m.start(group)
+                        self.lineno = lineno
+                        continue
+                    if group == _COMMENT:
+                        continue
+                    if group == _ILLEGAL:
+                        pos = m.start(group)
+                        skipped = self._error(pos, lineno)
+                        if skipped != pos + 1:
+                            # t_error() moved somewhere else, restart from there
+                            matches = self.master.finditer(data, skipped)
+                            break
+                        continue
+
+                    tok = new_token()
+                    value = m.group(group)
+                    if group == _IDENTIFIER:
+                        tok.type = keywords.get(value, 'IDENTIFIER')
+                    elif group == _NUMBER:
+                        tok.type = 'NUMBER'
+                        value = int(value)
+                    else:
+                        tok.type = operators[value]
+                    tok.value = value
+                    tok.lineno = lineno
+                    tok.lexpos = offset + m.start(group)
+                    self.lexpos = m.end()
+                    yield tok
+
+            offset += len(data)
+            self.lexpos = 0
+        self.lexpos = len(self.lexdata)
+
+    def _error(self, pos, lineno):
+        # Mirror ply: hand the rest of the input to t_error() and expect it
+        # to move `lexpos` forward
+        data = self.lexdata
+        if self.errorf is None:
+            raise lex.LexError(
+                f"Illegal character '{data[pos]}' at index {pos}", data[pos:])
+        tok = lex.LexToken()
+        tok.type = 'error'
+        tok.value = data[pos:]
+        tok.lineno = lineno
+        tok.lexpos = pos
+        tok.lexer = self
+        self.lexpos = pos
+        self.errorf(tok)
+        if self.lexpos == pos:
+            raise lex.LexError(
+                f"Scanning error. Illegal character '{data[pos]}'", data[pos:])
+        return self.lexpos
@@ -0,0 +1,278 @@
+"""
+Long-running pl3 service: tokenize, parse and execute requests over a
+socket, answered by parser sessions built once at startup
+
+Usage:
+    python server.py [--host 127.0.0.1] [--port 8765] [--unix PATH]
+                     [--sessions 4] [--batch 32] [--batch-wait 0] [--time-limit 5]
+
+Protocol: newline-delimited JSON. Each request is one object on one line,
+and each answer is one line with the same "id":
+
+    {"id": 1, "op": "tokenize", "source": "..."}
+        -> {"id": 1, "ok": true, "result": [[type, value, line], ...]}
+    {"id": 2, "op": "parse", "source": "..."}
+        -> {"id": 2, "ok": true, "result": <tree as nested lists>, "output": "..."}
+    {"id": 3, "op": "execute", "source": "...", "env": {"n": 10}, "engine": "tree"}
+        -> {"id": 3, "ok": true, "result": <value of main>, "output": "..."}
+    {"id": 4, "op": "stats"}
+        -> {"id": 4, "ok": true, "result": {"parse": {"count": ..., "p50_ms": ..., "p99_ms": ...}, ...}}
+
+"output" holds what the program wrote and the diagnostics; "ok" is false
+when there were errors. A program still running after --time-limit
+seconds is stopped and answered with "ok": false and an "error". Answers
+on one connection can come back in a different order than the requests.
+
+Requests go into one queue. Whenever one of the --sessions pre-built
+`pl3.Session`s is free, it takes everything waiting in the queue (up to
+--batch requests; --batch-wait seconds more can be spent waiting for
+others after the first) and runs it in a worker thread. Requests that
+arrive while every session is busy share one thread hand-off, and an idle
+server answers a lone request without waiting.
+"""
+import argparse
+import asyncio
+import io
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pl3
+
+OPERATIONS = ('tokenize', 'parse', 'execute')
+
+# Latencies kept per operation for the percentiles
+SAMPLES = 10000
+
+
+class LatencyStats:
+    """
+    Latency counters of one operation over the last `SAMPLES` requests
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.samples = deque(maxlen=SAMPLES)
+
+    def add(self, seconds):
+        self.count += 1
+        self.samples.append(seconds)
+
+    def percentile(self, fraction):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        p50, p99 = self.percentile(0.50), self.percentile(0.99)
+        return {
+            'count': self.count,
+            'p50_ms': None if p50 is None else round(p50 * 1000, 3),
+            'p99_ms': None if p99 is None else round(p99 * 1000, 3),
+        }
+
+
+def handle(session, request, time_limit=None):
+    """
+    Answer one request with `session` (runs in a worker thread)
+
+    :param time_limit: The most seconds an `execute` request may run
+    """
+    op = request.get('op')
+    source = request.get('source')
+    if op not in OPERATIONS:
+        return {'ok': False, 'error': f"Unknown op {op!r}"}
+    if not isinstance(source, str):
+        return {'ok': False, 'error': "Missing 'source'"}
+
+    session.out = io.StringIO()
+    if op == 'tokenize':
+        session.errors.clear()
+        session.lexer.lineno = 1
+        session.lexer.input(source)
+        result = [[token.type, token.value, token.lineno] for token in iter(session.lexer.token, None)]
+        return {'ok': not session.errors, 'result': result, 'output': session.out.getvalue()}
+
+    # Every parsing and execution error, fatal ones included, is in `errors`
+    result = session.parse(source)
+    ok = result is not None
+    if op == 'execute' and ok:
+        result = session.execute(result, dict(request.get('env') or {}), request.get('engine', 'tree'),
+                                 time_limit=time_limit)
+        ok = not session.errors
+        if session.timed_out:
+            return {'ok': False, 'error': f"Time limit of {time_limit}s exceeded",
+                    'output': session.out.getvalue()}
+    return {'ok': ok, 'result': result, 'output': session.out.getvalue()}
+
+
+def handle_batch(session, requests, time_limit=None):
+    answers = []
+    for request in requests:
+        try:
+            answers.append(handle(session, request, time_limit))
+        except Exception as e:
+            answers.append({'ok': False, 'error': f"Internal error: {e}"})
+    return answers
+
+
+class Server:
+    """
+    The request queue, the session pool and the latency counters
+
+    :param sessions: The number of sessions (and worker threads)
+    :param batch: The most requests run in one batch
+    :param batch_wait: How long to wait for more requests once one arrived
+    :param time_limit: The most seconds one `execute` request may run
+                       (None: no limit)
+    """
+
+    def __init__(self, sessions=4, batch=32, batch_wait=0.0, time_limit=None):
+        pl3.get_parser()
+        self.sessions = asyncio.Queue()
+        for _ in range(sessions):
+            session = pl3.Session()
+            session.get_parser()
+            self.sessions.put_nowait(session)
+        self.executor = ThreadPoolExecutor(max_workers=sessions)
+        self.batch = batch
+        self.batch_wait = batch_wait
+        self.time_limit = time_limit
+        self.queue = asyncio.Queue()
+        self.stats = {op: LatencyStats() for op in OPERATIONS}
+        self.batch_count = 0
+        self.batched = 0            # requests run in all batches
+        self.tasks = set()
+
+    async def submit(self, request):
+        """
+        Queue a request and return its answer
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((request, future))
+        return await future
+
+    async def dispatch(self):
+        """
+        Give each free session a batch of the requests waiting in the queue
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            session = await self.sessions.get()
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            task = asyncio.create_task(self.run_batch(session, batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def run_batch(self, session, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            answers = await loop.run_in_executor(
+                self.executor, handle_batch, session, [request for request, _ in batch], self.time_limit)
+        finally:
+            self.sessions.put_nowait(session)
+        self.batch_count += 1
+        self.batched += len(batch)
+        for (_, future), answer in zip(batch, answers):
+            if not future.done():
+                future.set_result(answer)
+
+    def summary(self):
+        result = {op: stats.summary() for op, stats in self.stats.items()}
+        result['batches'] = {
+            'count': self.batch_count,
+            'mean_size': round(self.batched / self.batch_count, 2) if self.batch_count else None,
+        }
+        return result
+
+    async def answer(self, line, writer):
+        start = time.perf_counter()
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('a request must be a JSON object')
+        except ValueError as e:
+            answer = {'id': None, 'ok': False, 'error': f"Invalid request: {e}"}
+        else:
+            if request.get('op') == 'stats':
+                answer = {'ok': True, 'result': self.summary()}
+            else:
+                answer = await self.submit(request)
+                if request.get('op') in self.stats:
+                    self.stats[request['op']].add(time.perf_counter() - start)
+            answer = {'id': request.get('id'), **answer}
+        writer.write(json.dumps(answer, default=str).encode() + b'\n')
+        await writer.drain()
+
+    async def connection(self, reader, writer):
+        pending = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(self.answer(line, writer))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(options):
+    server = Server(options.sessions, options.batch, options.batch_wait, options.time_limit or None)
+    dispatcher = asyncio.create_task(server.dispatch())
+    # Requests are one line, and sources can be long
+    limit = 64 * 1024 * 1024
+    if options.unix:
+        listener = await asyncio.start_unix_server(server.connection, options.unix, limit=limit)
+        where = options.unix
+    else:
+        listener = await asyncio.start_server(server.connection, options.host, options.port, limit=limit)
+        where = f'{options.host}:{options.port}'
+    print(f'pl3 server on {where} with {options.sessions} sessions', flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        dispatcher.cancel()
+        server.executor.shutdown(wait=False)
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description='Serve pl3 tokenize/parse/execute requests')
+    arguments.add_argument('--host', default='127.0.0.1')
+    arguments.add_argument('--port', type=int, default=8765)
+    arguments.add_argument('--unix', help='listen on this Unix socket instead of TCP')
+    arguments.add_argument('--sessions', type=int, default=4, help='pre-built parser sessions')
+    arguments.add_argument('--batch', type=int, default=32, help='most requests per batch')
+    arguments.add_argument('--batch-wait', type=float, default=0.0,
+                           help='seconds to wait for more requests to batch')
+    arguments.add_argument('--time-limit', type=float, default=5.0,
+                           help='seconds an execute request may run (0: no limit)')
+    options = arguments.parse_args(argv)
+    try:
+        asyncio.run(serve(options))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
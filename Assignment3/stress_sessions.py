@@ -0,0 +1,108 @@
+"""
+Stress test for `pl3.Session`: many sessions parsing and executing at the
+same time in a thread pool
+
+Every task creates its own session and runs a program that depends on the
+task number: most print a series of sums, some divide by zero and some
+have a syntax error. The output, errors and result of every task are
+compared with a run of the same program alone (through the module-level
+`parse()`/`execute()`, one at a time), so any state leaking between
+sessions (variables, functions, errors, parser stacks or output) makes the
+test fail. The thread switch interval is made as short as possible so the
+sessions interleave. The tasks are run once per number of threads and the
+throughput is reported.
+
+Usage:
+    python stress_sessions.py [tasks] [threads ...]     (default: 500 1 2 4 8)
+"""
+import contextlib
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pl3
+
+PROGRAM = '''
+fn sum(n int) int {{
+    let mut total = 0;
+    while (n > 0) {{
+        total = total + n * {task};
+        n = n - 1;
+    }}
+    return total;
+}}
+
+fn main() {{
+    let mut i = 0;
+    while (i < count) {{
+        write sum(i);
+        i = i + 1;
+    }}
+    return sum(count) / {divisor};
+}}
+'''
+
+# Every SYNTAX_EVERY-th task has a syntax error on its line 3, every
+# ZERO_EVERY-th one divides by zero
+SYNTAX_EVERY = 7
+ZERO_EVERY = 5
+
+
+def program(task):
+    source = PROGRAM.format(task=task, divisor=0 if task % ZERO_EVERY == 0 else 2)
+    if task % SYNTAX_EVERY == 0:
+        source = source.replace('let mut total = 0;', 'let mut total = ;')
+    return source
+
+
+def reference(task):
+    """
+    Run the program of `task` alone, through the module-level functions
+    """
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        tree = pl3.parse(program(task))
+        result = None
+        if tree is not None:
+            result = pl3.execute(tree, {'count': count(task)})
+    return task, out.getvalue().splitlines(), result
+
+
+def count(task):
+    return 20 + task % 30
+
+
+def run_task(task):
+    out = io.StringIO()
+    session = pl3.Session(out)
+    tree = session.parse(program(task))
+    result = None
+    if tree is not None:
+        result = session.execute(tree, {'count': count(task)})
+    return task, out.getvalue().splitlines(), result
+
+
+def check(results, expected):
+    for (task, lines, result), (_, want_lines, want_result) in zip(results, expected):
+        if lines != want_lines or result != want_result:
+            raise AssertionError(f"Task {task}: got {lines!r} -> {result!r}, "
+                                 f"expected {want_lines!r} -> {want_result!r}")
+
+
+if __name__ == "__main__":
+    tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = [int(n) for n in sys.argv[2:]] or [1, 2, 4, 8]
+    # Switch threads as often as possible, so sessions interleave
+    sys.setswitchinterval(1e-6)
+    expected = [reference(task) for task in range(1, tasks + 1)]
+
+    print(f'{tasks} sessions, every {SYNTAX_EVERY}th with a syntax error, '
+          f'every {ZERO_EVERY}th dividing by zero')
+    for workers in threads:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_task, range(1, tasks + 1)))
+        elapsed = time.perf_counter() - start
+        check(results, expected)
+        print(f'    {workers:2} threads {elapsed:7.3f}s {tasks / elapsed:10,.0f} sessions/sec   all isolated')
@@ -0,0 +1,260 @@
+import argparse
+import importlib
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from scanner import Token
+
+# ==================================================================
+#                        BINARY TOKEN STREAMS
+# ==================================================================
+#
+# Saves the tokens of a source file so other tools can use them without
+# lexing again. The tokens are stored as parallel typed arrays:
+#
+#     types     uint8    index into the token names of the header
+#     lines     uint32   line number
+#     starts    uint32   position in the source (`lexpos`)
+#     values    int64    the value of NUMBER tokens; for any other token the
+#                        length of its text, which is `source[start:start + length]`
+#
+# followed by the source text itself (UTF-8). Every section starts at a
+# file offset that is a multiple of 8. `TokenStream` reads a file through
+# `memoryview`s over the file's bytes (or a memory map), so the arrays are
+# not copied, the source is only decoded once a value is asked for, and no
+# token object is built unless asked for.
+#
+# Positions, line numbers and sizes are uint32, so the source must be under
+# 4 GB once encoded, and NUMBER values are int64; `write()` refuses sources
+# and literals that do not fit.
+#
+# Usage:
+#     python tokenstream.py program.txt program.tks [--module pl2]
+#
+#     tokenstream.export(pl1, source, 'program.tks')
+#     with tokenstream.TokenStream.open('program.tks') as stream:
+#         stream.types, stream.lines          # memoryviews, one item per token
+#         pl2.parse_tokens(stream)            # the parser reads it directly
+#
+# Every assignment directory has an identical copy of this file, so that
+# each assignment runs on its own. Change all of them together;
+# tests/test_copies.py checks that they match.
+
+MAGIC = b'PLTOKS2\0'
+# magic, token count, header size, source size (little-endian)
+PREFIX = struct.Struct('<8sIII')
+ALIGN = 8
+# Largest source size (in bytes) whose positions fit in uint32
+MAX_SOURCE = 2 ** 32 - 1
+# Range of NUMBER values that fit in int64
+MIN_NUMBER = -2 ** 63
+MAX_NUMBER = 2 ** 63 - 1
+
+
+def export(module, source, path):
+    """
+    Lex `source` with the ply lexer of `module` and write its tokens to `path`
+
+    :param module: The lexer module (pl1, pl2, pl3 or pl4)
+    :param source: The source text
+    :param path: The file to write
+    """
+    lexer = module.lexer.clone()
+    lexer.lineno = 1
+    lexer.input(source)
+    with open(path, 'wb') as out:
+        write(iter(lexer.token, None), module.tokens, source, out)
+
+
+def write(tokens, names, source, out):
+    """
+    Write tokens in the binary format
+
+    :param tokens: The tokens, in order (LexToken or anything with `type`,
+                   `value`, `lineno` and `lexpos`)
+    :param names: The token names (the `tokens` list of the module)
+    :param source: The text the tokens were lexed from
+    :param out: A binary file
+    """
+    if len(names) > 256:
+        raise ValueError('At most 256 token types fit in uint8')
+    text = source.encode()
+    if len(text) > MAX_SOURCE:
+        raise ValueError(f'The source is {len(text):,} bytes; token streams hold at most {MAX_SOURCE:,}')
+    index = {name: i for i, name in enumerate(names)}
+    numeric = set()
+    types = bytearray()
+    lines = array('I')
+    starts = array('I')
+    values = array('q')
+    for token in tokens:
+        types.append(index[token.type])
+        lines.append(token.lineno)
+        starts.append(token.lexpos)
+        if type(token.value) is int:
+            if not MIN_NUMBER <= token.value <= MAX_NUMBER:
+                raise ValueError(f'Token {token.type} at line {token.lineno} is {token.value}; '
+                                 f'token streams hold numbers up to {MAX_NUMBER:,}')
+            numeric.add(token.type)
+            values.append(token.value)
+        else:
+            if token.type in numeric or source[token.lexpos:token.lexpos + len(token.value)] != token.value:
+                raise ValueError(f"Token {token.type} at line {token.lineno} is not a slice of the source")
+            values.append(len(token.value))
+
+    header = json.dumps({
+        'names': list(names),
+        'numeric': sorted(numeric),
+        'byteorder': sys.byteorder,
+    }).encode()
+    out.write(PREFIX.pack(MAGIC, len(types), len(header), len(text)))
+    position = PREFIX.size
+    for section in (header, types, lines, starts, values):
+        # Pad the end of the previous section, so this one starts aligned
+        padding = -position % ALIGN
+        out.write(b'\0' * padding)
+        out.write(section)
+        position += padding + memoryview(section).nbytes
+    out.write(b'\0' * (-position % ALIGN))
+    out.write(text)
+
+
+class TokenStream:
+    """
+    Read-only view of a binary token stream. `close()` it, or use it in a
+    `with` statement, to release the arrays and the memory map.
+
+    :param buffer: The file contents (bytes, or an mmap)
+    """
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        magic, count, header_size, source_size = PREFIX.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError('Not a token stream file')
+        offset = PREFIX.size + -PREFIX.size % ALIGN
+        header = json.loads(bytes(view[offset:offset + header_size]))
+        offset += header_size
+
+        self.names = header['names']
+        numeric = {self.names.index(name) for name in header['numeric']}
+        self.numeric = bytes(i in numeric for i in range(256))
+        self.count = count
+        sections = []
+        for code, size in (('B', 1), ('I', 4), ('I', 4), ('q', 8)):
+            offset += -offset % ALIGN
+            length = count * size
+            section = view[offset:offset + length].cast(code)
+            if header['byteorder'] != sys.byteorder and size > 1:
+                # Written on a machine of the other byte order: copy and swap
+                section = array(code, section)
+                section.byteswap()
+            sections.append(section)
+            offset += length
+        offset += -offset % ALIGN
+        self.types, self.lines, self.starts, self.values = sections
+        self._text = view[offset:offset + source_size]
+        self._source = None
+        self._view = view
+        self._buffer = buffer
+
+    @classmethod
+    def open(cls, path, use_mmap=True):
+        """
+        Read a token stream file, through a memory map by default
+        """
+        with open(path, 'rb') as f:
+            if use_mmap:
+                return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            return cls(f.read())
+
+    def close(self):
+        """
+        Release the arrays and close the memory map, if there is one. The
+        decoded `source` stays usable; the arrays do not.
+        """
+        # The map cannot be closed while a view of it is alive
+        for view in (self.types, self.lines, self.starts, self.values, self._text, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def source(self):
+        """
+        The source text, decoded on first use
+        """
+        if self._source is None:
+            self._source = str(self._text, 'utf-8')
+        return self._source
+
+    def __len__(self):
+        return self.count
+
+    def value(self, i):
+        """
+        Return the value of token `i`
+        """
+        kind = self.types[i]
+        if self.numeric[kind]:
+            return self.values[i]
+        start = self.starts[i]
+        return self.source[start:start + self.values[i]]
+
+    def token(self, i):
+        """
+        Return token `i` as a `Token`
+        """
+        tok = Token()
+        tok.type = self.names[self.types[i]]
+        tok.value = self.value(i)
+        tok.lineno = self.lines[i]
+        tok.lexpos = self.starts[i]
+        return tok
+
+    def tokenfunc(self):
+        """
+        Return a function giving the next `Token` on each call and None at
+        the end, for `parser.parse(tokenfunc=...)`
+        """
+        # ply reads past the end until it gets None
+        tokens = iter(self)
+        return lambda: next(tokens, None)
+
+    def __iter__(self):
+        names = self.names
+        numeric = self.numeric
+        source = self.source
+        for kind, line, start, value in zip(self.types, self.lines, self.starts, self.values):
+            tok = Token()
+            tok.type = names[kind]
+            tok.value = value if numeric[kind] else source[start:start + value]
+            tok.lineno = line
+            tok.lexpos = start
+            yield tok
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description='Save the tokens of a source file')
+    arguments.add_argument('source', help='the source file')
+    arguments.add_argument('output', help='the token stream file to write')
+    arguments.add_argument('--module', default='pl1', help='the lexer module (default: pl1)')
+    options = arguments.parse_args(argv)
+
+    module = importlib.import_module(options.module)
+    with open(options.source, 'r', encoding='utf-8') as f:
+        export(module, f.read(), options.output)
+
+
+if __name__ == "__main__":
+    main()
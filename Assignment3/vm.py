@@ -0,0 +1,421 @@
+import operator
+from array import array
+
+from resolver import resolve
+
+# ==================================================================
+#                        BYTECODE COMPILER AND VM
+# ==================================================================
+#
+# Compiles the program tree returned by `pl3.parse()` into bytecode and
+# runs it on a small stack machine.
+#
+# Every instruction is four ints in an `array('i')`: the opcode and up to
+# three arguments (a frame slot, an index into the constant, global,
+# operator or call tables, or a jump target). Binary operations whose
+# operands are local variables or constants get fused instructions, since
+# dispatching an instruction is the main cost in Python.
+#
+# Variables live in a list indexed by the slots computed by resolver.py.
+# Names that are not bound in the function get the slots after the locals,
+# filled from the starting bindings when the function is called (nothing
+# writes to the starting bindings during a run).
+#
+# Usage:
+#     program = vm.compile_program(pl3.parse(source))
+#     result = program.run(env, pl3)
+#
+# The runtime (a `pl3.Session`, or the pl3 module for its default session)
+# provides the `errors` list, `operate()` and the `out` file of `write`, so
+# diagnostics are the same as with `pl3.execute()`. While its `deadline` is
+# set, `check_deadline()` is called at every call and backward jump.
+
+# Opcodes                 arguments
+CONST = 0               # c           push constants[c]
+LOAD = 1                # n           push the variable in slot n
+STORE = 2               # n           pop into the variable in slot n
+BINARY = 3              # o           pop right and left, push left <o> right
+BINARY_NC = 4           # o, n, c     push slot n <o> constants[c]
+BINARY_NN = 5           # o, n, m     push slot n <o> slot m
+BINARY_SC = 6           # o, c        replace top with top <o> constants[c]
+BINARY_SN = 7           # o, n        replace top with top <o> slot n
+JUMP = 8                # t           continue at instruction t
+JUMP_IF_FALSE = 9       # t           pop, continue at t if falsy
+CALL = 10               # i           call calls[i] = (name, argc)
+RETURN = 11             #             pop and return
+RETURN_NONE = 12        #             return None
+WRITE = 13              #             pop and print
+POP = 14                #             pop and discard
+TAIL_CALL = 15          # i           return calls[i], reusing this frame
+
+OPNAMES = ['CONST', 'LOAD', 'STORE', 'BINARY', 'BINARY_NC', 'BINARY_NN',
+           'BINARY_SC', 'BINARY_SN', 'JUMP', 'JUMP_IF_FALSE', 'CALL', 'RETURN',
+           'RETURN_NONE', 'WRITE', 'POP', 'TAIL_CALL']
+
+# Python implementation of each operator, used when both operands are
+# numbers. Anything else (and division or modulo by zero) goes through
+# `operate()`, which applies the checks and reports the error.
+OPERATORS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul,
+    '/': operator.truediv, '%': operator.mod, '==': operator.eq,
+    '!=': operator.ne, '<=': operator.le, '>=': operator.ge,
+    '<': operator.lt, '>': operator.gt,
+}
+NUMBERS = (int, float)
+
+# Marker for a variable that is not set in the frame
+MISSING = object()
+
+
+class Code:
+    """
+    The compiled body of one function
+
+    :param name: The function name
+    :param params: The parameter names
+    :param scope: The frame layout from `resolver.resolve()`
+    """
+
+    def __init__(self, name, params, scope):
+        self.name = name
+        self.params = params
+        self.names = scope.names + list(scope.free)    # slot -> name
+        self.locals = scope.size - len(params)          # slots set by the body
+        self.free = list(scope.free)                    # slots set from the starting bindings
+        self.code = array('i')
+        self.lines = array('i')     # source line of every instruction
+        self.constants = []
+        self.symbols = []           # operator symbols
+        self.calls = []
+        self._indexes = {}
+        self._ops = None
+
+    def emit(self, op, a=0, b=0, c=0, line=0):
+        self.code.extend((op, a, b, c))
+        self.lines.append(line or 0)
+        return len(self.lines) - 1
+
+    def patch(self, at, target):
+        self.code[at * 4 + 1] = target
+
+    def here(self):
+        return len(self.lines)
+
+    def last(self):
+        return self.code[-4] if self.code else None
+
+    def index(self, table, value):
+        # Keyed by type too, so that True and 1 get different constants
+        key = (id(table), type(value), value)
+        if key not in self._indexes:
+            self._indexes[key] = len(table)
+            table.append(value)
+        return self._indexes[key]
+
+    def ops(self):
+        """
+        Return the instructions decoded into (opcode, a, b, c) tuples, the
+        form the interpreter loop reads
+        """
+        if self._ops is None:
+            code = self.code
+            self._ops = [tuple(code[i:i + 4]) for i in range(0, len(code), 4)]
+            self.functions = [OPERATORS.get(symbol) for symbol in self.symbols]
+        return self._ops
+
+    def dis(self):
+        """
+        Return a readable listing of the bytecode
+        """
+        out = []
+        for pc, (op, a, b, c) in enumerate(self.ops()):
+            if op == CONST:
+                detail = repr(self.constants[a])
+            elif op == LOAD or op == STORE:
+                detail = self.names[a]
+            elif op == BINARY:
+                detail = self.symbols[a]
+            elif op == BINARY_NC:
+                detail = f'{self.names[b]} {self.symbols[a]} {self.constants[c]!r}'
+            elif op == BINARY_NN:
+                detail = f'{self.names[b]} {self.symbols[a]} {self.names[c]}'
+            elif op == BINARY_SC:
+                detail = f'{self.symbols[a]} {self.constants[b]!r}'
+            elif op == BINARY_SN:
+                detail = f'{self.symbols[a]} {self.names[b]}'
+            elif op == CALL or op == TAIL_CALL:
+                detail = '%s/%d' % self.calls[a]
+            elif op == JUMP or op == JUMP_IF_FALSE:
+                detail = str(a)
+            else:
+                detail = ''
+            out.append(f'{pc:5} {OPNAMES[op]:14} {detail}')
+        return '\n'.join(out)
+
+
+class Compiler:
+    """
+    Translate the tuple tree of one function into a `Code` object
+    """
+
+    def __init__(self, function):
+        self.out = Code(function[1], [param[0] for param in function[2]], resolve(function))
+        self.slots = {name: slot for slot, name in enumerate(self.out.names)}
+        self.statements(function[4])
+        self.out.emit(RETURN_NONE)
+
+    def statements(self, statements):
+        for statement in statements:
+            self.statement(statement)
+
+    def statement(self, node):
+        out = self.out
+        kind = node[0]
+        if kind in ('let', 'let_mut', 'let_ref', 'assign'):
+            self.expression(node[2])
+            out.emit(STORE, self.slots[node[1]])
+        elif kind == 'if':
+            ends = []
+            clause = node
+            while clause is not None and clause[0] != 'else':
+                self.expression(clause[1])
+                skip = out.emit(JUMP_IF_FALSE)
+                self.statements(clause[2])
+                if clause[3] is not None:
+                    ends.append(out.emit(JUMP))
+                out.patch(skip, out.here())
+                clause = clause[3]
+            if clause is not None:
+                self.statements(clause[1])
+            for at in ends:
+                out.patch(at, out.here())
+        elif kind == 'while':
+            top = out.here()
+            self.expression(node[1])
+            exit = out.emit(JUMP_IF_FALSE)
+            self.statements(node[2])
+            out.emit(JUMP, top)
+            out.patch(exit, out.here())
+        elif kind == 'return':
+            expr = node[1]
+            if expr[0] == 'call':
+                for arg in expr[2]:
+                    self.expression(arg)
+                out.emit(TAIL_CALL, out.index(out.calls, (expr[1], len(expr[2]))), line=expr[3])
+            else:
+                self.expression(expr)
+                out.emit(RETURN)
+        elif kind == 'write':
+            self.expression(node[1])
+            out.emit(WRITE)
+        elif kind == 'where' or kind == 'call':
+            self.expression(node[1] if kind == 'where' else node)
+            out.emit(POP)
+        else:
+            raise ValueError(f"Cannot compile statement '{kind}'")
+
+    def expression(self, node):
+        out = self.out
+        kind = node[0]
+        if kind == 'number' or kind == 'boolean':
+            out.emit(CONST, out.index(out.constants, node[1]))
+        elif kind == 'identifier':
+            out.emit(LOAD, self.slots[node[1]], line=node[2])
+        elif kind == 'operation':
+            self.operation(node)
+        elif kind == 'call':
+            for arg in node[2]:
+                self.expression(arg)
+            out.emit(CALL, out.index(out.calls, (node[1], len(node[2]))), line=node[3])
+        else:
+            raise ValueError(f"Cannot compile expression '{kind}'")
+
+    def operation(self, node):
+        out = self.out
+        _, symbol, left, right, line = node
+        o = out.index(out.symbols, symbol)
+        n = self.local(left, line)
+        m = self.local(right, line)
+        if right[0] in ('number', 'boolean'):
+            c = out.index(out.constants, right[1])
+            if n is not None:
+                out.emit(BINARY_NC, o, n, c, line)
+            else:
+                self.expression(left)
+                out.emit(BINARY_SC, o, c, line=line)
+        elif m is not None:
+            if n is not None:
+                out.emit(BINARY_NN, o, n, m, line)
+            else:
+                self.expression(left)
+                out.emit(BINARY_SN, o, m, line=line)
+        else:
+            self.expression(left)
+            self.expression(right)
+            out.emit(BINARY, o, line=line)
+
+    def local(self, node, line):
+        # The slot of a variable operand, None for anything else. A fused
+        # instruction reports an undefined variable at its own line, so a
+        # variable on another line than the operator is loaded on its own.
+        if node[0] == 'identifier' and node[2] == line:
+            return self.slots[node[1]]
+        return None
+
+
+def compile_program(ast):
+    """
+    Compile every function of a program tree
+
+    :param ast: The tree returned by `pl3.parse()`
+    """
+    return Program({item[1]: Compiler(item).out for item in ast[1] if item[0] == 'function'})
+
+
+class Program:
+    """
+    A compiled program: one `Code` object per function
+    """
+
+    def __init__(self, functions):
+        self.functions = functions
+        self.executed = 0           # instructions executed by the last run
+
+    def run(self, env, runtime, entry='main'):
+        """
+        Run the program from `entry` and return its result
+
+        :param env: Starting variable bindings, visible from every function
+        :param runtime: Provides `errors`, `operate()`, `out` and `deadline` (a
+                        pl3 Session)
+        """
+        self.executed = 0
+        if entry not in self.functions:
+            raise NameError(f"Function '{entry}' is not defined.")
+        return self.call(self.functions[entry], [], env, runtime)
+
+    def call(self, func, args, env, runtime):
+        if runtime.deadline is not None:
+            runtime.check_deadline()
+        code = func.ops()
+        constants = func.constants
+        functions = func.functions
+        frame = args + [MISSING] * func.locals
+        if func.free:
+            frame += [env.get(name, MISSING) for name in func.free]
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+        block = 0       # first instruction of the current straight-line run
+
+        while True:
+            op, a, b, c = code[pc]
+            pc += 1
+
+            if op <= BINARY_SN:
+                if op == BINARY_NC:
+                    left = frame[b]
+                    if left is MISSING:
+                        left = self.lookup(func.names[b], env, runtime, func, pc)
+                    right = constants[c]
+                elif op == BINARY_SC:
+                    left = pop()
+                    right = constants[b]
+                elif op == CONST:
+                    push(constants[a])
+                    continue
+                elif op == STORE:
+                    frame[a] = pop()
+                    continue
+                elif op == LOAD:
+                    value = frame[a]
+                    push(value if value is not MISSING else self.lookup(func.names[a], env, runtime, func, pc))
+                    continue
+                elif op == BINARY_NN:
+                    left = frame[b]
+                    if left is MISSING:
+                        left = self.lookup(func.names[b], env, runtime, func, pc)
+                    right = frame[c]
+                    if right is MISSING:
+                        right = self.lookup(func.names[c], env, runtime, func, pc)
+                elif op == BINARY_SN:
+                    left = pop()
+                    right = frame[b]
+                    if right is MISSING:
+                        right = self.lookup(func.names[b], env, runtime, func, pc)
+                else:
+                    right = pop()
+                    left = pop()
+
+                function = functions[a]
+                if (function is None or type(left) not in NUMBERS or type(right) not in NUMBERS
+                        or (not right and (function is operator.truediv or function is operator.mod))):
+                    # Let operate() apply its checks and report the error
+                    push(runtime.operate(func.symbols[a], left, right, func.lines[pc - 1]))
+                else:
+                    push(function(left, right))
+
+            elif op == JUMP_IF_FALSE:
+                if not pop():
+                    self.executed += pc - block
+                    pc = block = a
+            elif op == JUMP:
+                self.executed += pc - block
+                pc = block = a
+                if runtime.deadline is not None:
+                    runtime.check_deadline()
+            elif op == CALL:
+                name, argc = func.calls[a]
+                args = stack[len(stack) - argc:]
+                del stack[len(stack) - argc:]
+                self.executed += pc - block
+                block = pc
+                push(self.call_by_name(name, args, env, runtime, func.lines[pc - 1]))
+            elif op == RETURN:
+                self.executed += pc - block
+                return pop()
+            elif op == TAIL_CALL:
+                name, argc = func.calls[a]
+                args = stack[len(stack) - argc:]
+                self.executed += pc - block
+                if runtime.deadline is not None:
+                    runtime.check_deadline()
+                callee = self.functions.get(name)
+                if callee is None or len(callee.params) != argc:
+                    # Let call_by_name() report the error
+                    return self.call_by_name(name, args, env, runtime, func.lines[pc - 1])
+                # Run the callee in place of this call: constant Python stack depth
+                func = callee
+                code = func.ops()
+                constants = func.constants
+                functions = func.functions
+                frame = args + [MISSING] * func.locals
+                if func.free:
+                    frame += [env.get(name, MISSING) for name in func.free]
+                stack.clear()
+                pc = block = 0
+            elif op == RETURN_NONE:
+                self.executed += pc - block
+                return None
+            elif op == WRITE:
+                print(pop(), file=runtime.out)
+            else:
+                pop()
+
+    def lookup(self, name, env, runtime, func, pc):
+        # A variable that is not set in the frame: try the starting bindings
+        if name in env:
+            return env[name]
+        runtime.errors.append(f"Error at line {func.lines[pc - 1]}: Undefined variable '{name}'")
+        return None
+
+    def call_by_name(self, name, args, env, runtime, line):
+        func = self.functions.get(name)
+        if func is None:
+            runtime.errors.append(f"Error at line {line}: Function '{name}' is not defined.")
+            return None
+        if len(func.params) != len(args):
+            runtime.errors.append(f"Error at line {line}: Function '{name}' expects {len(func.params)} arguments, but {len(args)} were provided.")
+            return None
+        return self.call(func, args, env, runtime)
@@ -1,6 +1,13 @@
+import copy
+import os
+import sys
+
 import ply.yacc as yacc
 import ply.lex as lex
 
+from scanner import CHUNK_SIZE, Scanner
+from tokenstream import TokenStream
+
 # List of all token names
 tokens = [
     'IDENTIFIER', 'NUMBER',
@@ -103,12 +110,6 @@ def t_error(t):
 # Constructing the lexer
 lexer = lex.lex()
 
-# Dictionary to store variables
-variables = {}
-
-# Dictionary for storing function definitions
-functions = {}
-
 # ==================================================================
 #                        PARSING RULES
 # ==================================================================
@@ -142,7 +143,9 @@ def p_program(p):
     if len(p) == 2:
         p[0] = ('program', [p[1]])
     else:
-        p[0] = ('program', p[1][1] + [p[2]])
+        # Append in place, `p[1][1] + [p[2]]` would copy the list every time
+        p[1][1].append(p[2])
+        p[0] = p[1]
 
 
 def p_function(p):
@@ -167,9 +170,8 @@ def p_statements_multiple(p):
     '''statements : statements statement'''
     if p[2] is not None:
         # Only include valid statements
-        p[0] = p[1] + [p[2]]
-    else:
-        p[0] = p[1]
+        p[1].append(p[2])
+    p[0] = p[1]
 
 
 def p_statement_assignment(p):
@@ -199,7 +201,6 @@ def p_statement_let(p):
 
 def p_assignment_statement(p):
     '''assignment_statement : IDENTIFIER EQUALS expression SEMICOLON'''
-    variables[p[1]] = p[3]
     p[0] = ('assign', p[1], p[3])
 
 
@@ -249,9 +250,6 @@ def p_action_statement_function_call(p):
     p[0] = p[1]
 
 
-# List to collect errors during parsing
-errors = []
-
 # ==================================================================
 #                        EXPRESSION HANDLING
 # ==================================================================
@@ -262,26 +260,19 @@ def p_let_expression(p):
                       | LET MUT IDENTIFIER EQUALS expression SEMICOLON
                       | LET REF IDENTIFIER EQUALS expression SEMICOLON'''
     if len(p) == 6:
-        variables[p[2]] = p[4]
+        p[0] = ('let', p[2], p[4])
     elif p[2] == 'mut':
-        variables[p[3]] = p[5]
+        p[0] = ('let_mut', p[3], p[5])
     else:
-        variables[p[3]] = p[5]
-    p[0] = ('let', p[2], p[4] if len(p) == 6 else p[5])
+        p[0] = ('let_ref', p[3], p[5])
 
 
+# Expressions are only built here; they are evaluated by `execute()`. The
+# nodes that can fail at run time keep their line number as last element.
+
 def p_expression_identifier(p):
     '''expression : IDENTIFIER'''
-    try:
-        if p[1] not in variables:
-            raise ExpressionError(f"Undefined variable '{p[1]}'", p.lineno(1))
-        p[0] = variables[p[1]]
-    except ExpressionError as e:
-        errors.append(f"Error at line {e.line}: {e.message}")
-        p[0] = None
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(1)}: {str(e)}")
-        p[0] = None
+    p[0] = ('identifier', p[1], p.lineno(1))
 
 
 def p_expression_operation(p):
@@ -296,103 +287,28 @@ def p_expression_operation(p):
                   | expression GEQ expression
                   | expression LT expression
                   | expression GT expression'''
-    try:
-        # Type checking
-        if not isinstance(p[1], (int, float)) or not isinstance(p[3], (int, float)):
-            raise ExpressionError(f"Invalid operands for {p[2]}: {type(
-                p[1]).__name__} and {type(p[3]).__name__}", p.lineno(2))
-
-        # Operation-specific checks
-        if p[2] == '/':
-            if p[3] == 0:
-                raise ExpressionError("Division by zero", p.lineno(2))
-            p[0] = p[1] / p[3]
-        elif p[2] == '%':
-            if p[3] == 0:
-                raise ExpressionError("Modulo by zero", p.lineno(2))
-            p[0] = p[1] % p[3]
-        elif p[2] == '+':
-            p[0] = p[1] + p[3]
-        elif p[2] == '-':
-            p[0] = p[1] - p[3]
-        elif p[2] == '*':
-            p[0] = p[1] * p[3]
-        elif p[2] == '==':
-            p[0] = p[1] == p[3]
-        elif p[2] == '!=':
-            p[0] = p[1] != p[3]
-        elif p[2] == '<=':
-            p[0] = p[1] <= p[3]
-        elif p[2] == '>=':
-            p[0] = p[1] >= p[3]
-        elif p[2] == '<':
-            p[0] = p[1] < p[3]
-        elif p[2] == '>':
-            p[0] = p[1] > p[3]
-        else:
-            raise ExpressionError(f"Invalid operator: {p[2]}", p.lineno(2))
-
-    except ExpressionError as e:
-        errors.append(f"Error at line {e.line}: {e.message}")
-        p[0] = None
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(2)}: {str(e)}")
-        p[0] = None
+    p[0] = ('operation', p[2], p[1], p[3], p.lineno(2))
 
 
 def p_expression_paren(p):
     '''expression : LPAREN expression RPAREN'''
-    try:
-        if p[2] is None:
-            raise ExpressionError(
-                "Invalid expression inside parentheses", p.lineno(1))
-        p[0] = p[2]
-    except ExpressionError as e:
-        errors.append(f"Error at line {e.line}: {e.message}")
-        p[0] = None
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(1)}: {str(e)}")
-        p[0] = None
+    p[0] = p[2]
 
 
 def p_expression_number(p):
     '''expression : NUMBER'''
-    try:
-        if not isinstance(p[1], (int, float)):
-            raise ExpressionError(f"Invalid number format: {
-                                  p[1]}", p.lineno(1))
-        # or p[0] = ('number', p[1])
-        p[0] = p[1]
-    except ExpressionError as e:
-        errors.append(f"Error at line {e.line}: {e.message}")
-        p[0] = None
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(1)}: {str(e)}")
-        p[0] = None
+    p[0] = ('number', p[1])
 
 
 def p_expression_boolean(p):
     '''expression : TRUE
                   | FALSE'''
-    try:
-        p[0] = True if p[1] == 'true' else False
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(1)}: {str(e)}")
-        p[0] = None
+    p[0] = ('boolean', p[1] == 'true')
 
 
 def p_expression_function_call(p):
     '''expression : function_call'''
-    try:
-        if p[1] is None:
-            raise ExpressionError("Invalid function call", p.lineno(1))
-        p[0] = p[1]
-    except ExpressionError as e:
-        errors.append(f"Error at line {e.line}: {e.message}")
-        p[0] = None
-    except Exception as e:
-        errors.append(f"Unexpected error at line {p.lineno(1)}: {str(e)}")
-        p[0] = None
+    p[0] = p[1]
 
 
 def p_struct(p):
@@ -406,7 +322,8 @@ def p_struct_statements(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
 
 
 def p_list_parameters_empty(p):
@@ -414,14 +331,23 @@ def p_list_parameters_empty(p):
     p[0] = []
 
 
-def p_list_parameters_single(p):
-    '''list_parameters : IDENTIFIER type'''
+def p_list_parameters_nonempty(p):
+    '''list_parameters : parameters
+                       | parameters COMMA'''
+    # A trailing comma is allowed, as it was with the right-recursive rule
+    p[0] = p[1]
+
+
+def p_parameters_single(p):
+    '''parameters : IDENTIFIER type'''
     p[0] = [(p[1], p[2])]
 
 
-def p_list_parameters_multiple(p):
-    '''list_parameters : IDENTIFIER type COMMA list_parameters'''
-    p[0] = [(p[1], p[2])] + p[4]
+def p_parameters_multiple(p):
+    '''parameters : parameters COMMA IDENTIFIER type'''
+    # Left-recursive so the parser stack stays flat for long lists
+    p[1].append((p[3], p[4]))
+    p[0] = p[1]
 
 
 def p_list_arguments_empty(p):
@@ -436,7 +362,8 @@ def p_list_arguments_single(p):
 
 def p_list_arguments_multiple(p):
     '''list_arguments : list_arguments COMMA expression'''
-    p[0] = p[1] + [p[3]]
+    p[1].append(p[3])
+    p[0] = p[1]
 
 
 # ==================================================================
@@ -445,16 +372,9 @@ def p_list_arguments_multiple(p):
 
 def p_function_call(p):
     '''function_call : IDENTIFIER LPAREN list_arguments RPAREN'''
-    if p[1] in functions:
-        func = functions[p[1]]
-        if len(func['params']) != len(p[3]):
-            raise ValueError(f"Function '{p[1]}' expects {len(
-                func['params'])} arguments, but {len(p[3])} were provided.")
-        # Execute function here or return the call for later processing
-        # Represents a call to function `p[1]` with arguments `p[3]`
-        p[0] = ('call', p[1], p[3])
-    else:
-        raise NameError(f"Function '{p[1]}' is not defined.")
+    # Represents a call to function `p[1]` with arguments `p[3]`. The
+    # function is looked up (and the arguments counted) by `execute()`.
+    p[0] = ('call', p[1], p[3], p.lineno(1))
 
 
 def p_type(p):
@@ -482,56 +402,466 @@ class ExpressionError(Exception):
 
 
 def p_error(p):
+    report_syntax_error(p)
+
+
+def report_syntax_error(p, out=None):
+    """
+    Print a syntax error at token `p` (None at the end of the input) with a
+    hint, and return the message
+
+    :param out: The file to print to (None: `sys.stdout`)
+    """
     if p:
-        print(f"Syntax error at '{p.value}', line {p.lineno}")
+        message = f"Syntax error at '{p.value}', line {p.lineno}"
+        print(message, file=out)
 
         # General hints based on the token and context
         if p.type in {'RPAREN', 'RCURLY', 'RSQUARE'}:
-            print("Hint: Check for a missing operand or mismatched parentheses/braces.")
+            print("Hint: Check for a missing operand or mismatched parentheses/braces.", file=out)
         elif p.type in {'PLUS', 'MINUS', 'MULT', 'DIV'}:
-            print("Hint: Check for missing operands around the operator.")
+            print("Hint: Check for missing operands around the operator.", file=out)
         elif p.type == 'IDENTIFIER':
-            print("Hint: Verify variable or function declarations.")
+            print("Hint: Verify variable or function declarations.", file=out)
         else:
-            print("Hint: Check syntax around this token.")
+            print("Hint: Check syntax around this token.", file=out)
     else:
-        print("Syntax error at EOF")
-        print("Hint: Check for incomplete code or unclosed blocks.")
+        message = "Syntax error at EOF"
+        print(message, file=out)
+        print("Hint: Check for incomplete code or unclosed blocks.", file=out)
+    return message
+
 
+def tee_tokens(data, consumer, lexer=lexer):
+    """
+    Return a tokenfunc for `parser.parse()` that lexes `data` once and also
+    hands every token to `consumer`, so nothing has to lex it a second time
 
-def parse(data):
+    :param data: The source text
+    :param consumer: Called with each token before the parser gets it
+    :param lexer: The lexer to use (default: the module's)
+    """
+    lexer.input(data)
+    next_token = lexer.token
+
+    def tokenfunc():
+        token = next_token()
+        if token is not None:
+            consumer(token)
+        return token
+    return tokenfunc
+
+
+def parse(data, on_token=None):
     """
     Parse the provided data and return the result.
     If there are errors during parsing, they are printed and None is returned.
+    Uses `default_session`; see `Session.parse()`.
+
+    :param data: The source text
+    :param on_token: Called with every token as it is lexed (see `tee_tokens()`)
     """
-    global errors
-    errors.clear()
+    return default_session.parse(data, on_token)
 
-    try:
-        result = parser.parse(data, lexer=lexer)
 
-        if errors:
-            print("\nErrors encountered during parsing:")
-            for error in errors:
-                print(error)
+def parse_file(path, chunk_size=CHUNK_SIZE):
+    """
+    Parse a file in chunks with `default_session`; see `Session.parse_file()`
+    """
+    return default_session.parse_file(path, chunk_size)
+
+
+def parse_tokens(stream):
+    """
+    Parse tokens saved by `tokenstream.export()` without lexing the source.
+    Errors are handled as in `parse()`.
+
+    :param stream: A `tokenstream.TokenStream`, or the path of a token
+                   stream file
+    """
+    return default_session.parse_tokens(stream)
+
+
+# Build the parser lazily from the prebuilt LALR tables in `pl4_parsetab.py`
+parser = None
+
+
+def normalize_rules():
+    """
+    Strip the indentation of the grammar rules in the `p_` docstrings.
+    ply hashes the docstrings into the signature it checks the prebuilt
+    tables against, and Python 3.13 dedents docstrings where older versions
+    keep them as written, so the tables would only match on one of them.
+    """
+    for name, function in globals().items():
+        if name.startswith('p_') and function.__doc__:
+            function.__doc__ = '\n'.join(line.strip() for line in function.__doc__.splitlines())
+
+
+def get_parser():
+    """
+    Return the parser, building it on first use from the prebuilt tables.
+    ply checks the tables against the grammar signature; if the grammar has
+    changed it rebuilds them in memory without writing any files.
+    """
+    global parser
+    if parser is None:
+        try:
+            import pl4_parsetab as tabmodule
+        except ImportError:
+            tabmodule = 'pl4_parsetab'
+        normalize_rules()
+        parser = yacc.yacc(tabmodule=tabmodule, write_tables=False, debug=False)
+    return parser
+
+
+def build_tables():
+    """
+    Regenerate `pl4_parsetab.py` next to this file. Run `python
+    build_tables.py` from the repository root after changing the grammar.
+    """
+    global parser
+    outputdir = os.path.dirname(os.path.abspath(__file__))
+    tabfile = os.path.join(outputdir, 'pl4_parsetab.py')
+    if os.path.exists(tabfile):
+        os.remove(tabfile)
+    normalize_rules()
+    parser = yacc.yacc(tabmodule='pl4_parsetab', outputdir=outputdir, debug=False)
+
+
+# ==================================================================
+#                        EXECUTION
+# ==================================================================
+
+# Marker returned by `run_statements()` when no `return` was executed
+NO_RETURN = object()
+
+
+class Session:
+    """
+    An independent pl4 interpreter. It has its own lexer, parser state,
+    function table, variables, errors and output, and shares only the
+    grammar tables with other sessions, so sessions can parse and execute
+    at the same time in different threads. The module-level `parse()` and
+    `execute()` use `default_session`.
+
+    :param out: Where `write` statements and diagnostics are printed
+                (None: `sys.stdout`)
+    """
+
+    def __init__(self, out=None):
+        self.out = out
+        self.lexer = lexer.clone()
+        self.lexer.lexerrorf = self.illegal_character
+        self.parser = None
+        # Starting variable bindings of `execute()`
+        self.variables = {}
+        # Function definitions, filled by `execute()`
+        self.functions = {}
+        # Errors of the last parse() or execute()
+        self.errors = []
+
+    def get_parser(self):
+        """
+        Return this session's parser: it shares the tables of `get_parser()`
+        but keeps its own parsing stacks and reports syntax errors to `out`
+        """
+        if self.parser is None:
+            self.parser = copy.copy(get_parser())
+            self.parser.errorfunc = self.syntax_error
+        return self.parser
+
+    def syntax_error(self, p):
+        # Printed now, and recorded so that parse() does not return the
+        # partial tree
+        self.errors.append(report_syntax_error(p, self.out))
+
+    def illegal_character(self, t):
+        message = f"Illegal character '{t.value[0]}' at line {t.lineno}"
+        print(message, file=self.out)
+        self.errors.append(message)
+        t.lexer.skip(1)
+
+    def parse(self, data, on_token=None):
+        """
+        Parse the provided data and return the result.
+        If there are errors during parsing, they are printed and None is returned.
+
+        :param data: The source text
+        :param on_token: Called with every token as it is lexed (see `tee_tokens()`)
+        """
+        self.errors.clear()
+        self.lexer.lineno = 1
+
+        try:
+            if on_token is None:
+                result = self.get_parser().parse(data, lexer=self.lexer)
+            else:
+                tokenfunc = tee_tokens(data, on_token, self.lexer)
+                result = self.get_parser().parse(lexer=self.lexer, tokenfunc=tokenfunc)
+                # The parser stops at the end of the input, so this is only
+                # needed if it gave up early
+                while tokenfunc() is not None:
+                    pass
+
+            # Syntax and lexer errors were printed as they were found
+            if self.errors:
+                return None
+
+            return result
+
+        except Exception as e:
+            message = f"Fatal parsing error: {e}"
+            print(message, file=self.out)
+            self.errors.append(message)
+            return None
+
+    def parse_file(self, path, chunk_size=CHUNK_SIZE):
+        """
+        Parse a file without reading it whole: it is scanned in chunks (see
+        `Scanner.input_file()`), so memory grows with the tree, not the
+        text. Errors are handled as in `parse()`.
+
+        :param path: The source file (UTF-8)
+        :param chunk_size: The number of bytes read at a time
+        """
+        self.errors.clear()
+        scanner = Scanner(sys.modules[__name__], ply_words=True)
+        scanner.errorf = self.illegal_character
+        scanner.input_file(path, chunk_size)
+        try:
+            result = self.get_parser().parse(lexer=scanner, tokenfunc=scanner.token)
+        except Exception as e:
+            message = f"Fatal parsing error: {e}"
+            print(message, file=self.out)
+            self.errors.append(message)
             return None
+        if self.errors:
+            return None
+        return result
 
+    def parse_tokens(self, stream):
+        """
+        Parse tokens saved by `tokenstream.export()` without lexing the source.
+        Errors are handled as in `parse()`.
+
+        :param stream: A `tokenstream.TokenStream`, or the path of a token
+                       stream file, which is opened and closed again
+        """
+        if isinstance(stream, (str, os.PathLike)):
+            with TokenStream.open(stream) as opened:
+                return self.parse_tokens(opened)
+        self.errors.clear()
+        try:
+            result = self.get_parser().parse(lexer=self.lexer, tokenfunc=stream.tokenfunc())
+        except Exception as e:
+            message = f"Fatal parsing error: {e}"
+            print(message, file=self.out)
+            self.errors.append(message)
+            return None
+        if self.errors:
+            return None
         return result
 
-    except Exception as e:
-        print(f"Fatal parsing error: {str(e)}")
+    def report_errors(self, stage):
+        """
+        Print the collected errors, if any, and return True if there were some
+        """
+        if not self.errors:
+            return False
+        print(f"\nErrors encountered during {stage}:", file=self.out)
+        for error in self.errors:
+            print(error, file=self.out)
+        return True
+
+    def execute(self, ast, env=None):
+        """
+        Run a program returned by `parse()`, starting at its `main` function.
+        The same tree can be executed any number of times without parsing again.
+        If there are errors during execution, they are printed and None is
+        returned.
+
+        :param ast: The parse tree of the program
+        :param env: Starting variable bindings, visible from every function
+                    (defaults to the session's `variables`)
+        :return: The value returned by `main`
+        """
+        self.errors.clear()
+        if env is None:
+            env = self.variables
+
+        try:
+            if ast is None:
+                raise ValueError("There is no program to run.")
+            functions = self.functions
+            functions.clear()
+            for item in ast[1]:
+                if item[0] == 'function':
+                    functions[item[1]] = item
+
+            if 'main' not in functions:
+                raise NameError("Function 'main' is not defined.")
+            result = self.call_function('main', [], env)
+
+            if self.report_errors("execution"):
+                return None
+
+            return result
+
+        except Exception as e:
+            message = f"Fatal execution error: {e}"
+            print(message, file=self.out)
+            self.errors.append(message)
+            return None
+
+    def call_function(self, name, args, env, line=None):
+        """
+        Call the user function `name` with already evaluated arguments. Every
+        call gets its own frame for parameters and `let` bindings.
+        """
+        try:
+            if name not in self.functions:
+                raise ExpressionError(f"Function '{name}' is not defined.", line)
+            func = self.functions[name]
+            params = func[2]
+            if len(params) != len(args):
+                raise ExpressionError(f"Function '{name}' expects {len(params)} arguments, but {len(args)} were provided.", line)
+        except ExpressionError as e:
+            self.errors.append(f"Error at line {e.line}: {e.message}")
+            return None
+
+        frame = {param[0]: arg for param, arg in zip(params, args)}
+        result = self.run_statements(func[4], frame, env)
+        return None if result is NO_RETURN else result
+
+    def run_statements(self, statements, frame, env):
+        """
+        Run a list of statements. Returns the value of the first `return`
+        executed, or NO_RETURN.
+        """
+        for statement in statements:
+            kind = statement[0]
+            if kind in ('let', 'let_mut', 'let_ref', 'assign'):
+                frame[statement[1]] = self.evaluate(statement[2], frame, env)
+            elif kind == 'if' or kind == 'else_if':
+                clause = statement
+                while clause is not None:
+                    if clause[0] == 'else':
+                        result = self.run_statements(clause[1], frame, env)
+                        break
+                    if self.evaluate(clause[1], frame, env):
+                        result = self.run_statements(clause[2], frame, env)
+                        break
+                    clause = clause[3]
+                else:
+                    result = NO_RETURN
+                if result is not NO_RETURN:
+                    return result
+            elif kind == 'while':
+                while self.evaluate(statement[1], frame, env):
+                    result = self.run_statements(statement[2], frame, env)
+                    if result is not NO_RETURN:
+                        return result
+            elif kind == 'return':
+                return self.evaluate(statement[1], frame, env)
+            elif kind == 'write':
+                print(self.evaluate(statement[1], frame, env), file=self.out)
+            elif kind == 'where':
+                self.evaluate(statement[1], frame, env)
+            elif kind == 'call':
+                self.evaluate(statement, frame, env)
+        return NO_RETURN
+
+    def evaluate(self, expr, frame, env):
+        """
+        Evaluate an expression node. Errors are collected in `errors` and
+        evaluate to None.
+        """
+        kind = expr[0]
+        if kind == 'number' or kind == 'boolean':
+            return expr[1]
+        elif kind == 'identifier':
+            name = expr[1]
+            if name in frame:
+                return frame[name]
+            if name in env:
+                return env[name]
+            self.errors.append(f"Error at line {expr[2]}: Undefined variable '{name}'")
+            return None
+        elif kind == 'operation':
+            return self.operate(expr[1], self.evaluate(expr[2], frame, env), self.evaluate(expr[3], frame, env), expr[4])
+        elif kind == 'call':
+            args = [self.evaluate(arg, frame, env) for arg in expr[2]]
+            return self.call_function(expr[1], args, env, expr[3])
+        self.errors.append(f"Unexpected error: unknown expression '{kind}'")
         return None
 
+    def operate(self, op, left, right, line):
+        """
+        Apply a binary operator to two evaluated operands
+        """
+        try:
+            # Type checking
+            if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+                raise ExpressionError(f"Invalid operands for {op}: {type(left).__name__} and {type(right).__name__}", line)
+
+            # Operation-specific checks
+            if op == '/':
+                if right == 0:
+                    raise ExpressionError("Division by zero", line)
+                return left / right
+            elif op == '%':
+                if right == 0:
+                    raise ExpressionError("Modulo by zero", line)
+                return left % right
+            elif op == '+':
+                return left + right
+            elif op == '-':
+                return left - right
+            elif op == '*':
+                return left * right
+            elif op == '==':
+                return left == right
+            elif op == '!=':
+                return left != right
+            elif op == '<=':
+                return left <= right
+            elif op == '>=':
+                return left >= right
+            elif op == '<':
+                return left < right
+            elif op == '>':
+                return left > right
+            else:
+                raise ExpressionError(f"Invalid operator: {op}", line)
+
+        except ExpressionError as e:
+            self.errors.append(f"Error at line {e.line}: {e.message}")
+            return None
+        except Exception as e:
+            self.errors.append(f"Unexpected error at line {line}: {str(e)}")
+            return None
+
+
+# The session behind the module-level `parse()` and `execute()`. Its
+# tables are also available under the old module-level names.
+default_session = Session()
+variables = default_session.variables
+functions = default_session.functions
+errors = default_session.errors
+
+
+def execute(ast, env=None):
+    """
+    Run a program returned by `parse()` in `default_session`; see
+    `Session.execute()`
+    """
+    return default_session.execute(ast, env)
 
-# Build the parser
-parser = yacc.yacc()
 
 if __name__ == "__main__":
-    with open('Program_Test.txt', 'r') as tester:
-        input_data = tester.read()
-        lexer.input(input_data)
-        while True:
-            token = lexer.token()
-            if not token:
-                break
-        result = parse(input_data)
+    # The file is scanned in chunks, not read whole; pass on_token= to
+    # parse() to see the tokens
+    result = parse_file('Program_Test.txt')
+    if result is not None:
+        execute(result)
@@ -0,0 +1,92 @@
+
+# pl4_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftPLUSMINUSleftSTARSLASHMODnonassocLEQGEQLTGTnonassocEQUALSNEQBOOLEAN CHAR COMMA ELSE EQUALS FALSE FLOAT FN GEQ GT IDENTIFIER IF IN INT LCURLY LEQ LET LOOP LPAREN LSQR LT MINUS MOD MUT NEQ NUMBER PLUS PUB RCURLY REF RETURN RPAREN RSQR SEMICOLON SLASH STAR STRUCT TRUE TYPE WHERE WHILE WRITEprogram : program function\n| program struct\n| function\n| structfunction : FN IDENTIFIER LPAREN list_parameters RPAREN return_type LCURLY statements RCURLYreturn_type : type\n| emptystatements : statementstatements : statements statementstatement : assignment_statementstatement : if_statementstatement : while_statementstatement : action_statementstatement : let_expressionassignment_statement : IDENTIFIER EQUALS expression SEMICOLONif_statement : IF expression LCURLY statements RCURLY else_clauseelse_clause : ELSE LCURLY statements RCURLY\n| ELSE IF expression LCURLY statements RCURLY else_clause\n| emptywhile_statement : WHILE LPAREN expression RPAREN LCURLY statements RCURLYaction_statement : RETURN expression SEMICOLONaction_statement : WRITE expression SEMICOLONaction_statement : WHERE expression SEMICOLONaction_statement : function_calllet_expression : LET IDENTIFIER EQUALS expression SEMICOLON\n| LET MUT IDENTIFIER EQUALS expression SEMICOLON\n| LET REF IDENTIFIER EQUALS expression SEMICOLONexpression : IDENTIFIERexpression : expression PLUS expression\n| expression MINUS expression\n| expression STAR expression\n| expression SLASH expression\n| expression MOD expression\n| expression EQUALS expression\n| expression NEQ expression\n| expression LEQ expression\n| expression GEQ expression\n| expression LT expression\n| expression GT expressionexpression : LPAREN expression RPARENexpression : NUMBERexpression : TRUE\n| FALSEexpression : function_callstruct : STRUCT IDENTIFIER LCURLY struct_statements RCURLYstruct_statements : let_expression\n| struct_statements let_expressionlist_parameters :list_parameters : parameters\n| parameters COMMAparameters : IDENTIFIER typeparameters : parameters COMMA IDENTIFIER typelist_arguments :list_arguments : expressionlist_arguments : list_arguments COMMA expressionfunction_call : IDENTIFIER LPAREN list_arguments RPARENtype : INT\n| FLOAT\n| CHAR\n| BOOLEAN\n| IDENTIFIERempty :'
+    
+_lr_action_items = {'FN':([0,1,2,3,6,7,26,80,],[4,4,-3,-4,-1,-2,-45,-5,]),'STRUCT':([0,1,2,3,6,7,26,80,],[5,5,-3,-4,-1,-2,-45,-5,]),'$end':([1,2,3,6,7,26,80,],[0,-3,-4,-1,-2,-45,-5,]),'IDENTIFIER':([4,5,10,12,17,24,25,29,30,34,35,38,42,47,48,50,51,52,53,54,55,56,57,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,79,81,83,101,102,104,106,107,108,109,110,111,112,115,116,117,119,120,121,122,123,124,126,127,128,129,130,],[8,9,12,18,28,18,34,36,37,18,40,49,40,40,40,49,-8,-10,-11,-12,-13,-14,40,40,40,40,-24,40,40,-25,40,40,40,40,40,40,40,40,40,40,40,-9,40,-26,-27,49,-21,-22,-23,-56,40,-15,49,-62,49,-16,-19,49,49,40,-20,49,-17,49,49,-62,-18,]),'LPAREN':([8,35,40,42,47,48,49,57,58,59,60,61,63,64,66,67,68,69,70,71,72,73,74,75,79,83,110,122,],[10,42,63,42,42,42,63,42,83,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,]),'LCURLY':([9,18,20,21,22,23,24,31,32,33,40,43,44,45,46,82,89,90,91,92,93,94,95,96,97,98,99,100,109,113,118,125,],[11,-61,-57,-58,-59,-60,-62,38,-6,-7,-28,-41,-42,-43,-44,104,-34,-29,-30,-31,-32,-33,-35,-36,-37,-38,-39,-40,-56,116,121,127,]),'RPAREN':([10,13,14,18,19,20,21,22,23,25,39,40,43,44,45,46,63,76,87,88,89,90,91,92,93,94,95,96,97,98,99,100,105,109,114,],[-48,24,-49,-61,-51,-57,-58,-59,-60,-50,-52,-28,-41,-42,-43,-44,-53,100,109,-54,-34,-29,-30,-31,-32,-33,-35,-36,-37,-38,-39,-40,113,-56,-55,]),'LET':([11,15,16,27,38,50,51,52,53,54,55,56,62,65,81,101,102,104,106,107,108,109,111,112,115,116,117,119,120,121,123,124,126,127,128,129,130,],[17,17,-46,-47,17,17,-8,-10,-11,-12,-13,-14,-24,-25,-9,-26,-27,17,-21,-22,-23,-56,-15,17,-62,17,-16,-19,17,17,-20,17,-17,17,17,-62,-18,]),'INT':([12,24,34,],[20,20,20,]),'FLOAT':([12,24,34,],[21,21,21,]),'CHAR':([12,24,34,],[22,22,22,]),'BOOLEAN':([12,24,34,],[23,23,23,]),'COMMA':([14,18,19,20,21,22,23,39,40,43,44,45,46,63,87,88,89,90,91,92,93,94,95,96,97,98,99,100,109,114,],[25,-61,-51,-57,-58,-59,-60,-52,-28,-41,-42,-43,-44,-53,110,-54,-34,-29,-30,-31,-32,-33,-35,-36,-37,-38,-39,-40,-56,-55,]),'RCURLY':([15,16,27,50,51,52,53,54,55,56,62,65,81,101,102,106,107,108,109,111,112,115,117,119,120,123,124,126,128,129,130,],[26,-46,-47,80,-8,-10,-11,-12,-13,-14,-24,-25,-9,-26,-27,-21,-22,-23,-56,-15,115,-62,-16,-19,123,-20,126,-17,129,-62,-18,]),'MUT':([17,],[29,]),'REF':([17,],[30,]),'EQUALS':([28,36,37,40,41,43,44,45,46,49,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,103,105,109,114,125,],[35,47,48,-28,64,-41,-42,-43,-44,79,64,64,64,64,64,64,64,64,None,64,64,64,64,64,None,64,64,64,64,-40,64,64,-56,64,64,]),'NUMBER':([35,42,47,48,57,59,60,61,63,64,66,67,68,69,70,71,72,73,74,75,79,83,110,122,],[43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,]),'TRUE':([35,42,47,48,57,59,60,61,63,64,66,67,68,69,70,71,72,73,74,75,79,83,110,122,],[44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,]),'FALSE':([35,42,47,48,57,59,60,61,63,64,66,67,68,69,70,71,72,73,74,75,79,83,110,122,],[45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,]),'IF':([38,50,51,52,53,54,55,56,62,65,81,101,102,104,106,107,108,109,111,112,115,116,117,118,119,120,121,123,124,126,127,128,129,130,],[57,57,-8,-10,-11,-12,-13,-14,-24,-25,-9,-26,-27,57,-21,-22,-23,-56,-15,57,-62,57,-16,122,-19,57,57,-20,57,-17,57,57,-62,-18,]),'WHILE':([38,50,51,52,53,54,55,56,62,65,81,101,102,104,106,107,108,109,111,112,115,116,117,119,120,121,123,124,126,127,128,129,130,],[58,58,-8,-10,-11,-12,-13,-14,-24,-25,-9,-26,-27,58,-21,-22,-23,-56,-15,58,-62,58,-16,-19,58,58,-20,58,-17,58,58,-62,-18,]),'RETURN':([38,50,51,52,53,54,55,56,62,65,81,101,102,104,106,107,108,109,111,112,115,116,117,119,120,121,123,124,126,127,128,129,130,],[59,59,-8,-10,-11,-12,-13,-14,-24,-25,-9,-26,-27,59,-21,-22,-23,-56,-15,59,-62,59,-16,-19,59,59,-20,59,-17,59,59,-62,-18,]),'WRITE':([38,50,51,52,53,54,55,56,62,65,81,101,102,104,106,107,108,109,111,112,115,116,117,119,120,121,123,124,126,127,128,129,130,],[60,60,-8,-10,-11,-12,-13,-14,-24,-25,-9,-26,-27,60,-21,-22,-23,-56,-15,60,-62,60,-16,-19,60,60,-20,60,-17,60,60,-62,-18,]),'WHERE':([38,50,51,52,53,54,55,56,62,65,81,101,102,104,106,107,108,109,111,112,115,116,117,119,120,121,123,124,126,127,128,129,130,],[61,61,-8,-10,-11,-12,-13,-14,-24,-25,-9,-26,-27,61,-21,-22,-23,-56,-15,61,-62,61,-16,-19,61,61,-20,61,-17,61,61,-62,-18,]),'SEMICOLON':([40,41,43,44,45,46,77,78,84,85,86,89,90,91,92,93,94,95,96,97,98,99,100,103,109,],[-28,65,-41,-42,-43,-44,101,102,106,107,108,-34,-29,-30,-31,-32,-33,-35,-36,-37,-38,-39,-40,111,-56,]),'PLUS':([40,41,43,44,45,46,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,103,105,109,114,125,],[-28,66,-41,-42,-43,-44,66,66,66,66,66,66,66,66,-34,-29,-30,-31,-32,-33,-35,-36,-37,-38,-39,-40,66,66,-56,66,66,]),'MINUS':([40,41,43,44,45,46,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,103,105,109,114,125,],[-28,67,-41,-42,-43,-44,67,67,67,67,67,67,67,67,-34,-29,-30,-31,-32,-33,-35,-36,-37,-38,-39,-40,67,67,-56,67,67,]),'STAR':([40,41,43,44,45,46,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,103,105,109,114,125,],[-28,68,-41,-42,-43,-44,68,68,68,68,68,68,68,68,-34,68,68,-31,-32,-33,-35,-36,-37,-38,-39,-40,68,68,-56,68,68,]),'SLASH':([40,41,43,44,45,46,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,103,105,109,114,125,],[-28,69,-41,-42,-43,-44,69,69,69,69,69,69,69,69,-34,69,69,-31,-32,-33,-35,-36,-37,-38,-39,-40,69,69,-56,69,69,]),'MOD':([40,41,43,44,45,46,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,103,105,109,114,125,],[-28,70,-41,-42,-43,-44,70,70,70,70,70,70,70,70,-34,70,70,-31,-32,-33,-35,-36,-37,-38,-39,-40,70,70,-56,70,70,]),'NEQ':([40,41,43,44,45,46,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,103,105,109,114,125,],[-28,71,-41,-42,-43,-44,71,71,71,71,71,71,71,71,None,71,71,71,71,71,None,71,71,71,71,-40,71,71,-56,71,71,]),'LEQ':([40,41,43,44,45,46,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,103,105,109,114,125,],[-28,72,-41,-42,-43,-44,72,72,72,72,72,72,72,72,-34,72,72,72,72,72,-35,None,None,None,None,-40,72,72,-56,72,72,]),'GEQ':([40,41,43,44,45,46,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,103,105,109,114,125,],[-28,73,-41,-42,-43,-44,73,73,73,73,73,73,73,73,-34,73,73,73,73,73,-35,None,None,None,None,-40,73,73,-56,73,73,]),'LT':([40,41,43,44,45,46,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,103,105,109,114,125,],[-28,74,-41,-42,-43,-44,74,74,74,74,74,74,74,74,-34,74,74,74,74,74,-35,None,None,None,None,-40,74,74,-56,74,74,]),'GT':([40,41,43,44,45,46,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,103,105,109,114,125,],[-28,75,-41,-42,-43,-44,75,75,75,75,75,75,75,75,-34,75,75,75,75,75,-35,None,None,None,None,-40,75,75,-56,75,75,]),'ELSE':([115,129,],[118,118,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'function':([0,1,],[2,6,]),'struct':([0,1,],[3,7,]),'list_parameters':([10,],[13,]),'parameters':([10,],[14,]),'struct_statements':([11,],[15,]),'let_expression':([11,15,38,50,104,112,116,120,121,124,127,128,],[16,27,56,56,56,56,56,56,56,56,56,56,]),'type':([12,24,34,],[19,32,39,]),'return_type':([24,],[31,]),'empty':([24,115,129,],[33,119,119,]),'expression':([35,42,47,48,57,59,60,61,63,64,66,67,68,69,70,71,72,73,74,75,79,83,110,122,],[41,76,77,78,82,84,85,86,88,89,90,91,92,93,94,95,96,97,98,99,103,105,114,125,]),'function_call':([35,38,42,47,48,50,57,59,60,61,63,64,66,67,68,69,70,71,72,73,74,75,79,83,104,110,112,116,120,121,122,124,127,128,],[46,62,46,46,46,62,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,62,46,62,62,62,62,46,62,62,62,]),'statements':([38,104,116,121,127,],[50,112,120,124,128,]),'statement':([38,50,104,112,116,120,121,124,127,128,],[51,81,51,81,51,81,51,81,51,81,]),'assignment_statement':([38,50,104,112,116,120,121,124,127,128,],[52,52,52,52,52,52,52,52,52,52,]),'if_statement':([38,50,104,112,116,120,121,124,127,128,],[53,53,53,53,53,53,53,53,53,53,]),'while_statement':([38,50,104,112,116,120,121,124,127,128,],[54,54,54,54,54,54,54,54,54,54,]),'action_statement':([38,50,104,112,116,120,121,124,127,128,],[55,55,55,55,55,55,55,55,55,55,]),'list_arguments':([63,],[87,]),'else_clause':([115,129,],[117,130,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> program function','program',2,'p_program','pl4.py',129),
+  ('program -> program struct','program',2,'p_program','pl4.py',130),
+  ('program -> function','program',1,'p_program','pl4.py',131),
+  ('program -> struct','program',1,'p_program','pl4.py',132),
+  ('function -> FN IDENTIFIER LPAREN list_parameters RPAREN return_type LCURLY statements RCURLY','function',9,'p_function','pl4.py',152),
+  ('return_type -> type','return_type',1,'p_return_type','pl4.py',159),
+  ('return_type -> empty','return_type',1,'p_return_type','pl4.py',160),
+  ('statements -> statement','statements',1,'p_statements_single','pl4.py',165),
+  ('statements -> statements statement','statements',2,'p_statements_multiple','pl4.py',170),
+  ('statement -> assignment_statement','statement',1,'p_statement_assignment','pl4.py',178),
+  ('statement -> if_statement','statement',1,'p_statement_if','pl4.py',183),
+  ('statement -> while_statement','statement',1,'p_statement_while','pl4.py',188),
+  ('statement -> action_statement','statement',1,'p_statement_action','pl4.py',193),
+  ('statement -> let_expression','statement',1,'p_statement_let','pl4.py',198),
+  ('assignment_statement -> IDENTIFIER EQUALS expression SEMICOLON','assignment_statement',4,'p_assignment_statement','pl4.py',203),
+  ('if_statement -> IF expression LCURLY statements RCURLY else_clause','if_statement',6,'p_if_statement','pl4.py',208),
+  ('else_clause -> ELSE LCURLY statements RCURLY','else_clause',4,'p_else_clause','pl4.py',217),
+  ('else_clause -> ELSE IF expression LCURLY statements RCURLY else_clause','else_clause',7,'p_else_clause','pl4.py',218),
+  ('else_clause -> empty','else_clause',1,'p_else_clause','pl4.py',219),
+  ('while_statement -> WHILE LPAREN expression RPAREN LCURLY statements RCURLY','while_statement',7,'p_while_statement','pl4.py',229),
+  ('action_statement -> RETURN expression SEMICOLON','action_statement',3,'p_action_statement_return','pl4.py',234),
+  ('action_statement -> WRITE expression SEMICOLON','action_statement',3,'p_action_statement_write','pl4.py',239),
+  ('action_statement -> WHERE expression SEMICOLON','action_statement',3,'p_action_statement_where','pl4.py',244),
+  ('action_statement -> function_call','action_statement',1,'p_action_statement_function_call','pl4.py',249),
+  ('let_expression -> LET IDENTIFIER EQUALS expression SEMICOLON','let_expression',5,'p_let_expression','pl4.py',259),
+  ('let_expression -> LET MUT IDENTIFIER EQUALS expression SEMICOLON','let_expression',6,'p_let_expression','pl4.py',260),
+  ('let_expression -> LET REF IDENTIFIER EQUALS expression SEMICOLON','let_expression',6,'p_let_expression','pl4.py',261),
+  ('expression -> IDENTIFIER','expression',1,'p_expression_identifier','pl4.py',274),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_operation','pl4.py',279),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_operation','pl4.py',280),
+  ('expression -> expression STAR expression','expression',3,'p_expression_operation','pl4.py',281),
+  ('expression -> expression SLASH expression','expression',3,'p_expression_operation','pl4.py',282),
+  ('expression -> expression MOD expression','expression',3,'p_expression_operation','pl4.py',283),
+  ('expression -> expression EQUALS expression','expression',3,'p_expression_operation','pl4.py',284),
+  ('expression -> expression NEQ expression','expression',3,'p_expression_operation','pl4.py',285),
+  ('expression -> expression LEQ expression','expression',3,'p_expression_operation','pl4.py',286),
+  ('expression -> expression GEQ expression','expression',3,'p_expression_operation','pl4.py',287),
+  ('expression -> expression LT expression','expression',3,'p_expression_operation','pl4.py',288),
+  ('expression -> expression GT expression','expression',3,'p_expression_operation','pl4.py',289),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_paren','pl4.py',294),
+  ('expression -> NUMBER','expression',1,'p_expression_number','pl4.py',299),
+  ('expression -> TRUE','expression',1,'p_expression_boolean','pl4.py',304),
+  ('expression -> FALSE','expression',1,'p_expression_boolean','pl4.py',305),
+  ('expression -> function_call','expression',1,'p_expression_function_call','pl4.py',310),
+  ('struct -> STRUCT IDENTIFIER LCURLY struct_statements RCURLY','struct',5,'p_struct','pl4.py',315),
+  ('struct_statements -> let_expression','struct_statements',1,'p_struct_statements','pl4.py',320),
+  ('struct_statements -> struct_statements let_expression','struct_statements',2,'p_struct_statements','pl4.py',321),
+  ('list_parameters -> <empty>','list_parameters',0,'p_list_parameters_empty','pl4.py',330),
+  ('list_parameters -> parameters','list_parameters',1,'p_list_parameters_nonempty','pl4.py',335),
+  ('list_parameters -> parameters COMMA','list_parameters',2,'p_list_parameters_nonempty','pl4.py',336),
+  ('parameters -> IDENTIFIER type','parameters',2,'p_parameters_single','pl4.py',342),
+  ('parameters -> parameters COMMA IDENTIFIER type','parameters',4,'p_parameters_multiple','pl4.py',347),
+  ('list_arguments -> <empty>','list_arguments',0,'p_list_arguments_empty','pl4.py',354),
+  ('list_arguments -> expression','list_arguments',1,'p_list_arguments_single','pl4.py',359),
+  ('list_arguments -> list_arguments COMMA expression','list_arguments',3,'p_list_arguments_multiple','pl4.py',364),
+  ('function_call -> IDENTIFIER LPAREN list_arguments RPAREN','function_call',4,'p_function_call','pl4.py',374),
+  ('type -> INT','type',1,'p_type','pl4.py',381),
+  ('type -> FLOAT','type',1,'p_type','pl4.py',382),
+  ('type -> CHAR','type',1,'p_type','pl4.py',383),
+  ('type -> BOOLEAN','type',1,'p_type','pl4.py',384),
+  ('type -> IDENTIFIER','type',1,'p_type','pl4.py',385),
+  ('empty -> <empty>','empty',0,'p_empty','pl4.py',390),
+]
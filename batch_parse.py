@@ -0,0 +1,152 @@
+"""
+Parse and validate many source files in parallel
+
+Usage:
+    python batch_parse.py [--language pl3] [--jobs N] [--pattern '*.txt'] [--json] PATH ...
+
+Every PATH is a file, a directory (searched recursively for --pattern) or a
+glob. The files are split among --jobs worker processes (default: one per
+core); each worker imports the parser and builds it once. The report lists
+every file with problems: its `errors` (those recorded by a pl3/pl4
+`Session`, or in pl2's module error list) and its diagnostics (anything
+else the parser printed).
+"""
+import argparse
+import contextlib
+import glob
+import importlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from build_tables import PARSERS
+
+# The parser module of this process, set by `load_parser()`
+module = None
+# Its `Session`, for the parsers that have one (pl3 and pl4)
+session = None
+
+
+def load_parser(language):
+    """
+    Import the parser module of `language` and build its parser (run once
+    in every worker)
+    """
+    global module, session
+    root = os.path.dirname(os.path.abspath(__file__))
+    directory = dict((name, directory) for directory, name in PARSERS)[language]
+    sys.path.insert(0, os.path.join(root, directory))
+    module = importlib.import_module(language)
+    module.get_parser()
+    if hasattr(module, 'Session'):
+        session = module.Session()
+
+
+def check_file(path):
+    """
+    Parse one file and return its result as a dict
+    """
+    start = time.perf_counter()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return {'path': path, 'ok': False, 'errors': [str(e)], 'diagnostics': [], 'seconds': 0.0}
+
+    output = io.StringIO()
+    if session is not None:
+        # The session records every lexer, syntax and fatal parsing error
+        session.out = output
+        tree = session.parse(data)
+        errors = list(session.errors)
+    else:
+        module.errors.clear()
+        lexer = module.lexer.clone()
+        lexer.lineno = 1
+        with contextlib.redirect_stdout(output):
+            try:
+                tree = module.get_parser().parse(data, lexer=lexer)
+            except Exception as e:
+                tree = None
+                print(f"Fatal parsing error: {str(e)}")
+        errors = list(module.errors)
+    # The recorded errors are printed too; keep only the other lines
+    diagnostics = [line for line in output.getvalue().splitlines() if line not in errors]
+    return {
+        'path': path,
+        'ok': tree is not None and not errors and not diagnostics,
+        'errors': errors,
+        'diagnostics': diagnostics,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def find_files(paths, pattern):
+    """
+    Expand files, directories and globs into a sorted list of files
+    """
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            files.update(glob.glob(os.path.join(path, '**', pattern), recursive=True))
+        elif os.path.isfile(path):
+            files.add(path)
+        else:
+            files.update(name for name in glob.glob(path, recursive=True) if os.path.isfile(name))
+    return sorted(files)
+
+
+def run(files, language, jobs):
+    """
+    Check every file with `jobs` processes; return the results in the
+    order of `files`
+    """
+    if jobs <= 1:
+        load_parser(language)
+        return [check_file(path) for path in files]
+    # Several files per task, so workers are not waiting on the pool
+    chunksize = max(1, min(64, len(files) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=load_parser, initargs=(language,)) as pool:
+        return list(pool.map(check_file, files, chunksize=chunksize))
+
+
+def print_report(results, elapsed):
+    failed = [result for result in results if not result['ok']]
+    for result in failed:
+        print(f"{result['path']}:")
+        for message in result['errors']:
+            print(f'    error: {message}')
+        for message in result['diagnostics']:
+            print(f'    {message}')
+    print(f'\n{len(results)} files, {len(failed)} with problems, '
+          f'{elapsed:.2f}s ({len(results) / elapsed if elapsed else 0:,.0f} files/sec)')
+
+
+def main(argv=None):
+    languages = [name for _, name in PARSERS]
+    arguments = argparse.ArgumentParser(description='Parse and validate source files in parallel')
+    arguments.add_argument('paths', nargs='+', help='files, directories or globs')
+    arguments.add_argument('--language', choices=languages, default='pl3')
+    arguments.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1)
+    arguments.add_argument('--pattern', default='*.txt', help='file pattern for directories')
+    arguments.add_argument('--json', action='store_true', help='print the results as JSON')
+    options = arguments.parse_args(argv)
+
+    files = find_files(options.paths, options.pattern)
+    start = time.perf_counter()
+    results = run(files, options.language, options.jobs)
+    elapsed = time.perf_counter() - start
+
+    if options.json:
+        json.dump({'files': len(results), 'seconds': elapsed, 'results': results}, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(results, elapsed)
+    return 0 if all(result['ok'] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
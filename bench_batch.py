@@ -0,0 +1,46 @@
+"""
+Benchmark batch_parse.py throughput with 1 to N worker processes
+
+Usage:
+    python bench_batch.py [files] [max jobs]     (default: 400, cores)
+"""
+import os
+import sys
+import tempfile
+import time
+
+import batch_parse
+
+
+def generate(index):
+    lines = [f'fn f{index}(a int, b int) int {{', '    let mut x = a;']
+    for i in range(200):
+        lines.append(f'    x = x + a * {i} - b % {i % 7 + 1};')
+    lines += ['    return x;', '}', 'fn main() {', f'    return f{index}(1, 2);', '}']
+    if index % 50 == 0:
+        lines.append('fn broken( {')
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    cores = os.cpu_count() or 1
+    max_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else cores
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(count):
+            with open(os.path.join(directory, f'program{i}.txt'), 'w') as f:
+                f.write(generate(i))
+        files = batch_parse.find_files([directory], '*.txt')
+
+        print(f'{count} files, {cores} cores')
+        jobs = 1
+        baseline = None
+        while jobs <= max_jobs:
+            start = time.perf_counter()
+            results = batch_parse.run(files, 'pl3', jobs)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            failed = sum(1 for result in results if not result['ok'])
+            print(f'    --jobs {jobs:<3} {count / elapsed:8,.0f} files/sec {baseline / elapsed:6.2f}x'
+                  f'   ({failed} with problems)')
+            jobs *= 2
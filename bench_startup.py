@@ -0,0 +1,46 @@
+"""
+Benchmark cold start of the parsers: eager table generation (what every
+process paid when `yacc.yacc()` ran at import) against the prebuilt tables
+
+Usage:
+    python bench_startup.py [runs]
+
+Every measurement is a fresh interpreter started in an empty directory.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from build_tables import PARSERS
+
+SCENARIOS = [
+    ('before: import + generate tables',
+     "import {name}, ply.yacc as yacc; "
+     "{name}.parser = yacc.yacc(module={name}, tabmodule='missing_parsetab', write_tables=False, debug=False, errorlog=yacc.NullLogger())"),
+    ('after: import only', "import {name}"),
+    ('after: import + first get_parser()', "import {name}; {name}.get_parser()"),
+]
+
+
+def cold_run(code, path, cwd):
+    env = dict(os.environ, PYTHONPATH=path, PYTHONDONTWRITEBYTECODE='1')
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env, check=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    root = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as cwd:
+        baseline = statistics.median(cold_run('pass', root, cwd) for _ in range(runs))
+        print(f'Interpreter startup: {baseline * 1000:.1f} ms (subtracted below)\n')
+        for directory, name in PARSERS:
+            path = os.path.join(root, directory)
+            print(name)
+            for label, code in SCENARIOS:
+                times = [cold_run(code.format(name=name), path, cwd) for _ in range(runs)]
+                print(f'    {label:38} {(statistics.median(times) - baseline) * 1000:8.1f} ms')
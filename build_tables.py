@@ -0,0 +1,23 @@
+"""
+Regenerate the checked-in LALR tables (`plN_parsetab.py`) of the parsers
+
+Usage:
+    python build_tables.py
+
+Run it after changing any grammar rule in pl2.py, pl3.py or pl4.py.
+"""
+import importlib
+import os
+import sys
+
+PARSERS = [('Assignment2', 'pl2'), ('Assignment3', 'pl3'), ('Assignment4', 'pl4')]
+
+
+if __name__ == "__main__":
+    root = os.path.dirname(os.path.abspath(__file__))
+    for directory, name in PARSERS:
+        sys.path.insert(0, os.path.join(root, directory))
+        module = importlib.import_module(name)
+        module.build_tables()
+        sys.path.pop(0)
+        print(f'Wrote {directory}/{name}_parsetab.py')
@@ -0,0 +1,39 @@
+"""
+Modules shared by the assignments are copied into every assignment
+directory, so that each one runs on its own. The copies must stay
+identical.
+
+Usage:
+    python -m unittest discover tests
+"""
+import os
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ASSIGNMENTS = ['Assignment1', 'Assignment2', 'Assignment3', 'Assignment4']
+
+# Each shared module and the directories that have a copy of it
+SHARED = {
+    'scanner.py': ASSIGNMENTS,
+    'tokenstream.py': ASSIGNMENTS,
+    'parse_cache.py': ['Assignment2', 'Assignment3'],
+}
+
+
+class SharedCopiesTest(unittest.TestCase):
+
+    def test_copies_are_identical(self):
+        for name, directories in SHARED.items():
+            with self.subTest(module=name):
+                copies = {}
+                for directory in directories:
+                    with open(os.path.join(ROOT, directory, name), 'rb') as f:
+                        copies[directory] = f.read()
+                first = copies[directories[0]]
+                different = [directory for directory, data in copies.items() if data != first]
+                self.assertEqual(different, [], f'{name} differs from {directories[0]}/{name}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+The pl3 execution engines report the same errors, at the same lines, as
+the tree walker, including for expressions that span several lines.
+
+Usage:
+    python -m unittest discover tests
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENGINES = ['vm', 'closure']
+
+SOURCE = '''fn main() {
+    let a = y
+        + 1;
+    let b = 2 +
+        z;
+    let c = q
+        * w;
+    let d = u * 2;
+    return a;
+}
+'''
+
+# Prints the errors of running SOURCE with the engine, one per line
+CHECK = '''
+import io
+import pl3
+session = pl3.Session(out=io.StringIO())
+session.execute(session.parse({source!r}), engine={engine!r})
+print('\\n'.join(session.errors))
+'''
+
+
+class EngineErrorsTest(unittest.TestCase):
+
+    def errors(self, engine):
+        result = subprocess.run([sys.executable, '-c', CHECK.format(source=SOURCE, engine=engine)],
+                                cwd=os.path.join(ROOT, 'Assignment3'),
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout.splitlines()
+
+    def test_error_lines_match_the_tree_walker(self):
+        expected = self.errors('tree')
+        self.assertIn("Error at line 2: Undefined variable 'y'", expected)
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                self.assertEqual(self.errors(engine), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Parameter lists accept the same language as the original right-recursive
+rules, including a trailing comma.
+
+Usage:
+    python -m unittest discover tests
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PARSERS = [('Assignment2', 'pl2'), ('Assignment3', 'pl3'), ('Assignment4', 'pl4')]
+
+SOURCES = [
+    'fn f() { x = 1; }',
+    'fn f(a int) { x = 1; }',
+    'fn f(a int, b int) { x = 1; }',
+    'fn f(a int, b int,) { x = 1; }',
+]
+
+# Prints one line per source: whether it parsed without errors
+CHECK = '''
+import contextlib, io
+import {name}
+for source in {sources!r}:
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        tree = {name}.parse(source)
+    print(tree is not None and 'Syntax error' not in out.getvalue())
+'''
+
+
+class ParameterListTest(unittest.TestCase):
+
+    def test_parameter_lists_parse(self):
+        for directory, name in PARSERS:
+            with self.subTest(parser=name):
+                result = subprocess.run([sys.executable, '-c', CHECK.format(name=name, sources=SOURCES)],
+                                        cwd=os.path.join(ROOT, directory),
+                                        capture_output=True, text=True)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertEqual(result.stdout.split(), ['True'] * len(SOURCES), result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
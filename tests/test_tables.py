@@ -0,0 +1,68 @@
+"""
+The checked-in LALR tables must be used as they are: if the grammar
+signature ply computes does not match `plN_parsetab.py`, ply silently
+builds new tables on every `get_parser()` call. The signature leaves out
+the line numbers of the rules, so those are compared separately.
+
+Usage:
+    python -m unittest discover tests
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PARSERS = [('Assignment2', 'pl2'), ('Assignment3', 'pl3'), ('Assignment4', 'pl4')]
+
+# Fails if ply constructs the table generator, i.e. does not use the tables
+CHECK = '''
+import ply.yacc as yacc
+
+class Rebuilt(yacc.LRGeneratedTable):
+    def __init__(self, *args, **kwargs):
+        raise SystemExit('the LALR tables were rebuilt')
+
+yacc.LRGeneratedTable = Rebuilt
+import {name}
+{name}.get_parser()
+'''
+
+# Prints the rules whose (action, line) differs between the source and the tables
+LINES = '''
+import ply.yacc as yacc
+import {name}, {name}_parsetab as tables
+reflect = yacc.ParserReflect(vars({name}))
+reflect.get_pfunctions()
+source = set()
+for line, module, function, doc in reflect.pfuncs:
+    for file, dline, prodname, syms in yacc.parse_grammar(doc, module.__file__, line):
+        source.add((function, dline))
+checked_in = set((p[3], p[5]) for p in tables._lr_productions[1:])
+print(sorted(source ^ checked_in))
+'''
+
+
+class PrebuiltTablesTest(unittest.TestCase):
+
+    def test_tables_are_not_rebuilt(self):
+        for directory, name in PARSERS:
+            with self.subTest(parser=name):
+                result = subprocess.run([sys.executable, '-c', CHECK.format(name=name)],
+                                        cwd=os.path.join(ROOT, directory),
+                                        capture_output=True, text=True)
+                self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_line_numbers_are_current(self):
+        for directory, name in PARSERS:
+            with self.subTest(parser=name):
+                result = subprocess.run([sys.executable, '-c', LINES.format(name=name)],
+                                        cwd=os.path.join(ROOT, directory),
+                                        capture_output=True, text=True)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertEqual(result.stdout.strip(), '[]', 'run build_tables.py')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+A binary token stream reads back the tokens it was written with,
+iterating it stops after the last token, and numbers too large for it
+are refused.
+
+Usage:
+    python -m unittest discover tests
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SOURCE = 'fn main() { x = 1 + 22; }'
+
+# Prints the tokens read back from the stream, then what tokenfunc() gives past the end
+CHECK = '''
+import io
+import pl1, tokenstream
+out = io.BytesIO()
+pl1.lexer.input({source!r})
+tokenstream.write(iter(pl1.lexer.token, None), pl1.tokens, {source!r}, out)
+stream = tokenstream.TokenStream(out.getvalue())
+print([(tok.type, tok.value) for tok in list(stream)])
+tokenfunc = stream.tokenfunc()
+for _ in stream:
+    tokenfunc()
+print(tokenfunc(), tokenfunc())
+'''
+
+# Writes a NUMBER literal that does not fit in int64
+TOO_LARGE = '''
+import io
+import pl1, tokenstream
+source = 'x = {number};'
+pl1.lexer.input(source)
+try:
+    tokenstream.write(iter(pl1.lexer.token, None), pl1.tokens, source, io.BytesIO())
+except ValueError as error:
+    print('ValueError')
+'''
+
+
+class TokenStreamTest(unittest.TestCase):
+
+    def run_check(self, script):
+        return subprocess.run([sys.executable, '-c', script],
+                              cwd=os.path.join(ROOT, 'Assignment1'),
+                              capture_output=True, text=True, timeout=60)
+
+    def test_iteration_ends(self):
+        result = self.run_check(CHECK.format(source=SOURCE))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        tokens, past_end = result.stdout.splitlines()
+        self.assertIn("('NUMBER', 22)", tokens)
+        self.assertTrue(tokens.endswith("('RCURLY', '}')]"), tokens)
+        self.assertEqual(past_end, 'None None')
+
+    def test_large_numbers_are_refused(self):
+        result = self.run_check(TOO_LARGE.format(number=2 ** 63))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), 'ValueError')
+
+
+if __name__ == "__main__":
+    unittest.main()